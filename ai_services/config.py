@@ -22,6 +22,17 @@ CONTENT_CACHE_DURATION = int(os.environ.get('CONTENT_CACHE_DURATION', 24))  # ho
 NEWS_UPDATE_INTERVAL = int(os.environ.get('NEWS_UPDATE_INTERVAL', 24))  # hours
 MAX_DAILY_ARTICLES = int(os.environ.get('MAX_DAILY_ARTICLES', 5))
 RELEVANCE_THRESHOLD = float(os.environ.get('RELEVANCE_THRESHOLD', 6.0))
+NEWS_REFRESH_MINUTES = int(os.environ.get('NEWS_REFRESH_MINUTES', 60))  # incremental refresh per feed
+NEWS_SAFETY_REFRESH_MINUTES = int(os.environ.get('NEWS_SAFETY_REFRESH_MINUTES', 15))  # avalanche/ARSO feeds
+NEWS_RETENTION_DAYS = int(os.environ.get('NEWS_RETENTION_DAYS', 30))
+# Per-category retention overrides in days, e.g. "safety=14,achievement=90"
+NEWS_RETENTION_BY_CATEGORY = {
+    category.strip(): int(days)
+    for category, days in (
+        item.split('=', 1) for item in os.environ.get('NEWS_RETENTION_BY_CATEGORY', '').split(',') if '=' in item
+    )
+}
+NEWS_CLEANUP_CHUNK_SIZE = int(os.environ.get('NEWS_CLEANUP_CHUNK_SIZE', 1000))
 
 # News Sources Configuration
 NEWS_SOURCES = {
@@ -14,17 +14,22 @@ logger = logging.getLogger(__name__)
 class HistoricalEventGenerator:
     """Generates and manages historical mountaineering events using SQLAlchemy"""
     
-    def __init__(self, db, HistoricalEvent, deepseek_client: DeepSeekClient = None):
+    def __init__(self, db, HistoricalEvent, deepseek_client: DeepSeekClient = None,
+                 on_event_stored=None):
         self.db = db
         self.HistoricalEvent = HistoricalEvent
         self.ai_client = deepseek_client or DeepSeekClient()
+        # Optional callback(event) run after a new event is committed
+        self.on_event_stored = on_event_stored
     
-    def get_today_event(self, date: str = None) -> Optional[Dict]:
+    def get_today_event(self, date: str = None, generate: bool = True) -> Optional[Dict]:
         """
         Get historical event for today or specific date
         
         Args:
             date (str): Date in MM-DD format, defaults to today
+            generate (bool): Generate a missing event with AI now; if False an
+                unsaved placeholder (without id) is returned instead
             
         Returns:
             Dict: Historical event or None
@@ -42,6 +47,8 @@ class HistoricalEventGenerator:
         
         # Generate new event with AI if none exists
         if self.ai_client.is_available():
+            if not generate:
+                return self._get_fallback_event(date, store=False)
             logger.info(f"Generating new historical event for {date}")
             return self._generate_and_store_event(date)
         
@@ -79,6 +86,7 @@ class HistoricalEventGenerator:
             self.db.session.commit()
             
             logger.info(f"Stored new AI-generated event for {date}")
+            self._notify_event_stored(new_event)
             return new_event.to_dict()
             
         except Exception as e:
@@ -86,7 +94,7 @@ class HistoricalEventGenerator:
             self.db.session.rollback()
             return None
     
-    def _get_fallback_event(self, date: str) -> Optional[Dict]:
+    def _get_fallback_event(self, date: str, store: bool = True) -> Optional[Dict]:
         """Get fallback event when AI is unavailable"""
         
         # Try to get any existing event for this date
@@ -111,10 +119,14 @@ class HistoricalEventGenerator:
                 created_at=datetime.utcnow()
             )
             
+            if not store:
+                return fallback_event.to_dict()
+            
             self.db.session.add(fallback_event)
             self.db.session.commit()
             
             logger.info(f"Created fallback event for {date}")
+            self._notify_event_stored(fallback_event)
             return fallback_event.to_dict()
             
         except Exception as e:
@@ -122,6 +134,14 @@ class HistoricalEventGenerator:
             self.db.session.rollback()
             return None
     
+    def _notify_event_stored(self, event):
+        """Run the on_event_stored callback, never failing the caller"""
+        if self.on_event_stored:
+            try:
+                self.on_event_stored(event)
+            except Exception as e:
+                logger.error(f"Event stored callback failed: {e}")
+    
     def get_events_by_category(self, category: str, limit: int = 10) -> List[Dict]:
         """Get events by category"""
         
@@ -6,9 +6,11 @@ Handles communication with DeepSeek API for content generation and processing.
 import requests
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from .config import DEEPSEEK_API_KEY, DEEPSEEK_API_URL, DEFAULT_LANGUAGE
+from utils.metrics import metrics
 from .prompts import (
     HISTORICAL_EVENT_PROMPT_SL, HISTORICAL_EVENT_PROMPT_EN,
     NEWS_SUMMARY_PROMPT_SL, NEWS_SUMMARY_PROMPT_EN,
@@ -49,12 +51,19 @@ class DeepSeekClient:
             "stream": False
         }
         
+        start = time.perf_counter()
+        status = 'error'
         try:
             response = self.session.post(self.api_url, json=payload, timeout=30)
             response.raise_for_status()
             
             result = response.json()
-            return result['choices'][0]['message']['content']
+            usage = result.get('usage') or {}
+            metrics.inc('ai_tokens_total', usage.get('prompt_tokens', 0), model=model, kind='prompt')
+            metrics.inc('ai_tokens_total', usage.get('completion_tokens', 0), model=model, kind='completion')
+            content = result['choices'][0]['message']['content']
+            status = 'success'
+            return content
             
         except requests.exceptions.RequestException as e:
             logger.error(f"DeepSeek API request failed: {e}")
@@ -62,6 +71,9 @@ class DeepSeekClient:
         except (KeyError, IndexError) as e:
             logger.error(f"Invalid response format from DeepSeek API: {e}")
             return None
+        finally:
+            metrics.observe('ai_request_duration_seconds', time.perf_counter() - start, model=model)
+            metrics.inc('ai_requests_total', model=model, status=status)
     
     def generate_historical_event(self, date: str, language: str = 'sl') -> Optional[Dict]:
         """
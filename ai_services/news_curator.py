@@ -4,36 +4,82 @@ Fetches RSS feeds and stores articles in database with optional AI enhancement.
 """
 
 import logging
-import feedparser
-import requests
+import zlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
-from .config import NEWS_SOURCES, RELEVANCE_THRESHOLD, MAX_DAILY_ARTICLES
+from sqlalchemy import delete, select
+from .config import (
+    NEWS_SOURCES, RELEVANCE_THRESHOLD, MAX_DAILY_ARTICLES,
+    NEWS_REFRESH_MINUTES, NEWS_SAFETY_REFRESH_MINUTES,
+    NEWS_RETENTION_DAYS, NEWS_RETENTION_BY_CATEGORY, NEWS_CLEANUP_CHUNK_SIZE
+)
 
 logger = logging.getLogger(__name__)
 
 class NewsCurator:
     """Simple news curator that fetches RSS feeds and stores articles"""
     
-    def __init__(self, db, News, ai_client=None):
+    def __init__(self, db, News, ai_client=None, FeedState=None):
         self.db = db
         self.News = News
+        self.FeedState = FeedState
         self.ai_client = ai_client
         self.relevance_threshold = RELEVANCE_THRESHOLD
         self.max_articles = MAX_DAILY_ARTICLES
     
-    def fetch_and_process_feeds(self) -> Dict:
+    @staticmethod
+    def all_feeds() -> List[str]:
+        """All feeds in priority order: Slovenian → International → Safety"""
+        return (NEWS_SOURCES.get('regional', []) +
+                NEWS_SOURCES.get('international', []) +
+                NEWS_SOURCES.get('safety', []))
+    
+    def feeds_due(self, now: datetime, window_minutes: int) -> List[str]:
+        """
+        Feeds whose refresh slot falls in the window starting at now
+        
+        Each feed has a fixed offset inside its refresh interval, derived from
+        its URL, so refreshes are spread across the hour instead of all feeds
+        being fetched at once. Intervals must divide a day (e.g. 15, 30, 60).
+        
+        Args:
+            now: Current time
+            window_minutes: Minutes until the next call
+            
+        Returns:
+            List[str]: Feed URLs to refresh now
+        """
+        minute_of_day = now.hour * 60 + now.minute
+        safety_feeds = NEWS_SOURCES.get('safety', [])
+        due = []
+        for feed_url in self.all_feeds():
+            interval = NEWS_SAFETY_REFRESH_MINUTES if feed_url in safety_feeds else NEWS_REFRESH_MINUTES
+            offset = zlib.crc32(feed_url.encode('utf-8')) % interval
+            if (minute_of_day - offset) % interval < window_minutes:
+                due.append(feed_url)
+        return due
+    
+    def fetch_and_process_feeds(self, feed_urls: List[str] = None, incremental: bool = False) -> Dict:
         """
         Fetch RSS feeds and store articles in database
         
+        Args:
+            feed_urls: Feeds to fetch (all feeds in priority order if not given)
+            incremental: Skip unchanged feeds (conditional GET) and only process
+                entries newer than the newest one seen in the previous run
+        
         Returns:
             Dict: Simple processing stats
         """
-        logger.info("Starting simple news curation")
+        # Imported here so web workers that never curate news skip the cost
+        import feedparser
+        
+        logger.info(f"Starting {'incremental' if incremental else 'full'} news curation")
         
         stats = {
             'feeds_processed': 0,
+            'feeds_not_modified': 0,
             'articles_found': 0,
             'articles_stored': 0,
             'errors': []
@@ -42,25 +88,35 @@ class NewsCurator:
         # Track articles per source for balancing (max 2 per source)
         source_article_count = {}
         
-        # Process Slovenian feeds first (priority), then international
-        slovenian_feeds = NEWS_SOURCES.get('regional', [])
-        international_feeds = NEWS_SOURCES.get('international', [])
-        safety_feeds = NEWS_SOURCES.get('safety', [])
-        
-        # Process in priority order: Slovenian → International → Safety
-        feed_priority = slovenian_feeds + international_feeds + safety_feeds
+        if feed_urls is None:
+            feed_urls = self.all_feeds()
         
         # Process each feed with source balancing
-        for feed_url in feed_priority:
+        for feed_url in feed_urls:
+            state = self._get_feed_state(feed_url)
             try:
                 logger.info(f"Fetching feed: {feed_url}")
-                feed = feedparser.parse(feed_url)
+                if incremental and state is not None and (state.etag or state.modified):
+                    feed = feedparser.parse(feed_url, etag=state.etag, modified=state.modified)
+                else:
+                    feed = feedparser.parse(feed_url)
                 
                 if feed.bozo:
                     logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
                 
                 stats['feeds_processed'] += 1
                 
+                if feed.get('status') == 304:
+                    stats['feeds_not_modified'] += 1
+                    self._save_feed_state(state, 'not_modified')
+                    continue
+                
+                entries = feed.entries
+                if incremental and state is not None:
+                    # Oldest first, so entries left over by the per-source limit
+                    # stay newer than the saved position and come in next run
+                    entries = list(reversed(self._new_entries(entries, state)))
+                
                 # Get source name for balancing
                 source_name = self._get_source_name(feed_url)
                 
@@ -71,35 +127,106 @@ class NewsCurator:
                 # Process articles with source limit (max 2 per source)
                 articles_from_source = 0
                 max_per_source = 2
+                handled = []
                 
-                for entry in feed.entries:
+                for entry in entries:
                     # Stop if we've reached the limit for this source
                     if articles_from_source >= max_per_source:
                         break
                     
-                    if self._process_article(entry, feed_url):
+                    stored = self._process_article(entry, feed_url)
+                    if stored is not None:
+                        handled.append(entry)
+                    if stored:
                         stats['articles_stored'] += 1
                         articles_from_source += 1
                         source_article_count[source_name] += 1
                         
                     stats['articles_found'] += 1
                 
-                logger.info(f"Processed {len(feed.entries)} articles from {feed_url} (stored: {articles_from_source})")
+                self._save_feed_state(state, 'ok', feed, self._caught_up_to(entries, handled))
+                logger.info(f"Processed {len(entries)} articles from {feed_url} (stored: {articles_from_source})")
                 
             except Exception as e:
                 error_msg = f"Error processing feed {feed_url}: {str(e)}"
                 logger.error(error_msg)
                 stats['errors'].append(error_msg)
+                self.db.session.rollback()
+                self._save_feed_state(self._get_feed_state(feed_url), 'error')
         
         # Log source distribution
         logger.info(f"Source distribution: {source_article_count}")
         
-        # Clean up old articles (keep only last 30 days)
-        self._cleanup_old_articles()
-        
         logger.info(f"News curation completed: {stats}")
         return stats
     
+    def _get_feed_state(self, feed_url: str):
+        """Load (or start) the refresh state of a feed; None without a state model"""
+        if self.FeedState is None:
+            return None
+        state = self.FeedState.query.filter_by(feed_url=feed_url).first()
+        if state is None:
+            state = self.FeedState(feed_url=feed_url)
+        return state
+    
+    def _caught_up_to(self, entries, handled) -> List:
+        """Handled entries, oldest first, up to the first one that was skipped or failed"""
+        handled_ids = {id(entry) for entry in handled}
+        chronological = sorted(entries, key=lambda entry: self._get_entry_date(entry) or datetime.min)
+        caught_up = []
+        for entry in chronological:
+            if id(entry) not in handled_ids:
+                break
+            caught_up.append(entry)
+        return caught_up
+    
+    def _save_feed_state(self, state, status: str, feed=None, caught_up=None):
+        """
+        Record the fetch and, for a parsed feed, how far it was processed
+        
+        The position only moves to the newest entry in caught_up (the entries
+        processed without a gap), so entries skipped by the per-source limit
+        or that failed are picked up by the next run. The cache validators are
+        only kept once every entry was processed, otherwise a 304 would hide
+        the rest.
+        """
+        if state is None:
+            return
+        try:
+            state.last_fetched_at = datetime.utcnow()
+            state.last_status = status
+            if feed is not None:
+                newest = caught_up[-1] if caught_up else None
+                published = self._get_entry_date(newest) if newest is not None else None
+                if newest is not None and (state.last_published_at is None or published is None
+                                           or published > state.last_published_at):
+                    state.last_guid = self._get_entry_guid(newest)[:500]
+                    state.last_published_at = published or state.last_published_at
+                new_entries = self._new_entries(feed.entries, state)
+                state.etag = None if new_entries else feed.get('etag')
+                state.modified = None if new_entries else feed.get('modified')
+            self.db.session.add(state)
+            self.db.session.commit()
+        except Exception as e:
+            logger.error(f"Error saving feed state for {state.feed_url}: {e}")
+            self.db.session.rollback()
+    
+    def _new_entries(self, entries, state) -> List:
+        """Entries newer than the newest one seen last time (feeds list newest first)"""
+        new_entries = []
+        for entry in entries:
+            if state.last_guid and self._get_entry_guid(entry) == state.last_guid:
+                break
+            published = self._get_entry_date(entry)
+            if state.last_published_at and published and published <= state.last_published_at:
+                continue
+            new_entries.append(entry)
+        return new_entries
+    
+    def _get_entry_guid(self, entry) -> str:
+        """Stable identifier of an RSS entry"""
+        return entry.get('id') or entry.get('link', '')
+    
     def _process_article(self, entry, feed_url: str) -> bool:
         """
         Process a single article from RSS feed
@@ -109,7 +236,7 @@ class NewsCurator:
             feed_url: Source feed URL
             
         Returns:
-            bool: True if article was stored, False if skipped
+            bool: True if article was stored, False if skipped, None if it failed
         """
         try:
             # Extract basic article info
@@ -190,7 +317,7 @@ class NewsCurator:
         except Exception as e:
             logger.error(f"Error processing article {entry.get('title', 'Unknown')}: {e}")
             self.db.session.rollback()
-            return False
+            return None
     
     def _get_article_content(self, entry) -> str:
         """Extract content from RSS entry"""
@@ -229,6 +356,10 @@ class NewsCurator:
     
     def _get_published_date(self, entry) -> Optional[datetime]:
         """Extract published date from RSS entry"""
+        return self._get_entry_date(entry) or datetime.utcnow()
+    
+    def _get_entry_date(self, entry) -> Optional[datetime]:
+        """Published (or updated) date of an RSS entry, None if it has none"""
         for date_field in ['published_parsed', 'updated_parsed']:
             if hasattr(entry, date_field) and getattr(entry, date_field):
                 try:
@@ -236,7 +367,7 @@ class NewsCurator:
                     return datetime(*time_struct[:6])
                 except:
                     pass
-        return datetime.utcnow()
+        return None
     
     def _detect_language(self, source_name: str) -> str:
         """Detect language based on source"""
@@ -271,21 +402,67 @@ class NewsCurator:
         else:
             return 'general'
     
-    def _cleanup_old_articles(self):
-        """Remove articles older than 30 days"""
-        try:
-            cutoff_date = datetime.utcnow() - timedelta(days=30)
-            old_articles = self.News.query.filter(self.News.created_at < cutoff_date).all()
-            
-            for article in old_articles:
-                self.db.session.delete(article)
+    def cleanup_old_articles(self, retention_days: int = None, retention_by_category: Dict = None,
+                             chunk_size: int = None) -> Dict:
+        """
+        Remove articles past their category's retention period
+        
+        Deletes run as set-based DELETE statements of at most chunk_size rows,
+        each in its own transaction, so locks are held only briefly.
+        
+        Args:
+            retention_days: Default retention (NEWS_RETENTION_DAYS)
+            retention_by_category: Category -> days overrides (NEWS_RETENTION_BY_CATEGORY)
+            chunk_size: Rows per DELETE (NEWS_CLEANUP_CHUNK_SIZE)
             
-            if old_articles:
-                self.db.session.commit()
-                logger.info(f"Cleaned up {len(old_articles)} old articles")
-        except Exception as e:
-            logger.error(f"Error cleaning up old articles: {e}")
-            self.db.session.rollback()
+        Returns:
+            Dict: Deleted article counts, total and per category
+        """
+        retention_days = retention_days if retention_days is not None else NEWS_RETENTION_DAYS
+        if retention_by_category is None:
+            retention_by_category = NEWS_RETENTION_BY_CATEGORY
+        chunk_size = chunk_size or NEWS_CLEANUP_CHUNK_SIZE
+        now = datetime.utcnow()
+        
+        stats = {'deleted': 0, 'by_category': {}, 'errors': []}
+        rules = [
+            (category, self.News.category == category, days)
+            for category, days in retention_by_category.items()
+        ]
+        rules.append((
+            'default',
+            self.News.category.is_(None) | self.News.category.notin_(list(retention_by_category)),
+            retention_days
+        ))
+        
+        for name, condition, days in rules:
+            try:
+                deleted = self._delete_in_chunks(condition, now - timedelta(days=days), chunk_size)
+            except Exception as e:
+                logger.error(f"Error cleaning up old {name} articles: {e}")
+                self.db.session.rollback()
+                stats['errors'].append(f"{name}: {e}")
+                continue
+            if deleted:
+                stats['by_category'][name] = deleted
+                stats['deleted'] += deleted
+        
+        if stats['deleted']:
+            logger.info(f"Cleaned up {stats['deleted']} old articles: {stats['by_category']}")
+        return stats
+    
+    def _delete_in_chunks(self, condition, cutoff_date: datetime, chunk_size: int) -> int:
+        """DELETE matching articles created before the cutoff, chunk_size rows per transaction"""
+        deleted = 0
+        while True:
+            chunk = select(self.News.id).where(condition, self.News.created_at < cutoff_date).limit(chunk_size)
+            result = self.db.session.execute(
+                delete(self.News).where(self.News.id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+            self.db.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < chunk_size:
+                return deleted
     
     def get_latest_news(self, limit: int = 5, category: str = None) -> List[Dict]:
         """
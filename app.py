@@ -8,9 +8,6 @@ from flask_socketio import SocketIO
 from authlib.integrations.flask_client import OAuth
 import os
 import logging
-import threading
-import time
-from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -18,7 +15,18 @@ load_dotenv()
 
 # Import models and services
 from models import db
-from services.news_service import NewsService
+from services.registry import init_service_registry
+from utils.current_user import init_current_user
+from utils.cache import init_cache
+from utils.compression import init_compression
+from utils.fragment_cache import init_fragment_cache
+from utils.template_cache import init_template_cache, warm_templates
+from utils.instrumentation import init_instrumentation
+from utils.slow_query_log import init_slow_query_log
+from utils.metrics import init_metrics
+from jobs.scheduler import init_scheduler, start_scheduler
+from jobs.queue import init_task_queue, start_task_worker
+from commands import register_commands
 
 # Import route blueprints
 from routes.main import main_bp
@@ -26,6 +34,7 @@ from routes.auth import auth_bp
 from routes.admin import admin_bp
 from routes.api import api_bp
 from routes.trips import trips_bp
+from routes.media import media_bp, media_url_prefix
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -58,6 +67,32 @@ def create_app():
     db.init_app(app)
     migrate = Migrate(app, db)
     
+    # Opt-in per-request timing, SQL and template stats (INSTRUMENTATION_ENABLED)
+    init_instrumentation(app)
+    
+    # Statements above SLOW_QUERY_THRESHOLD_MS are logged and shown in the admin panel
+    init_slow_query_log(app)
+    
+    # Prometheus metrics at /metrics, aggregated across workers via METRICS_DIR
+    init_metrics(app)
+    
+    # Expensive clients (S3, AI) are built lazily on first use
+    init_service_registry(app)
+    
+    # Logged-in user is loaded once per request (g.current_user)
+    init_current_user(app)
+    
+    # Response cache (in-process LRU, or Redis when CACHE_REDIS_URL is set),
+    # also backing the {% cache %} template fragment tag
+    init_cache(app)
+    init_fragment_cache(app)
+    
+    # Compiled templates are shared through a bytecode cache on disk
+    init_template_cache(app)
+    
+    # gzip/brotli compression of HTML, JSON, CSS and JS responses
+    init_compression(app)
+    
     # Initialize OAuth
     oauth = OAuth(app)
     
@@ -92,55 +127,30 @@ def create_app():
     app.register_blueprint(admin_bp)
     app.register_blueprint(api_bp)
     app.register_blueprint(trips_bp)
+    app.register_blueprint(media_bp, url_prefix=media_url_prefix())
+    
+    # CLI commands (flask history import, flask export, ...)
+    register_commands(app)
+    
+    # Compile all templates now instead of on the first requests
+    if app.config['TEMPLATE_WARMUP']:
+        warm_templates(app)
+    
+    # Background task queue (worker: python -m jobs.worker)
+    init_task_queue(app)
+    
+    # Recurring jobs (news update, ...); only the lock holder runs them. The
+    # loop is started by the server entry points (gunicorn.conf.py, __main__)
+    init_scheduler(app)
     
     return app, socketio
 
 
-def news_update_scheduler():
-    """Background task to update news every 24 hours at 6 AM."""
-    while True:
-        try:
-            # Calculate seconds until next 6 AM
-            now = datetime.now()
-            next_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
-            
-            # If it's already past 6 AM today, schedule for tomorrow
-            if now.hour >= 6:
-                next_6am = next_6am + timedelta(days=1)
-            
-            sleep_seconds = (next_6am - now).total_seconds()
-            
-            logger.info(f"News update scheduled for {next_6am}, sleeping for {sleep_seconds/3600:.1f} hours")
-            time.sleep(sleep_seconds)
-            
-            # Update news
-            with app.app_context():
-                try:
-                    news_service = NewsService()
-                    success, message, stats = news_service.update_news_feed()
-                    logger.info(f"Scheduled news update completed: {stats}")
-                except Exception as e:
-                    logger.error(f"Scheduled news update failed: {e}")
-            
-        except Exception as e:
-            logger.error(f"News scheduler error: {e}")
-            # Sleep for 1 hour before retrying
-            time.sleep(3600)
-
-
-def start_background_tasks():
-    """Start background tasks."""
-    news_thread = threading.Thread(target=news_update_scheduler, daemon=True)
-    news_thread.start()
-    logger.info("Background news scheduler started")
-
-
 # Create application instance
 app, socketio = create_app()
 
 if __name__ == '__main__':
-    # Start background tasks
-    start_background_tasks()
-    
     port = int(os.environ.get('PORT', 5000))
+    start_scheduler(app)
+    start_task_worker(app)
     socketio.run(app, debug=True, host='0.0.0.0', port=port, allow_unsafe_werkzeug=True)
\ No newline at end of file
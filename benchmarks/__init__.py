@@ -0,0 +1,3 @@
+"""
+Benchmark scripts for the mountaineering club application.
+"""
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compression benchmark: bytes on the wire and CPU time per response for
+gzip levels and brotli (when installed) on representative payloads.
+
+Usage:
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --iterations 500 --levels 1 6 9
+"""
+import argparse
+import json
+import logging
+import os
+import time
+import zlib
+
+from utils.compression import brotli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def news_payload(count=20):
+    """JSON shaped like /api/news/latest."""
+    articles = [{
+        'id': i,
+        'title': f'Expedition update {i}: summit push on the north ridge',
+        'summary': 'Teams report stable weather and good snow conditions above camp three. ' * 3,
+        'url': f'https://example.com/news/{i}',
+        'source': 'Mountain News',
+        'category': 'expeditions',
+        'published_date': '2026-10-01T08:00:00',
+        'relevance_score': 0.8
+    } for i in range(count)]
+    return json.dumps({'success': True, 'articles': articles}).encode('utf-8')
+
+
+def home_page():
+    """Rendered home page, fetched uncompressed through the test client."""
+    from app import app
+    # Without a database the page renders with no announcements
+    logging.disable(logging.ERROR)
+    try:
+        with app.test_client() as client:
+            response = client.get('/', headers={'Accept-Encoding': 'identity'})
+            return response.get_data()
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def static_file(path):
+    with open(os.path.join(ROOT, path), 'rb') as f:
+        return f.read()
+
+
+def measure(compress, data, iterations):
+    """Return (compressed size, CPU microseconds per call)."""
+    start = time.process_time()
+    for _ in range(iterations):
+        compressed = compress(data)
+    elapsed = time.process_time() - start
+    return len(compressed), elapsed / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 6, 9])
+    parser.add_argument('--br-levels', type=int, nargs='+', default=[4, 11])
+    args = parser.parse_args()
+    
+    payloads = {
+        'home.html': home_page(),
+        'news.json': news_payload(),
+        'ai_features.css': static_file('static/css/ai_features.css'),
+        'today_in_history.js': static_file('static/js/today_in_history.js')
+    }
+    
+    codecs = [(f'gzip-{level}', lambda data, level=level: zlib.compress(data, level))
+              for level in args.levels]
+    if brotli is not None:
+        codecs += [(f'br-{level}', lambda data, level=level: brotli.compress(data, quality=level))
+                   for level in args.br_levels]
+    else:
+        print("Brotli not installed, skipping br\n")
+    
+    print(f"{'payload':<22}{'codec':<10}{'bytes':>9}{'ratio':>8}{'cpu us':>10}")
+    for name, data in payloads.items():
+        print(f"{name:<22}{'identity':<10}{len(data):>9}{1:>8.2f}{0:>10.1f}")
+        for codec, compress in codecs:
+            size, cpu = measure(compress, data, args.iterations)
+            print(f"{'':<22}{codec:<10}{size:>9}{size / len(data):>8.2f}{cpu:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
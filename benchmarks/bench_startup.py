@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: import time of the app module, first-use cost of
+the lazily created services and first template render with a cold and a
+warm bytecode cache.
+
+Usage:
+    python -m benchmarks.bench_startup              # 5 runs
+    python -m benchmarks.bench_startup --runs 10 --top 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import app
+print(f"{(time.perf_counter() - start) * 1000:.1f}")
+"""
+
+SERVICES_SNIPPET = """
+import time
+import app
+for name in ('image_handler', 'news_service'):
+    with app.app.app_context():
+        from services.registry import get_service
+        start = time.perf_counter()
+        get_service(name)
+        print(f"{name} {(time.perf_counter() - start) * 1000:.1f}")
+"""
+
+TEMPLATES_SNIPPET = """
+import logging
+import time
+import app
+logging.disable(logging.ERROR)
+flask_app = app.app
+start = time.perf_counter()
+flask_app.test_client().get('/')
+print(f"{(time.perf_counter() - start) * 1000:.1f}")
+start = time.perf_counter()
+for name in flask_app.jinja_env.list_templates(extensions=['html']):
+    flask_app.jinja_env.get_template(name)
+print(f"{(time.perf_counter() - start) * 1000:.1f}")
+"""
+
+
+def run_python(code, *flags, env=None):
+    """Run a snippet in a fresh interpreter and return (stdout, stderr)."""
+    result = subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, **(env or {})}
+    )
+    return result.stdout, result.stderr
+
+
+def measure_import(runs):
+    """Measure `import app` wall time over several fresh interpreters."""
+    return [float(run_python(IMPORT_SNIPPET)[0].strip().splitlines()[-1]) for _ in range(runs)]
+
+
+def measure_templates(env):
+    """Return (first home page render ms, compile remaining templates ms)."""
+    stdout, _ = run_python(TEMPLATES_SNIPPET, env=env)
+    first_render, compile_all = stdout.strip().splitlines()[-2:]
+    return float(first_render), float(compile_all)
+
+
+def slowest_imports(top):
+    """Return the modules with the highest cumulative import time."""
+    _, stderr = run_python('import app', '-X', 'importtime')
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = [part.strip() for part in line.split('|')]
+        rows.append((int(cumulative_us), int(self_us.split(':')[1]), module))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure application cold-start time')
+    parser.add_argument('--runs', type=int, default=5, help='number of fresh interpreter runs')
+    parser.add_argument('--top', type=int, default=15, help='number of slowest imports to list')
+    args = parser.parse_args()
+    
+    timings = measure_import(args.runs)
+    print(f"import app: median {statistics.median(timings):.1f} ms, "
+          f"min {min(timings):.1f} ms, max {max(timings):.1f} ms ({args.runs} runs)")
+    
+    print("\nFirst use of lazy services:")
+    stdout, _ = run_python(SERVICES_SNIPPET)
+    for line in stdout.strip().splitlines():
+        name, ms = line.split()
+        print(f"  {name:<15} {float(ms):8.1f} ms")
+    
+    print("\nFirst template render (home page, then all remaining templates):")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scenarios = [
+            ('no cache', {'TEMPLATE_BYTECODE_CACHE': 'False'}),
+            ('cold cache', {'TEMPLATE_CACHE_DIR': cache_dir}),
+            ('warm cache', {'TEMPLATE_CACHE_DIR': cache_dir})
+        ]
+        for label, env in scenarios:
+            first_render, compile_all = measure_templates(env)
+            print(f"  {label:<15} {first_render:8.1f} ms  + {compile_all:8.1f} ms")
+    
+    print("\nSlowest imports (cumulative):")
+    for cumulative_us, self_us, module in slowest_imports(args.top):
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
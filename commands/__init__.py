@@ -0,0 +1,23 @@
+"""
+Flask CLI commands for the mountaineering club application.
+"""
+from .historical_events import history_cli
+from .export import export_cli
+from .trips import trips_cli
+
+
+def register_commands(app):
+    """
+    Register the CLI commands (flask history ..., flask export ..., flask trips ...).
+    
+    Args:
+        app: Flask application
+    """
+    app.cli.add_command(history_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(trips_cli)
+
+
+__all__ = [
+    'register_commands'
+]
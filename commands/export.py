@@ -0,0 +1,31 @@
+"""
+Export commands: flask export DATASET
+"""
+import sys
+
+import click
+from flask.cli import with_appcontext
+
+from services.export_service import ExportService, EXPORTS, EXPORT_FORMATS
+
+
+@click.command('export')
+@click.argument('dataset', type=click.Choice(sorted(EXPORTS)))
+@click.option('--format', 'export_format', type=click.Choice(sorted(EXPORT_FORMATS)), default='csv', show_default=True)
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), help='File to write (default: stdout).')
+@click.option('--trip-id', type=int, help='Only participants of this trip.')
+@with_appcontext
+def export_cli(dataset, export_format, output, trip_id):
+    """
+    Stream a dataset (participants, trip_reports, news) as CSV or JSON Lines.
+    """
+    chunks = ExportService.stream(dataset, export_format, trip_id)
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        return
+    
+    with open(output, 'w', encoding='utf-8', newline='') as fp:
+        for chunk in chunks:
+            fp.write(chunk)
+    click.echo(f"Exported {dataset} to {output}", err=True)
@@ -0,0 +1,43 @@
+"""
+Historical event commands: flask history import FILE
+"""
+import time
+
+import click
+from flask.cli import AppGroup
+
+from services.import_service import ImportService, iter_json_records
+from utils.cache import invalidate_cache
+
+history_cli = AppGroup('history', help='Historical events.')
+
+
+@history_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=1000, show_default=True, help='Events per transaction.')
+@click.option('--no-update', is_flag=True, help='Skip events that already exist instead of updating them.')
+@click.option('--dry-run', is_flag=True, help='Validate and count without writing.')
+def import_events(path, chunk_size, no_update, dry_run):
+    """
+    Bulk import events from a JSON array or JSON Lines file.
+    
+    Events are upserted on (date, year, title), e.g.
+    flask history import data/historical_events_seed.json
+    """
+    start = time.perf_counter()
+    with open(path, encoding='utf-8') as fp:
+        success, message, stats = ImportService.import_historical_events(
+            iter_json_records(fp),
+            chunk_size=chunk_size,
+            update_existing=not no_update,
+            dry_run=dry_run
+        )
+    
+    for error in stats['errors']:
+        click.echo(f"  {error}", err=True)
+    if not success:
+        raise click.ClickException(message)
+    
+    if not dry_run and (stats['inserted'] or stats['updated']):
+        invalidate_cache('history')
+    click.echo(f"{'[dry run] ' if dry_run else ''}{message} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,18 @@
+"""
+Planned trip commands: flask trips recount
+"""
+import click
+from flask.cli import AppGroup
+
+from services.trip_service import TripService
+
+trips_cli = AppGroup('trips', help='Planned trips.')
+
+
+@trips_cli.command('recount')
+def recount_participants():
+    """Rebuild participant counters and full/open status from the registrations."""
+    success, message, fixed = TripService.recount_participants()
+    if not success:
+        raise click.ClickException(message)
+    click.echo(message)
@@ -0,0 +1,13 @@
+"""
+Gunicorn configuration (loaded automatically from the working directory).
+"""
+
+
+def post_worker_init(worker):
+    """Start the job scheduler and task worker thread in each serving worker, never in CLI processes."""
+    from jobs.scheduler import start_scheduler
+    from jobs.queue import start_task_worker
+    from app import app
+    
+    start_scheduler(app)
+    start_task_worker(app)
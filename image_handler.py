@@ -1,25 +1,31 @@
-import boto3
-from botocore.config import Config
 import io
 import os
+import re
+import shutil
+import tempfile
+import time
 import uuid
 from PIL import Image, ImageOps
-from botocore.exceptions import ClientError
 import logging
 
+from storage import get_storage_backend
+from utils.metrics import metrics
+from jobs.queue import enqueue
+
 logger = logging.getLogger(__name__)
 
+# Direct (browser to bucket) uploads
+DIRECT_UPLOAD_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/webp')
+DIRECT_UPLOAD_MAX_SIZE = 10 * 1024 * 1024  # 10MB, same limit as form uploads
+ORIGINAL_KEY_PATTERN = re.compile(
+    r'^mountaineering_club/(?P<folder>[a-z_]+)/originals/(?P<file_id>[0-9a-f-]{36})$'
+)
+
+
 class ImageHandler:
-    def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.environ.get('AWS_REGION', 'eu-north-1'),
-            endpoint_url=os.environ.get('AWS_S3_ENDPOINT_URL')
-        )
-        self.bucket_name = os.environ.get('AWS_S3_BUCKET')
-        self.cloudfront_domain = os.environ.get('AWS_CLOUDFRONT_DOMAIN', '')
+    def __init__(self, storage=None):
+        self.storage = storage or get_storage_backend()
+        self.keep_originals = os.environ.get('AWS_S3_KEEP_ORIGINALS', 'False').lower() == 'true'
         
     def optimize_image(self, image_file, max_width=1200, max_height=800, quality=85):
         """
@@ -29,6 +35,9 @@ class ImageHandler:
         try:
             # Open and fix orientation
             image = Image.open(image_file)
+            # Let the JPEG decoder downscale while decoding; large camera
+            # originals never get fully expanded in memory
+            image.draft('RGB', (max(max_width, max_height),) * 2)
             image = ImageOps.exif_transpose(image)  # Fix rotation from EXIF
             
             # Convert to RGB if necessary (for RGBA, P mode images)
@@ -44,9 +53,10 @@ class ImageHandler:
             # Create optimized main image
             main_image = image.copy()
             main_image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            del image
             
-            # Create thumbnail
-            thumbnail = image.copy()
+            # Create thumbnail from the already resized image
+            thumbnail = main_image.copy()
             thumbnail.thumbnail((300, 200), Image.Resampling.LANCZOS)
             
             # Save optimized main image to BytesIO
@@ -65,63 +75,64 @@ class ImageHandler:
             logger.error(f"Error optimizing image: {e}")
             raise
     
-    def upload_to_s3(self, file_buffer, key, content_type='image/jpeg'):
-        """Upload file buffer to S3"""
-        try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=key,
-                Body=file_buffer.getvalue(),
-                ContentType=content_type,
-                CacheControl='max-age=31536000'  # Cache for 1 year
-            )
-            return True
-        except ClientError as e:
-            logger.error(f"Error uploading to S3: {e}")
-            return False
+    def upload_file(self, file_buffer, key, content_type='image/jpeg'):
+        """Store a buffer or file object in the configured storage backend"""
+        return self.storage.put(file_buffer, key, content_type)
     
     def get_image_url(self, key):
         """Get public URL for image"""
-        if self.cloudfront_domain:
-            return f"https://{self.cloudfront_domain}/{key}"
-        else:
-            return f"https://{self.bucket_name}.s3.{os.environ.get('AWS_REGION', 'eu-central-1')}.amazonaws.com/{key}"
+        return self.storage.url(key)
     
     def delete_image(self, key):
-        """Delete image from S3"""
-        try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
-            return True
-        except ClientError as e:
-            logger.error(f"Error deleting from S3: {e}")
-            return False
+        """Delete image from storage"""
+        return self.storage.delete(key)
+    
+    @staticmethod
+    def _image_keys(folder, file_id):
+        """Return (main_key, thumb_key, original_key) for an image"""
+        return (
+            f"mountaineering_club/{folder}/{file_id}.jpg",
+            f"mountaineering_club/{folder}/thumbs/{file_id}.jpg",
+            f"mountaineering_club/{folder}/originals/{file_id}"
+        )
     
-    def process_and_upload_image(self, image_file, folder="trip_reports"):
+    def process_and_upload_image(self, image_file, folder="trip_reports", keep_original=None):
         """
         Complete image processing pipeline:
-        1. Optimize image
-        2. Upload to S3
-        3. Return URLs and metadata
+        1. Optionally stream the untouched original to storage
+        2. Optimize image
+        3. Upload to storage
+        4. Return URLs and metadata
         """
+        start = time.perf_counter()
         try:
             # Generate unique filename
             file_id = str(uuid.uuid4())
-            main_key = f"mountaineering_club/{folder}/{file_id}.jpg"
-            thumb_key = f"mountaineering_club/{folder}/thumbs/{file_id}.jpg"
+            main_key, thumb_key, original_key = self._image_keys(folder, file_id)
+            
+            if keep_original is None:
+                keep_original = self.keep_originals
+            if not keep_original:
+                original_key = None
+            else:
+                content_type = getattr(image_file, 'mimetype', None) or 'application/octet-stream'
+                if not self.upload_file(image_file, original_key, content_type):
+                    raise Exception("Failed to upload original image")
+                image_file.seek(0)
             
             # Optimize image
             main_buffer, thumb_buffer, main_size, thumb_size = self.optimize_image(image_file)
             
             # Upload main image
-            if not self.upload_to_s3(main_buffer, main_key):
+            if not self.upload_file(main_buffer, main_key):
                 raise Exception("Failed to upload main image")
             
             # Upload thumbnail
-            if not self.upload_to_s3(thumb_buffer, thumb_key):
+            if not self.upload_file(thumb_buffer, thumb_key):
                 raise Exception("Failed to upload thumbnail")
             
             # Return metadata
-            return {
+            metadata = {
                 'key': main_key,
                 'thumb_key': thumb_key,
                 'url': self.get_image_url(main_key),
@@ -131,6 +142,10 @@ class ImageHandler:
                 'thumb_width': thumb_size[0],
                 'thumb_height': thumb_size[1]
             }
+            if original_key:
+                metadata['original_key'] = original_key
+            metrics.observe('image_processing_duration_seconds', time.perf_counter() - start, source='form')
+            return metadata
             
         except Exception as e:
             logger.error(f"Error processing image: {e}")
@@ -141,7 +156,166 @@ class ImageHandler:
         try:
             self.delete_image(image_metadata['key'])
             self.delete_image(image_metadata['thumb_key'])
+            if image_metadata.get('original_key'):
+                self.delete_image(image_metadata['original_key'])
             return True
         except Exception as e:
             logger.error(f"Error deleting images: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def create_upload_intent(self, content_type, folder="trip_reports", expires_in=3600):
+        """
+        Reserve a key for an original and presign a direct browser upload.
+        
+        Returns:
+            dict: Original 'key' plus the 'url' and form 'fields' to POST to
+            
+        Raises:
+            ValueError: If the content type is not an accepted image type
+        """
+        if content_type not in DIRECT_UPLOAD_CONTENT_TYPES:
+            raise ValueError('Unsupported image type')
+        
+        _, _, original_key = self._image_keys(folder, str(uuid.uuid4()))
+        upload = self.storage.create_upload(
+            original_key, content_type, DIRECT_UPLOAD_MAX_SIZE, expires_in
+        )
+        return {
+            'key': original_key,
+            'url': upload['url'],
+            'fields': upload['fields']
+        }
+    
+    def photo_metadata_for_original(self, original_key):
+        """
+        Build the photo metadata for a directly uploaded original.
+        Until the original has been processed the photo is 'pending': it is
+        shown from the original itself and its dimensions are unknown.
+        
+        Raises:
+            ValueError: If the key was not issued by create_upload_intent
+        """
+        match = ORIGINAL_KEY_PATTERN.match(original_key or '')
+        if not match:
+            raise ValueError('Invalid upload key')
+        
+        main_key, thumb_key, _ = self._image_keys(match.group('folder'), match.group('file_id'))
+        return {
+            'key': main_key,
+            'thumb_key': thumb_key,
+            'original_key': original_key,
+            'url': self.get_image_url(original_key),
+            'thumbnail_url': self.get_image_url(original_key),
+            'width': None,
+            'height': None,
+            'status': 'pending'
+        }
+    
+    def process_stored_original(self, original_key):
+        """
+        Optimize an original that is already in storage and store the
+        main image and thumbnail next to it.
+        
+        Returns:
+            dict: Photo metadata including final dimensions
+        """
+        start = time.perf_counter()
+        metadata = self.photo_metadata_for_original(original_key)
+        
+        original = self.storage.get(original_key)
+        if original is None:
+            raise Exception(f"Original image not found: {original_key}")
+        
+        # Storage streams are not seekable; spool to a temp file for Pillow
+        with tempfile.SpooledTemporaryFile(max_size=DIRECT_UPLOAD_MAX_SIZE) as spooled:
+            try:
+                shutil.copyfileobj(original, spooled)
+            finally:
+                original.close()
+            spooled.seek(0)
+            main_buffer, thumb_buffer, main_size, thumb_size = self.optimize_image(spooled)
+        
+        if not self.upload_file(main_buffer, metadata['key']):
+            raise Exception("Failed to upload main image")
+        if not self.upload_file(thumb_buffer, metadata['thumb_key']):
+            raise Exception("Failed to upload thumbnail")
+        
+        metadata.update({
+            'url': self.get_image_url(metadata['key']),
+            'thumbnail_url': self.get_image_url(metadata['thumb_key']),
+            'status': 'ready',
+            'width': main_size[0],
+            'height': main_size[1],
+            'thumb_width': thumb_size[0],
+            'thumb_height': thumb_size[1]
+        })
+        metrics.observe('image_processing_duration_seconds', time.perf_counter() - start, source='direct')
+        logger.info(f"Processed uploaded original {original_key}")
+        return metadata
+    
+    def process_stored_original_in_background(self, original_key, trip_report_id):
+        """Queue optimization of a stored original and the update of its trip report"""
+        return enqueue('images.process_original', {'key': original_key, 'trip_report_id': trip_report_id},
+                       unique_key=f'images.process_original:{original_key}')
+    
+    def delete_unclaimed_originals(self, claimed_keys, older_than, folder="trip_reports"):
+        """
+        Delete directly uploaded originals that no photo refers to.
+        
+        Browsers upload originals before the form is submitted; abandoned
+        forms leave them behind. Only originals older than the upload token
+        lifetime are considered, so uploads in progress are kept.
+        
+        Args:
+            claimed_keys (set): Original keys referenced by stored photos
+            older_than (datetime): Only originals last modified before this (UTC)
+            folder (str): Image folder
+            
+        Returns:
+            list: Deleted keys
+        """
+        unclaimed = [
+            key for key, last_modified in self.storage.list(f"mountaineering_club/{folder}/originals/")
+            if key not in claimed_keys and last_modified < older_than and ORIGINAL_KEY_PATTERN.match(key)
+        ]
+        remaining = set(self.delete_keys(unclaimed))
+        deleted = [key for key in unclaimed if key not in remaining]
+        if deleted:
+            logger.info(f"Deleted {len(deleted)} unclaimed uploaded originals")
+        return deleted
+    
+    @staticmethod
+    def collect_image_keys(photos):
+        """Collect the storage keys of every variant of the given photos"""
+        keys = []
+        for photo in photos or []:
+            for field in ('key', 'thumb_key', 'original_key'):
+                if photo.get(field):
+                    keys.append(photo[field])
+        return keys
+    
+    def delete_keys(self, keys, max_attempts=3, retry_delay=2):
+        """
+        Bulk delete keys, retrying the ones that failed with backoff.
+        
+        Returns:
+            list: Keys still not deleted after all attempts
+        """
+        remaining = list(keys)
+        for attempt in range(1, max_attempts + 1):
+            if not remaining:
+                break
+            remaining = self.storage.delete_many(remaining)
+            if remaining and attempt < max_attempts:
+                logger.warning(f"Retrying deletion of {len(remaining)} images (attempt {attempt})")
+                time.sleep(retry_delay * attempt)
+        
+        if remaining:
+            logger.error(f"Giving up deleting {len(remaining)} images: {remaining}")
+        return remaining
+    
+    def delete_keys_in_background(self, keys):
+        """Queue a bulk delete so the request can return immediately"""
+        if not keys:
+            return None
+        return enqueue('images.delete', {'keys': list(keys)})
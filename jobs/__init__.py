@@ -0,0 +1,17 @@
+"""
+Background jobs for the mountaineering club application.
+"""
+from .scheduler import Scheduler, register_job, init_scheduler, start_scheduler
+from .queue import task, enqueue, get_task, init_task_queue, start_task_worker
+
+__all__ = [
+    'Scheduler',
+    'register_job',
+    'init_scheduler',
+    'start_scheduler',
+    'task',
+    'enqueue',
+    'get_task',
+    'init_task_queue',
+    'start_task_worker'
+]
@@ -0,0 +1,105 @@
+"""
+Minimal cron expression parsing.
+
+Supports the five standard fields (minute hour day-of-month month
+day-of-week) with '*', lists, ranges and steps, e.g. '*/15 * * * *' or
+'0 6 * * 1-5'. As in cron, when both day fields are restricted a day
+matches if either does. Schedules are evaluated in a local time zone and
+returned as naive UTC datetimes, like the rest of the database.
+"""
+from datetime import datetime, timedelta, timezone
+
+FIELD_RANGES = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 6)  # 0 = Sunday
+)
+
+
+def _parse_field(expression, low, high, name):
+    values = set()
+    for part in expression.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in {name} field: {expression}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if name == 'weekday' and end == 7:
+            # Both 0 and 7 mean Sunday
+            values.add(0)
+            end = 6
+        if start < low or end > high or start > end:
+            raise ValueError(f"Value out of range in {name} field: {expression}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A parsed cron expression."""
+    
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [_parse_field(field, low, high, name)
+                  for field, (name, low, high) in zip(fields, FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (sorted(values) for values in parsed)
+        self._day_restricted = fields[2] != '*'
+        self._weekday_restricted = fields[4] != '*'
+    
+    def _day_matches(self, day):
+        in_days = day.day in self.days
+        # Python: Monday=0; cron: Sunday=0
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+    
+    def next_local(self, after):
+        """
+        First matching local time strictly after `after` (naive local datetime).
+        
+        Raises:
+            ValueError: If nothing matches within five years (e.g. Feb 30)
+        """
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(366 * 5):
+            if day.month in self.months and self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+    
+    def next_after(self, after, tz=None):
+        """
+        Next run time after a UTC time.
+        
+        Args:
+            after (datetime): Naive UTC datetime
+            tz (tzinfo): Zone the schedule is written in (server local time if None)
+            
+        Returns:
+            datetime: Naive UTC datetime of the next run
+        """
+        local_after = after.replace(tzinfo=timezone.utc).astimezone(tz).replace(tzinfo=None)
+        local_next = self.next_local(local_after)
+        aware_next = local_next.replace(tzinfo=tz) if tz else local_next.astimezone()
+        return aware_next.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    def __repr__(self):
+        return f'<CronSchedule {self.expression}>'
@@ -0,0 +1,61 @@
+"""
+Scheduled job definitions.
+
+Schedules are cron expressions in SCHEDULER_TIMEZONE (Europe/Ljubljana by
+default). Jobs run inside an application context.
+"""
+import logging
+
+from datetime import datetime, timedelta
+
+from jobs.queue import enqueue, get_task_queue
+from jobs.scheduler import register_job
+from services.registry import get_service
+from services.trip_service import TripService
+
+logger = logging.getLogger(__name__)
+
+
+# Minutes between news_refresh runs; each run refreshes the feeds whose slot falls in it
+NEWS_REFRESH_WINDOW = 5
+
+
+@register_job('news_refresh', '*/5 * * * *', misfire_grace_seconds=240)
+def refresh_news():
+    """Queue an incremental refresh of the feeds due in this 5 minute slot."""
+    feed_urls = get_service('news_service').news_curator.feeds_due(datetime.utcnow(), NEWS_REFRESH_WINDOW)
+    if feed_urls:
+        enqueue('news.refresh', {'feed_urls': feed_urls})
+
+
+@register_job('news_update', '0 6 * * *')
+def update_news():
+    """Queue a full news update every morning at 6 AM (catches what the refreshes missed)."""
+    enqueue('news.update', unique_key='news.update')
+
+
+@register_job('news_cleanup', '15 4 * * *')
+def cleanup_news():
+    """Remove expired news articles once a day."""
+    success, message, stats = get_service('news_service').cleanup_old_news()
+    if not success:
+        raise RuntimeError(f"{message}: {stats['errors']}")
+    logger.info(f"{message} {stats['by_category']}")
+
+
+@register_job('purge_tasks', '30 3 * * *')
+def purge_tasks():
+    """Delete finished tasks older than a week."""
+    deleted = get_task_queue().purge(datetime.utcnow() - timedelta(days=7))
+    logger.info(f"Purged {deleted} finished tasks")
+
+
+@register_job('cleanup_uploads', '45 3 * * *')
+def cleanup_uploads():
+    """Delete directly uploaded originals that no trip report claimed."""
+    # Upload tokens are valid for a day; anything older can no longer be attached
+    older_than = datetime.utcnow() - timedelta(days=2)
+    deleted = get_service('image_handler').delete_unclaimed_originals(
+        TripService.claimed_original_keys(), older_than
+    )
+    logger.info(f"Deleted {len(deleted)} unclaimed uploads")
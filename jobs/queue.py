@@ -0,0 +1,527 @@
+"""
+Durable background task queue.
+
+Routes enqueue work and return immediately; worker processes
+(python -m jobs.worker) claim tasks, run them and store the result. Tasks
+are stored in the application database by default, or in Redis when
+TASK_QUEUE_REDIS_URL is set.
+
+- Priorities: higher priority tasks are claimed first.
+- Visibility timeout: a claimed task is leased until locked_until; if the
+  worker dies, the task becomes claimable again after the lease expires.
+- Retries: a failed attempt is retried with exponential backoff until
+  max_attempts is reached.
+- Deployments without a separate worker process run tasks in a worker
+  thread of the web process (TASK_WORKER_IN_PROCESS, on by default), never
+  inside the request.
+- TASK_QUEUE_EAGER runs tasks inline at enqueue time, for tests only: the
+  task shares the caller's session and failed attempts are not retried.
+"""
+import os
+import json
+import time
+import random
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, update
+
+from models import db, Task
+
+logger = logging.getLogger(__name__)
+
+# name -> TaskDefinition, filled by @task
+TASKS = {}
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class TaskDefinition:
+    """A task function and its queueing defaults."""
+    
+    def __init__(self, name, func, priority=0, max_attempts=3, timeout=300):
+        self.name = name
+        self.func = func
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+
+
+def task(name, priority=0, max_attempts=3, timeout=300):
+    """
+    Register a function as a background task.
+    
+    The function is called with the task payload as keyword arguments and
+    its return value (JSON-serializable) is stored as the task result.
+    
+    Args:
+        name (str): Unique task name
+        priority (int): Default priority (higher runs first)
+        max_attempts (int): Attempts before the task is marked failed
+        timeout (int): Visibility timeout in seconds
+    """
+    def decorator(func):
+        TASKS[name] = TaskDefinition(name, func, priority, max_attempts, timeout)
+        return func
+    return decorator
+
+
+def retry_delay(attempts, base=None, maximum=None):
+    """Exponential backoff with jitter for the given number of attempts made."""
+    base = base if base is not None else float(os.environ.get('TASK_RETRY_BASE_DELAY', 10))
+    maximum = maximum if maximum is not None else float(os.environ.get('TASK_RETRY_MAX_DELAY', 3600))
+    delay = min(base * 2 ** max(attempts - 1, 0), maximum)
+    return delay + random.uniform(0, delay * 0.1)
+
+
+class DatabaseTaskQueue:
+    """Task queue stored in the application database."""
+    
+    def __init__(self, clock=datetime.utcnow):
+        self._clock = clock
+    
+    def enqueue(self, name, payload, priority, max_attempts, delay=0, unique_key=None):
+        if unique_key:
+            existing = Task.query.filter(
+                Task.unique_key == unique_key,
+                Task.status.in_(ACTIVE_STATUSES)
+            ).first()
+            if existing is not None:
+                return existing.id
+        
+        new_task = Task(
+            name=name,
+            payload=payload,
+            priority=priority,
+            max_attempts=max_attempts,
+            unique_key=unique_key,
+            run_at=self._clock() + timedelta(seconds=delay),
+            status='queued'
+        )
+        db.session.add(new_task)
+        db.session.commit()
+        return new_task.id
+    
+    def _claimable(self, now):
+        return or_(
+            and_(Task.status == 'queued', Task.run_at <= now),
+            # Lease of a crashed or stuck worker ran out
+            and_(Task.status == 'running', Task.locked_until < now)
+        )
+    
+    def claim(self, worker_id, timeout_for, task_id=None):
+        """
+        Lease the next available task.
+        
+        Candidates are read first and then leased with a conditional UPDATE,
+        so two workers can never claim the same task (no SKIP LOCKED needed).
+        
+        Args:
+            worker_id (str): Lease owner
+            timeout_for (callable): Task name -> visibility timeout in seconds
+            task_id (int): Only claim this task (eager mode)
+        
+        Returns:
+            dict or None: Claimed task (id, name, payload, attempts, max_attempts)
+        """
+        now = self._clock()
+        query = db.session.query(Task.id, Task.name).filter(self._claimable(now))
+        if task_id is not None:
+            query = query.filter(Task.id == task_id)
+        candidates = query.order_by(
+            Task.priority.desc(), Task.run_at, Task.id
+        ).limit(5).all()
+        
+        for task_id, name in candidates:
+            result = db.session.execute(
+                update(Task)
+                .where(Task.id == task_id, self._claimable(now))
+                .values(
+                    status='running',
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=timeout_for(name)),
+                    attempts=Task.attempts + 1,
+                    started_at=now
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            if result.rowcount == 1:
+                claimed = db.session.get(Task, task_id)
+                db.session.refresh(claimed)
+                return {
+                    'id': claimed.id,
+                    'name': claimed.name,
+                    'payload': claimed.payload or {},
+                    'attempts': claimed.attempts,
+                    'max_attempts': claimed.max_attempts
+                }
+        return None
+    
+    def _owned(self, task_id, worker_id):
+        # A worker whose lease expired must not overwrite the run that re-claimed the task
+        return and_(Task.id == task_id, Task.status == 'running', Task.locked_by == worker_id)
+    
+    def complete(self, task_id, result, worker_id):
+        """
+        Store the result of a task still leased by the worker.
+        
+        Returns:
+            bool: False if the lease was lost to another worker
+        """
+        updated = db.session.execute(
+            update(Task).where(self._owned(task_id, worker_id)).values(
+                status='succeeded', result=result, error=None,
+                finished_at=self._clock(), locked_by=None, locked_until=None
+            )
+        ).rowcount
+        db.session.commit()
+        return updated == 1
+    
+    def fail(self, task_id, error, attempts, max_attempts, worker_id):
+        """
+        Record a failed attempt, scheduling a retry if attempts remain.
+        
+        Returns:
+            bool: True if the task will be retried
+        """
+        retry = attempts < max_attempts
+        values = {'error': error, 'locked_by': None, 'locked_until': None}
+        if retry:
+            values.update(status='queued', run_at=self._clock() + timedelta(seconds=retry_delay(attempts)))
+        else:
+            values.update(status='failed', finished_at=self._clock())
+        updated = db.session.execute(update(Task).where(self._owned(task_id, worker_id)).values(**values)).rowcount
+        db.session.commit()
+        return retry and updated == 1
+    
+    def get(self, task_id):
+        found = db.session.get(Task, task_id)
+        return found.to_dict() if found else None
+    
+    def purge(self, older_than):
+        """Delete finished tasks older than the given datetime."""
+        deleted = Task.query.filter(
+            Task.status.in_(('succeeded', 'failed')),
+            Task.finished_at < older_than
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+
+class RedisTaskQueue:
+    """
+    Task queue stored in Redis.
+    
+    Each task is a JSON string under task:<id>. Ready task ids sit in a
+    sorted set ordered by priority then enqueue time, delayed retries in a
+    set scored by run time, and running tasks in a set scored by lease
+    expiry, from which expired leases are moved back to ready.
+    """
+    
+    def __init__(self, url, prefix='mc:tasks:', result_ttl=7 * 24 * 3600):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.result_ttl = result_ttl
+    
+    def _key(self, *parts):
+        return self.prefix + ':'.join(str(part) for part in parts)
+    
+    @staticmethod
+    def _ready_score(priority):
+        # Lower scores pop first: priority dominates, then enqueue time
+        return -priority * 1e10 + time.time()
+    
+    def _load(self, task_id):
+        data = self.client.get(self._key('task', task_id))
+        return json.loads(data) if data else None
+    
+    def _save(self, record, ttl=None):
+        self.client.set(self._key('task', record['id']), json.dumps(record), ex=ttl)
+    
+    def enqueue(self, name, payload, priority, max_attempts, delay=0, unique_key=None):
+        if unique_key:
+            existing = self.client.get(self._key('unique', unique_key))
+            if existing is not None:
+                record = self._load(int(existing))
+                if record and record['status'] in ACTIVE_STATUSES:
+                    return record['id']
+        
+        task_id = self.client.incr(self._key('ids'))
+        record = {
+            'id': task_id, 'name': name, 'payload': payload, 'status': 'queued',
+            'priority': priority, 'attempts': 0, 'max_attempts': max_attempts,
+            'unique_key': unique_key, 'result': None, 'error': None,
+            'created_at': datetime.utcnow().isoformat(), 'started_at': None, 'finished_at': None
+        }
+        self._save(record)
+        if unique_key:
+            self.client.set(self._key('unique', unique_key), task_id)
+        if delay:
+            self.client.zadd(self._key('delayed'), {task_id: time.time() + delay})
+        else:
+            self.client.zadd(self._key('ready'), {task_id: self._ready_score(priority)})
+        return task_id
+    
+    def _promote(self):
+        now = time.time()
+        for set_name in ('delayed', 'running'):
+            for raw_id in self.client.zrangebyscore(self._key(set_name), 0, now):
+                # Only the process that removes the id re-queues it
+                if self.client.zrem(self._key(set_name), raw_id):
+                    record = self._load(int(raw_id))
+                    if record:
+                        self.client.zadd(self._key('ready'), {int(raw_id): self._ready_score(record['priority'])})
+    
+    def claim(self, worker_id, timeout_for, task_id=None):
+        self._promote()
+        if task_id is None:
+            popped = self.client.zpopmin(self._key('ready'))
+            if not popped:
+                return None
+            task_id = int(popped[0][0])
+        elif not self.client.zrem(self._key('ready'), task_id):
+            return None
+        record = self._load(task_id)
+        if record is None:
+            return None
+        
+        self.client.zadd(self._key('running'), {task_id: time.time() + timeout_for(record['name'])})
+        record.update(status='running', attempts=record['attempts'] + 1, locked_by=worker_id,
+                      started_at=datetime.utcnow().isoformat())
+        self._save(record)
+        return {key: record[key] for key in ('id', 'name', 'payload', 'attempts', 'max_attempts')}
+    
+    def _load_owned(self, task_id, worker_id):
+        record = self._load(task_id)
+        if record is None or record.get('status') != 'running' or record.get('locked_by') != worker_id:
+            # Lease lost: another worker re-claimed the task
+            return None
+        self.client.zrem(self._key('running'), task_id)
+        return record
+    
+    def complete(self, task_id, result, worker_id):
+        record = self._load_owned(task_id, worker_id)
+        if record is None:
+            return False
+        record.update(status='succeeded', result=result, error=None, locked_by=None,
+                      finished_at=datetime.utcnow().isoformat())
+        self._save(record, ttl=self.result_ttl)
+        return True
+    
+    def fail(self, task_id, error, attempts, max_attempts, worker_id):
+        record = self._load_owned(task_id, worker_id)
+        if record is None:
+            return False
+        retry = attempts < max_attempts
+        record['error'] = error
+        record['locked_by'] = None
+        if retry:
+            record['status'] = 'queued'
+            self._save(record)
+            self.client.zadd(self._key('delayed'), {task_id: time.time() + retry_delay(attempts)})
+        else:
+            record.update(status='failed', finished_at=datetime.utcnow().isoformat())
+            self._save(record, ttl=self.result_ttl)
+        return retry
+    
+    def get(self, task_id):
+        record = self._load(task_id)
+        if record:
+            record.pop('payload', None)
+            record.pop('unique_key', None)
+        return record
+    
+    def purge(self, older_than):
+        # Finished records expire on their own (result_ttl)
+        return 0
+
+
+def tasks_run_eagerly(app):
+    """
+    Whether tasks run inline at enqueue time instead of in a worker.
+    
+    Off unless TASK_QUEUE_EAGER is set (tests).
+    
+    Args:
+        app: Flask application
+    
+    Returns:
+        bool: True if tasks run eagerly
+    """
+    if 'TASK_QUEUE_EAGER' not in app.config:
+        app.config['TASK_QUEUE_EAGER'] = os.environ.get('TASK_QUEUE_EAGER', 'False').lower() == 'true'
+    return app.config['TASK_QUEUE_EAGER']
+
+
+def init_task_queue(app):
+    """
+    Attach the task queue backend selected by configuration to the app.
+    
+    Args:
+        app: Flask application
+    
+    Returns:
+        DatabaseTaskQueue or RedisTaskQueue: Queue backend
+    """
+    app.config.setdefault('TASK_WORKER_IN_PROCESS',
+                          os.environ.get('TASK_WORKER_IN_PROCESS', 'True').lower() == 'true')
+    if tasks_run_eagerly(app):
+        logger.info("Task queue: eager (tasks run inline)")
+    redis_url = app.config.get('TASK_QUEUE_REDIS_URL', os.environ.get('TASK_QUEUE_REDIS_URL'))
+    if redis_url:
+        backend = RedisTaskQueue(redis_url)
+        logger.info("Task queue: Redis")
+    else:
+        backend = DatabaseTaskQueue()
+    app.extensions['task_queue'] = backend
+    
+    # Register the task definitions
+    import jobs.tasks  # noqa: F401
+    return backend
+
+
+def start_task_worker(app):
+    """
+    Start a task worker thread in a long-running web process.
+    
+    Used when no separate worker process is deployed
+    (TASK_WORKER_IN_PROCESS); tasks then run outside the request, in the
+    worker's own app context and session, with the usual retries.
+    
+    Args:
+        app: Flask application
+    
+    Returns:
+        threading.Thread or None: The worker thread, None if disabled
+    """
+    if not app.config.get('TASK_WORKER_IN_PROCESS') or tasks_run_eagerly(app):
+        return None
+    thread = app.extensions.get('task_worker_thread')
+    if thread is None:
+        worker = Worker(app.extensions['task_queue'])
+        thread = threading.Thread(target=worker.run_forever, args=(app,), name='task-worker', daemon=True)
+        thread.start()
+        app.extensions['task_worker_thread'] = thread
+    return thread
+
+
+def get_task_queue():
+    """Get the current app's task queue backend, creating the default one if needed."""
+    backend = current_app.extensions.get('task_queue')
+    if backend is None:
+        backend = init_task_queue(current_app)
+    return backend
+
+
+def enqueue(name, payload=None, priority=None, delay=0, max_attempts=None, unique_key=None):
+    """
+    Queue a registered task.
+    
+    Args:
+        name (str): Task name
+        payload (dict): Keyword arguments for the task function (JSON-serializable)
+        priority (int): Overrides the task's default priority
+        delay (int): Seconds before the task may run
+        max_attempts (int): Overrides the task's default attempts
+        unique_key (str): Return the existing task instead if one with this key is queued or running
+    
+    Returns:
+        int: Task ID
+    """
+    queue = get_task_queue()
+    definition = TASKS.get(name)
+    if definition is None:
+        raise ValueError(f"Unknown task: {name}")
+    
+    task_id = queue.enqueue(
+        name,
+        payload or {},
+        definition.priority if priority is None else priority,
+        definition.max_attempts if max_attempts is None else max_attempts,
+        delay=delay,
+        unique_key=unique_key
+    )
+    logger.info(f"Queued task {name} ({task_id})")
+    
+    if current_app.config.get('TASK_QUEUE_EAGER'):
+        Worker(queue).run_next(task_id)
+    return task_id
+
+
+def get_task(task_id):
+    """Return the status and result of a task, or None."""
+    return get_task_queue().get(task_id)
+
+
+class Worker:
+    """Claims and runs tasks from a queue."""
+    
+    def __init__(self, queue, worker_id=None, poll_interval=1.0):
+        self.queue = queue
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.running = True
+    
+    @staticmethod
+    def _timeout_for(name):
+        definition = TASKS.get(name)
+        return definition.timeout if definition else 300
+    
+    def run_next(self, task_id=None):
+        """
+        Claim and run one task.
+        
+        Args:
+            task_id (int): Run this task rather than the next in line (eager mode)
+        
+        Returns:
+            bool: True if a task was run
+        """
+        claimed = self.queue.claim(self.worker_id, self._timeout_for, task_id)
+        if claimed is None:
+            return False
+        
+        name = claimed['name']
+        definition = TASKS.get(name)
+        start = time.perf_counter()
+        try:
+            if definition is None:
+                raise LookupError(f"Unknown task: {name}")
+            result = definition.func(**claimed['payload'])
+        except Exception as e:
+            db.session.rollback()
+            retry = self.queue.fail(claimed['id'], str(e)[:2000], claimed['attempts'], claimed['max_attempts'],
+                                    self.worker_id)
+            logger.error(f"Task {name} ({claimed['id']}) failed on attempt {claimed['attempts']}: {e}"
+                         f"{', will retry' if retry else ''}")
+            return True
+        
+        if not self.queue.complete(claimed['id'], result, self.worker_id):
+            logger.warning(f"Task {name} ({claimed['id']}) finished after its lease expired, result discarded")
+            return True
+        logger.info(f"Task {name} ({claimed['id']}) done in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return True
+    
+    def run_forever(self, app):
+        logger.info(f"Task worker started ({self.worker_id})")
+        while self.running:
+            with app.app_context():
+                try:
+                    ran = self.run_next()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Task worker error: {e}")
+                    ran = False
+                finally:
+                    db.session.remove()
+            if not ran:
+                time.sleep(self.poll_interval)
+        logger.info("Task worker stopped")
+    
+    def stop(self, *args):
+        """Stop after the current task (usable as a signal handler)."""
+        self.running = False
@@ -0,0 +1,359 @@
+"""
+Database-backed cron scheduler.
+
+Job definitions are registered in code (see jobs/definitions.py); their
+schedules, next run times and run history live in the database, so they
+survive restarts. The loop is started by the long-running entry points
+only (gunicorn workers via gunicorn.conf.py, python app.py and the task
+worker), never by CLI commands or scripts that merely import the app. Only
+the holder of the lease in the scheduler_lock table (the leader) runs jobs,
+so several processes never run a job twice. Jobs run inline in the
+scheduler thread, so a heartbeat keeps renewing the lease while one runs;
+a new leader marks runs left 'running' by the previous one as failed.
+
+A run that is more than the job's misfire grace late (e.g. the app was
+down at 6 AM) is recorded as 'missed' and skipped; runs missed several
+times in a row are coalesced into one record.
+"""
+import os
+import time
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from models import db, ScheduledJob, JobRun, SchedulerLock
+from jobs.cron import CronSchedule
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = 'scheduler'
+
+# name -> JobDefinition, filled by @register_job
+JOB_DEFINITIONS = {}
+
+
+class JobDefinition:
+    """A job function and its default schedule."""
+    
+    def __init__(self, name, func, schedule, misfire_grace_seconds=3600):
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.misfire_grace_seconds = misfire_grace_seconds
+        CronSchedule(schedule)  # validate early
+
+
+def register_job(name, schedule, misfire_grace_seconds=3600):
+    """
+    Register a function as a scheduled job.
+    
+    Args:
+        name (str): Unique job name
+        schedule (str): Cron expression (scheduler time zone)
+        misfire_grace_seconds (int): How late a run may start before it is skipped
+    """
+    def decorator(func):
+        JOB_DEFINITIONS[name] = JobDefinition(name, func, schedule, misfire_grace_seconds)
+        return func
+    return decorator
+
+
+def _load_timezone(name):
+    if not name:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        logger.warning(f"Unknown scheduler time zone {name!r}, using server local time: {e}")
+        return None
+
+
+class Scheduler:
+    """Leader-elected scheduler loop for the registered jobs."""
+    
+    def __init__(self, app, owner=None, poll_interval=30, lock_ttl=90, timezone_name=None, clock=datetime.utcnow):
+        self.app = app
+        self.owner = owner or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = poll_interval
+        self.lock_ttl = lock_ttl
+        self.tz = _load_timezone(timezone_name)
+        self._clock = clock
+        # Lease renewal interval while a job runs
+        self.heartbeat_interval = max(lock_ttl / 3, 1)
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def acquire_leadership(self):
+        """
+        Take or renew the scheduler lease.
+        
+        Returns:
+            bool: True if this process is the leader
+        """
+        now = self._clock()
+        expires_at = now + timedelta(seconds=self.lock_ttl)
+        try:
+            lock = db.session.get(SchedulerLock, LOCK_NAME)
+            previous_owner = lock.owner if lock is not None else None
+            result = db.session.execute(
+                update(SchedulerLock)
+                .where(SchedulerLock.name == LOCK_NAME)
+                .where(or_(SchedulerLock.owner == self.owner, SchedulerLock.expires_at < now))
+                .values(owner=self.owner, expires_at=expires_at)
+            )
+            if result.rowcount == 0:
+                if db.session.get(SchedulerLock, LOCK_NAME) is not None:
+                    db.session.rollback()
+                    return False
+                db.session.add(SchedulerLock(name=LOCK_NAME, owner=self.owner, expires_at=expires_at))
+            db.session.commit()
+        except IntegrityError:
+            # Another process created the lock row first
+            db.session.rollback()
+            return False
+        
+        if previous_owner not in (None, self.owner):
+            self.fail_interrupted_runs(previous_owner)
+        return True
+    
+    def fail_interrupted_runs(self, previous_owner):
+        """
+        Mark runs left 'running' by a leader whose lease expired as failed.
+        
+        Args:
+            previous_owner (str): Owner of the expired lease
+        
+        Returns:
+            int: Number of runs marked failed
+        """
+        now = self._clock()
+        result = db.session.execute(
+            update(JobRun)
+            .where(JobRun.status == 'running')
+            .values(status='error', finished_at=now,
+                    error=f'Interrupted: scheduler leader {previous_owner} lost its lease')
+        )
+        db.session.commit()
+        if result.rowcount:
+            logger.warning(f"Marked {result.rowcount} interrupted job run(s) of {previous_owner} as failed")
+        return result.rowcount
+    
+    def _renew_lease(self, engine):
+        with engine.begin() as connection:
+            connection.execute(
+                update(SchedulerLock)
+                .where(SchedulerLock.name == LOCK_NAME, SchedulerLock.owner == self.owner)
+                .values(expires_at=self._clock() + timedelta(seconds=self.lock_ttl))
+            )
+    
+    def _heartbeat(self, engine, done):
+        while not done.wait(self.heartbeat_interval):
+            try:
+                self._renew_lease(engine)
+            except Exception as e:
+                logger.error(f"Scheduler lease renewal failed: {e}")
+    
+    def release_leadership(self):
+        db.session.execute(
+            update(SchedulerLock)
+            .where(SchedulerLock.name == LOCK_NAME, SchedulerLock.owner == self.owner)
+            .values(expires_at=self._clock())
+        )
+        db.session.commit()
+    
+    def sync_jobs(self):
+        """
+        Create or update job rows from the registered definitions.
+        
+        Rows of jobs whose definition was removed from the code are deleted
+        (their JobRun history is kept).
+        """
+        now = self._clock()
+        orphaned = ScheduledJob.query.filter(ScheduledJob.name.notin_(list(JOB_DEFINITIONS))).all()
+        for job in orphaned:
+            logger.info(f"Removing scheduled job {job.name}: no longer defined")
+            db.session.delete(job)
+        
+        for definition in JOB_DEFINITIONS.values():
+            job = ScheduledJob.query.filter_by(name=definition.name).first()
+            if job is None:
+                job = ScheduledJob(
+                    name=definition.name,
+                    schedule=definition.schedule,
+                    misfire_grace_seconds=definition.misfire_grace_seconds
+                )
+                db.session.add(job)
+            elif job.schedule != definition.schedule:
+                job.schedule = definition.schedule
+                job.next_run_at = None
+            if job.next_run_at is None:
+                job.next_run_at = CronSchedule(job.schedule).next_after(now, self.tz)
+        db.session.commit()
+    
+    def run_pending(self):
+        """
+        Run every enabled job that is due.
+        
+        Returns:
+            int: Number of jobs run
+        """
+        now = self._clock()
+        due = ScheduledJob.query.filter(
+            ScheduledJob.enabled.is_(True),
+            ScheduledJob.next_run_at <= now
+        ).order_by(ScheduledJob.next_run_at).all()
+        
+        ran = 0
+        for job in due:
+            definition = JOB_DEFINITIONS.get(job.name)
+            scheduled_for = job.next_run_at
+            lag = (now - scheduled_for).total_seconds()
+            job.next_run_at = CronSchedule(job.schedule).next_after(now, self.tz)
+            
+            if definition is None:
+                logger.warning(f"Scheduled job {job.name} has no definition, skipping")
+                db.session.commit()
+                continue
+            
+            if lag > (job.misfire_grace_seconds or 0):
+                self._record_missed(job, scheduled_for, lag)
+                continue
+            
+            self._run(job, definition, scheduled_for, lag)
+            ran += 1
+        return ran
+    
+    def _record_missed(self, job, scheduled_for, lag):
+        last_run = JobRun.query.filter_by(job_name=job.name).order_by(JobRun.id.desc()).first()
+        if last_run is not None and last_run.status == 'missed':
+            # Coalesce consecutive misses into one record
+            last_run.finished_at = self._clock()
+        else:
+            db.session.add(JobRun(
+                job_name=job.name,
+                scheduled_for=scheduled_for,
+                started_at=self._clock(),
+                finished_at=self._clock(),
+                duration_ms=0,
+                status='missed'
+            ))
+        job.last_status = 'missed'
+        db.session.commit()
+        logger.warning(f"Job {job.name} missed its {scheduled_for} run by {lag:.0f}s, next run {job.next_run_at}")
+    
+    def _run(self, job, definition, scheduled_for, lag):
+        run = JobRun(job_name=job.name, scheduled_for=scheduled_for, started_at=self._clock(), status='running')
+        db.session.add(run)
+        job.last_run_at = run.started_at
+        db.session.commit()
+        metrics.set('scheduler_lag_seconds', lag, job=job.name)
+        metrics.set('scheduler_last_run_timestamp_seconds', time.time(), job=job.name)
+        
+        # Keep the lease alive for jobs that outlast it, on a connection of its own
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(db.engine, done),
+                                     name='scheduler-heartbeat', daemon=True)
+        heartbeat.start()
+        start = time.perf_counter()
+        try:
+            definition.func()
+            run.status = 'success'
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+            run.status = 'error'
+            run.error = str(e)[:2000]
+        finally:
+            done.set()
+            heartbeat.join()
+        
+        run.finished_at = self._clock()
+        run.duration_ms = int((time.perf_counter() - start) * 1000)
+        job.last_status = run.status
+        db.session.commit()
+        logger.info(f"Scheduled job {job.name} finished: {run.status} in {run.duration_ms} ms")
+    
+    def tick(self):
+        """One scheduler iteration: renew leadership and run due jobs."""
+        with self.app.app_context():
+            try:
+                if self.acquire_leadership():
+                    self.sync_jobs()
+                    self.run_pending()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Scheduler error: {e}")
+            finally:
+                db.session.remove()
+    
+    def run_forever(self):
+        logger.info(f"Scheduler started ({self.owner})")
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self.poll_interval)
+    
+    def start(self):
+        """Run the loop in a daemon thread (once per process)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name='scheduler', daemon=True)
+            self._thread.start()
+        return self._thread
+    
+    def stop(self):
+        self._stop.set()
+
+
+def init_scheduler(app):
+    """
+    Configure the scheduler and register the job definitions.
+    
+    The loop is not started here: create_app() also runs for CLI commands
+    (flask db upgrade, flask export, ...) and scripts, which must not become
+    the leader. Long-running entry points call start_scheduler().
+    
+    Args:
+        app: Flask application
+        
+    Returns:
+        Scheduler or None
+    """
+    app.config.setdefault('SCHEDULER_ENABLED', os.environ.get('SCHEDULER_ENABLED', 'True').lower() == 'true')
+    app.config.setdefault('SCHEDULER_TIMEZONE', os.environ.get('SCHEDULER_TIMEZONE', 'Europe/Ljubljana'))
+    app.config.setdefault('SCHEDULER_POLL_INTERVAL', int(os.environ.get('SCHEDULER_POLL_INTERVAL', 30)))
+    
+    # Register the job definitions
+    import jobs.definitions  # noqa: F401
+    
+    if not app.config['SCHEDULER_ENABLED'] or app.testing:
+        return None
+    
+    scheduler = Scheduler(
+        app,
+        poll_interval=app.config['SCHEDULER_POLL_INTERVAL'],
+        lock_ttl=app.config['SCHEDULER_POLL_INTERVAL'] * 3,
+        timezone_name=app.config['SCHEDULER_TIMEZONE']
+    )
+    app.extensions['scheduler'] = scheduler
+    return scheduler
+
+
+def start_scheduler(app):
+    """
+    Start the scheduler thread of a long-running process.
+    
+    Args:
+        app: Flask application
+        
+    Returns:
+        Scheduler or None: The started scheduler, None if disabled
+    """
+    scheduler = app.extensions.get('scheduler')
+    if scheduler is not None:
+        scheduler.start()
+    return scheduler
+
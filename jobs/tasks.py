@@ -0,0 +1,80 @@
+"""
+Background task definitions.
+
+Tasks run in a worker process (python -m jobs.worker) inside an
+application context; their payload is passed as keyword arguments.
+"""
+import logging
+
+from jobs.queue import enqueue, task
+from services.notification_service import NotificationService
+from services.registry import get_service
+from services.trip_service import TripService
+from utils.signals import waitlist_promoted
+
+logger = logging.getLogger(__name__)
+
+
+@task('images.process_original', priority=10, max_attempts=3, timeout=300)
+def process_original(key, trip_report_id=None):
+    """Optimize a directly uploaded original and point its trip report photo at the result."""
+    metadata = get_service('image_handler').process_stored_original(key)
+    if trip_report_id is not None:
+        TripService.update_report_photo(trip_report_id, key, metadata)
+    return {'key': metadata['key'], 'width': metadata['width'], 'height': metadata['height']}
+
+
+@task('history.generate', priority=5, max_attempts=2, timeout=120)
+def generate_historical_event(date):
+    """Generate and store the historical event for a date (MM-DD)."""
+    event = get_service('news_service').historical_generator.get_today_event(date)
+    return {'event_id': event.get('id') if event else None}
+
+
+@task('news.update', priority=0, max_attempts=2, timeout=1800)
+def update_news():
+    """Fetch and curate all news feeds."""
+    success, message, stats = get_service('news_service').update_news_feed()
+    if not success:
+        raise RuntimeError(message)
+    return stats
+
+
+@task('news.refresh', priority=0, max_attempts=1, timeout=600)
+def refresh_news(feed_urls):
+    """Incrementally refresh a batch of feeds (retried by the next refresh slot)."""
+    success, message, stats = get_service('news_service').refresh_feeds(feed_urls)
+    if not success:
+        raise RuntimeError(message)
+    return stats
+
+
+@task('history.generate_range', priority=-5, max_attempts=1, timeout=3600)
+def generate_historical_events_range(start_date, end_date):
+    """Generate historical events for every date in a range without one."""
+    success, message, count = get_service('news_service').generate_historical_events_range(start_date, end_date)
+    if not success:
+        raise RuntimeError(message)
+    return {'generated_count': count}
+
+
+@task('images.delete', priority=-10, max_attempts=5, timeout=300)
+def delete_images(keys):
+    """Bulk delete storage keys; the queue's backoff retries while any key is left."""
+    # One pass per attempt: deleting a key that is already gone succeeds
+    remaining = get_service('image_handler').delete_keys(keys, max_attempts=1)
+    if remaining:
+        raise RuntimeError(f"{len(remaining)} keys not deleted")
+    return {'deleted': len(keys)}
+
+
+@task('notifications.waitlist_promoted', priority=5, max_attempts=5, timeout=60)
+def notify_waitlist_promotion(trip_id, user_id):
+    """Email a member who was moved from the waitlist into a seat."""
+    success, message = NotificationService.notify_waitlist_promotion(trip_id, user_id)
+    return {'sent': success, 'message': message}
+
+
+@waitlist_promoted.connect
+def _queue_waitlist_notification(trip_id, user_id, **kwargs):
+    enqueue('notifications.waitlist_promoted', {'trip_id': trip_id, 'user_id': user_id})
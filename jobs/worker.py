@@ -0,0 +1,33 @@
+"""
+Task worker entry point.
+
+Usage:
+    python -m jobs.worker
+    python -m jobs.worker --poll-interval 2
+"""
+import argparse
+import signal
+import logging
+
+from jobs.queue import Worker
+from jobs.scheduler import start_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run background tasks from the task queue')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='seconds to wait when the queue is empty')
+    args = parser.parse_args()
+    
+    from app import app
+    
+    start_scheduler(app)
+    worker = Worker(app.extensions['task_queue'], poll_interval=args.poll_interval)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run_forever(app)
+
+
+if __name__ == '__main__':
+    main()
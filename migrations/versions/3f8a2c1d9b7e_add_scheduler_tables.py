@@ -0,0 +1,67 @@
+"""Add scheduler tables (scheduled jobs, run history, leader lock)
+
+Revision ID: 3f8a2c1d9b7e
+Revises: 49cc1858e10e
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8a2c1d9b7e'
+down_revision = '49cc1858e10e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scheduled_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('schedule', sa.String(length=100), nullable=False),
+    sa.Column('enabled', sa.Boolean(), nullable=True),
+    sa.Column('misfire_grace_seconds', sa.Integer(), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    with op.batch_alter_table('scheduled_job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scheduled_job_next_run_at'), ['next_run_at'], unique=False)
+
+    op.create_table('job_run',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('scheduled_for', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('job_run', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_job_run_job_name'), ['job_name'], unique=False)
+
+    op.create_table('scheduler_lock',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('owner', sa.String(length=100), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('scheduler_lock')
+    with op.batch_alter_table('job_run', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_run_job_name'))
+
+    op.drop_table('job_run')
+    with op.batch_alter_table('scheduled_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scheduled_job_next_run_at'))
+
+    op.drop_table('scheduled_job')
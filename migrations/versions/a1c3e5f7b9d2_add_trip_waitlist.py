@@ -0,0 +1,48 @@
+"""Add trip waitlist table and planned_trip.waitlist_count
+
+Revision ID: a1c3e5f7b9d2
+Revises: f3c5e7a9b1d4
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b9d2'
+down_revision = 'f3c5e7a9b1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('trip_waitlist_entry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('trip_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('emergency_contact', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['trip_id'], ['planned_trip.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('trip_id', 'user_id', name='uq_trip_waitlist_trip_user')
+    )
+    with op.batch_alter_table('trip_waitlist_entry', schema=None) as batch_op:
+        batch_op.create_index('ix_trip_waitlist_trip_position', ['trip_id', 'position'], unique=False)
+    
+    with op.batch_alter_table('planned_trip', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('waitlist_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('planned_trip', schema=None) as batch_op:
+        batch_op.drop_column('waitlist_count')
+    
+    with op.batch_alter_table('trip_waitlist_entry', schema=None) as batch_op:
+        batch_op.drop_index('ix_trip_waitlist_trip_position')
+    
+    op.drop_table('trip_waitlist_entry')
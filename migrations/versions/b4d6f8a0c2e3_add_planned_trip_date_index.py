@@ -0,0 +1,26 @@
+"""Index planned_trip.trip_date for trip listings and the archive
+
+Revision ID: b4d6f8a0c2e3
+Revises: a1c3e5f7b9d2
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d6f8a0c2e3'
+down_revision = 'a1c3e5f7b9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('planned_trip', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_planned_trip_trip_date'), ['trip_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('planned_trip', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_planned_trip_trip_date'))
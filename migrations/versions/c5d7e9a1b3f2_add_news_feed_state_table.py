@@ -0,0 +1,36 @@
+"""Add news_feed_state table for incremental news refresh
+
+Revision ID: c5d7e9a1b3f2
+Revises: 8b1e4d2f6a90
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d7e9a1b3f2'
+down_revision = '8b1e4d2f6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('news_feed_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('feed_url', sa.String(length=500), nullable=False),
+    sa.Column('last_guid', sa.String(length=500), nullable=True),
+    sa.Column('last_published_at', sa.DateTime(), nullable=True),
+    sa.Column('etag', sa.String(length=200), nullable=True),
+    sa.Column('modified', sa.String(length=100), nullable=True),
+    sa.Column('last_fetched_at', sa.DateTime(), nullable=True),
+    sa.Column('last_status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('feed_url')
+    )
+
+
+def downgrade():
+    op.drop_table('news_feed_state')
@@ -0,0 +1,28 @@
+"""Add cache_tag table for cross-process cache invalidation
+
+Revision ID: c6e8a0b2d4f5
+Revises: b4d6f8a0c2e3
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e8a0b2d4f5'
+down_revision = 'b4d6f8a0c2e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cache_tag',
+    sa.Column('tag', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tag')
+    )
+
+
+def downgrade():
+    op.drop_table('cache_tag')
@@ -0,0 +1,26 @@
+"""Index news.created_at for retention cleanup
+
+Revision ID: d2a4f6b8c0e1
+Revises: c5d7e9a1b3f2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a4f6b8c0e1'
+down_revision = 'c5d7e9a1b3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_news_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('news', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_news_created_at'))
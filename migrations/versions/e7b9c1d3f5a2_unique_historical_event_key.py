@@ -0,0 +1,31 @@
+"""Unique (date, year, title) on historical_event for bulk upserts
+
+Revision ID: e7b9c1d3f5a2
+Revises: d2a4f6b8c0e1
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b9c1d3f5a2'
+down_revision = 'd2a4f6b8c0e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest row of any existing duplicates
+    op.execute(
+        'DELETE FROM historical_event WHERE id NOT IN '
+        '(SELECT MIN(id) FROM historical_event GROUP BY date, year, title)'
+    )
+    with op.batch_alter_table('historical_event', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_historical_event_date_year_title', ['date', 'year', 'title'])
+
+
+def downgrade():
+    with op.batch_alter_table('historical_event', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_historical_event_date_year_title', type_='unique')
@@ -0,0 +1,46 @@
+"""Add planned_trip.participant_count and unique (trip_id, user_id) participants
+
+Revision ID: f3c5e7a9b1d4
+Revises: e7b9c1d3f5a2
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c5e7a9b1d4'
+down_revision = 'e7b9c1d3f5a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest registration of any duplicates
+    op.execute(
+        'DELETE FROM trip_participant WHERE id NOT IN '
+        '(SELECT MIN(id) FROM trip_participant GROUP BY trip_id, user_id)'
+    )
+    with op.batch_alter_table('trip_participant', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_trip_participant_trip_user', ['trip_id', 'user_id'])
+    
+    with op.batch_alter_table('planned_trip', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('participant_count', sa.Integer(), nullable=False, server_default='0'))
+    
+    op.execute(
+        'UPDATE planned_trip SET participant_count = '
+        '(SELECT COUNT(*) FROM trip_participant WHERE trip_participant.trip_id = planned_trip.id)'
+    )
+    op.execute(
+        "UPDATE planned_trip SET status = 'full' "
+        "WHERE status = 'open' AND max_participants > 0 AND participant_count >= max_participants"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('planned_trip', schema=None) as batch_op:
+        batch_op.drop_column('participant_count')
+    
+    with op.batch_alter_table('trip_participant', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_trip_participant_trip_user', type_='unique')
@@ -11,9 +11,13 @@ from .user import User
 from .announcement import Announcement
 from .comment import Comment
 from .trip_report import TripReport
-from .planned_trip import PlannedTrip, TripParticipant
+from .planned_trip import PlannedTrip, TripParticipant, TripWaitlistEntry
 from .historical_event import HistoricalEvent
 from .news import News
+from .news_feed_state import NewsFeedState
+from .scheduled_job import ScheduledJob, JobRun, SchedulerLock
+from .task import Task
+from .cache_tag import CacheTag
 
 __all__ = [
     'db',
@@ -23,6 +27,13 @@ __all__ = [
     'TripReport',
     'PlannedTrip',
     'TripParticipant',
+    'TripWaitlistEntry',
     'HistoricalEvent',
-    'News'
+    'News',
+    'NewsFeedState',
+    'ScheduledJob',
+    'JobRun',
+    'SchedulerLock',
+    'Task',
+    'CacheTag'
 ]
\ No newline at end of file
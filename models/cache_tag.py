@@ -0,0 +1,14 @@
+"""
+Cache tag versions shared by all processes.
+"""
+from . import db
+
+
+class CacheTag(db.Model):
+    """Invalidation version of a response cache tag."""
+    
+    tag = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<CacheTag {self.tag}={self.version}>'
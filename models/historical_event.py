@@ -8,6 +8,11 @@ from . import db
 class HistoricalEvent(db.Model):
     """Model for historical mountaineering events."""
     
+    __table_args__ = (
+        # Natural key used by the bulk importer (flask history import)
+        db.UniqueConstraint('date', 'year', 'title', name='uq_historical_event_date_year_title'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.String(5), nullable=False)  # MM-DD format
     year = db.Column(db.Integer)
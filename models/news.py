@@ -18,7 +18,7 @@ class News(db.Model):
     category = db.Column(db.String(50))  # safety, equipment, achievement, etc.
     is_featured = db.Column(db.Boolean, default=False)
     published_at = db.Column(db.DateTime)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     def to_dict(self):
         """Convert the news article to a dictionary."""
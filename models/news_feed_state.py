@@ -0,0 +1,32 @@
+"""
+Per-feed refresh state for incremental news curation.
+"""
+from datetime import datetime
+from . import db
+
+
+class NewsFeedState(db.Model):
+    """The newest entry already seen for an RSS feed, and HTTP cache validators."""
+    
+    id = db.Column(db.Integer, primary_key=True)
+    feed_url = db.Column(db.String(500), unique=True, nullable=False)
+    last_guid = db.Column(db.String(500))
+    last_published_at = db.Column(db.DateTime)
+    etag = db.Column(db.String(200))
+    modified = db.Column(db.String(100))
+    last_fetched_at = db.Column(db.DateTime)
+    last_status = db.Column(db.String(20))  # ok, not_modified, error
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert the feed state to a dictionary."""
+        return {
+            'feed_url': self.feed_url,
+            'last_guid': self.last_guid,
+            'last_published_at': self.last_published_at.isoformat() if self.last_published_at else None,
+            'last_fetched_at': self.last_fetched_at.isoformat() if self.last_fetched_at else None,
+            'last_status': self.last_status
+        }
+    
+    def __repr__(self):
+        return f'<NewsFeedState {self.feed_url}>'
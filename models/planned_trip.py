@@ -12,7 +12,7 @@ class PlannedTrip(db.Model):
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     location = db.Column(db.String(200))
-    trip_date = db.Column(db.DateTime, nullable=False)
+    trip_date = db.Column(db.DateTime, nullable=False, index=True)
     difficulty = db.Column(db.String(50))
     max_participants = db.Column(db.Integer)
     meeting_point = db.Column(db.String(200))
@@ -20,27 +20,27 @@ class PlannedTrip(db.Model):
     price = db.Column(db.Float, default=0)
     organizer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     status = db.Column(db.String(20), default='open')  # open, full, cancelled, completed
+    # Maintained by TripService register/unregister with conditional UPDATEs
+    participant_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    waitlist_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     gear_list = db.Column(db.JSON)  # Store gear items as JSON array
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     participants = db.relationship('TripParticipant', backref='trip', lazy=True, cascade='all, delete-orphan')
+    waitlist = db.relationship('TripWaitlistEntry', backref='trip', lazy=True, cascade='all, delete-orphan',
+                               order_by='TripWaitlistEntry.position')
     
     @property
     def organizer_name(self):
         """Return the organizer's full name."""
         return self.organizer.full_name if self.organizer else 'Unknown'
     
-    @property
-    def participant_count(self):
-        """Return the number of participants."""
-        return len(self.participants)
-    
     @property
     def is_full(self):
         """Check if the trip is full."""
-        return self.max_participants and len(self.participants) >= self.max_participants
+        return self.max_participants and self.participant_count >= self.max_participants
     
     @property
     def is_future(self):
@@ -54,6 +54,10 @@ class PlannedTrip(db.Model):
 class TripParticipant(db.Model):
     """Model for trip participants and their registration details."""
     
+    __table_args__ = (
+        db.UniqueConstraint('trip_id', 'user_id', name='uq_trip_participant_trip_user'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     trip_id = db.Column(db.Integer, db.ForeignKey('planned_trip.id'), nullable=False)
@@ -68,4 +72,25 @@ class TripParticipant(db.Model):
         return self.user.full_name if self.user else 'Unknown'
     
     def __repr__(self):
-        return f'<TripParticipant {self.user_id} -> {self.trip_id}>'
\ No newline at end of file
+        return f'<TripParticipant {self.user_id} -> {self.trip_id}>'
+
+
+class TripWaitlistEntry(db.Model):
+    """A member waiting for a seat on a full trip, promoted in position order."""
+    
+    __table_args__ = (
+        db.UniqueConstraint('trip_id', 'user_id', name='uq_trip_waitlist_trip_user'),
+        db.Index('ix_trip_waitlist_trip_position', 'trip_id', 'position'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    trip_id = db.Column(db.Integer, db.ForeignKey('planned_trip.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)  # increasing per trip, gaps after promotions
+    phone = db.Column(db.String(20))
+    emergency_contact = db.Column(db.String(100))
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<TripWaitlistEntry {self.user_id} -> {self.trip_id} #{self.position}>'
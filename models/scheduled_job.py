@@ -0,0 +1,74 @@
+"""
+Scheduler models: job schedules, run history and the leader lock.
+"""
+from datetime import datetime
+from . import db
+
+
+class ScheduledJob(db.Model):
+    """A recurring job with a cron schedule."""
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    schedule = db.Column(db.String(100), nullable=False)  # cron: minute hour day month weekday
+    enabled = db.Column(db.Boolean, default=True)
+    misfire_grace_seconds = db.Column(db.Integer, default=3600)
+    next_run_at = db.Column(db.DateTime, index=True)  # UTC
+    last_run_at = db.Column(db.DateTime)
+    last_status = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert the job to a dictionary."""
+        return {
+            'name': self.name,
+            'schedule': self.schedule,
+            'enabled': self.enabled,
+            'misfire_grace_seconds': self.misfire_grace_seconds,
+            'next_run_at': self.next_run_at.isoformat() if self.next_run_at else None,
+            'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None,
+            'last_status': self.last_status
+        }
+    
+    def __repr__(self):
+        return f'<ScheduledJob {self.name} {self.schedule}>'
+
+
+class JobRun(db.Model):
+    """One execution (or missed execution) of a scheduled job."""
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(100), nullable=False, index=True)
+    scheduled_for = db.Column(db.DateTime)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
+    status = db.Column(db.String(20), default='running')  # running, success, error, missed
+    error = db.Column(db.Text)
+    
+    def to_dict(self):
+        """Convert the run to a dictionary."""
+        return {
+            'id': self.id,
+            'job_name': self.job_name,
+            'scheduled_for': self.scheduled_for.isoformat() if self.scheduled_for else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_ms': self.duration_ms,
+            'status': self.status,
+            'error': self.error
+        }
+    
+    def __repr__(self):
+        return f'<JobRun {self.job_name} {self.status}>'
+
+
+class SchedulerLock(db.Model):
+    """Lease row; the process holding an unexpired lease is the scheduler leader."""
+    
+    name = db.Column(db.String(50), primary_key=True)
+    owner = db.Column(db.String(100))
+    expires_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<SchedulerLock {self.name} held by {self.owner}>'
@@ -0,0 +1,49 @@
+"""
+Task model for the background task queue.
+"""
+from datetime import datetime
+from . import db
+
+
+class Task(db.Model):
+    """A unit of background work and its outcome."""
+    
+    __table_args__ = (
+        db.Index('ix_task_status_run_at', 'status', 'run_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON)
+    status = db.Column(db.String(20), default='queued')  # queued, running, succeeded, failed
+    priority = db.Column(db.Integer, default=0)  # higher runs first
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+    unique_key = db.Column(db.String(200), index=True)  # at most one queued/running task per key
+    run_at = db.Column(db.DateTime, default=datetime.utcnow)  # not claimed before this time
+    locked_by = db.Column(db.String(100))
+    locked_until = db.Column(db.DateTime)  # visibility timeout of a running task
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        """Convert the task to a dictionary."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'priority': self.priority,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<Task {self.id} {self.name} {self.status}>'
@@ -6,11 +6,13 @@ from .auth import auth_bp
 from .admin import admin_bp
 from .api import api_bp
 from .trips import trips_bp
+from .media import media_bp
 
 __all__ = [
     'main_bp',
     'auth_bp', 
     'admin_bp',
     'api_bp',
-    'trips_bp'
+    'trips_bp',
+    'media_bp'
 ]
\ No newline at end of file
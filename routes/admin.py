@@ -1,11 +1,17 @@
 """
 Admin routes for user management and announcements.
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from datetime import datetime
+from flask import (Blueprint, Response, render_template, request, redirect, url_for, flash, jsonify,
+                   current_app, stream_with_context)
 import logging
 
 from services.admin_service import AdminService
+from services.export_service import ExportService, EXPORTS, EXPORT_FORMATS
+from models import ScheduledJob, JobRun
 from utils.decorators import admin_required
+from utils.instrumentation import endpoint_stats
+from utils.slow_query_log import slow_query_log
 from utils.helpers import handle_error, success_response, error_response
 
 logger = logging.getLogger(__name__)
@@ -22,7 +28,8 @@ def panel():
         return render_template('admin_panel.html', 
                              pending_users=data['pending_users'],
                              all_users=data['all_users'],
-                             stats=data['stats'])
+                             stats=data['stats'],
+                             slow_queries=slow_query_log.entries()[:20])
     except Exception as e:
         logger.error(f"Error loading admin panel: {e}")
         flash('Error loading admin panel', 'error')
@@ -97,6 +104,53 @@ def delete_announcement(announcement_id):
     return redirect(url_for('admin.announcements'))
 
 
+@admin_bp.route('/performance')
+@admin_required
+def performance():
+    """Per-endpoint timing histogram collected by the instrumentation layer."""
+    return jsonify({
+        'enabled': current_app.config.get('INSTRUMENTATION_ENABLED', False),
+        'endpoints': endpoint_stats.snapshot()
+    })
+
+
+@admin_bp.route('/slow-queries')
+@admin_required
+def slow_queries():
+    """Recent statements above the slow query threshold."""
+    return jsonify({
+        'threshold_ms': slow_query_log.threshold_ms,
+        'queries': slow_query_log.entries()
+    })
+
+
+@admin_bp.route('/jobs')
+@admin_required
+def jobs():
+    """Scheduled jobs and their recent runs."""
+    return jsonify({
+        'jobs': [job.to_dict() for job in ScheduledJob.query.order_by(ScheduledJob.name).all()],
+        'runs': [run.to_dict() for run in JobRun.query.order_by(JobRun.id.desc()).limit(50).all()]
+    })
+
+
+# Data exports
+@admin_bp.route('/export/<dataset>')
+@admin_required
+def export_data(dataset):
+    """Stream a dataset as a CSV (default) or JSON Lines download."""
+    export_format = request.args.get('format', 'csv')
+    if dataset not in EXPORTS or export_format not in EXPORT_FORMATS:
+        return error_response('Unknown export', 404)
+    
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d}.{export_format}"
+    return Response(
+        stream_with_context(ExportService.stream(dataset, export_format, request.args.get('trip_id', type=int))),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
 # API routes for comments
 @admin_bp.route('/api/comments/<content_type>/<content_id>')
 @admin_required
@@ -1,32 +1,92 @@
 """
 API routes for AJAX requests and external integrations.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, session, current_app
+from werkzeug.local import LocalProxy
+from datetime import datetime, timezone
 import logging
 
-from services.news_service import NewsService
 from services.admin_service import AdminService
+from services.registry import get_service
 from utils.decorators import login_required, admin_required
-from utils.helpers import success_response, error_response
+from utils.helpers import success_response, error_response, sign_upload_token, load_upload_token
+from utils.cache import cached_response
+from jobs.queue import enqueue, get_task
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-# Initialize news service
-news_service = NewsService()
+# Services are created on first use and shared by the process
+news_service = LocalProxy(lambda: get_service('news_service'))
+image_handler = LocalProxy(lambda: get_service('image_handler'))
+
+# Response cache TTLs (seconds) for read-mostly endpoints
+NEWS_CACHE_TTL = 600
+HISTORY_CACHE_TTL = 3600
+
+
+def _today():
+    """Cache key component for endpoints that depend on the current date."""
+    return datetime.now().strftime('%m-%d')
+
+
+def _not_modified(etag, last_modified=None):
+    """Return a 304 response if the client's validators still match, else None."""
+    if request.if_none_match:
+        matches = request.if_none_match.contains_weak(etag)
+    elif last_modified and request.if_modified_since:
+        # created_at values are naive UTC; HTTP dates have second precision
+        matches = request.if_modified_since >= last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    else:
+        matches = False
+    
+    if not matches:
+        return None
+    
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+
+@api_bp.after_request
+def add_conditional_headers(response):
+    """
+    Make JSON GET responses revalidatable: add a strong ETag (unless the view
+    set its own validators) and answer 304 Not Modified when it matches.
+    """
+    if (request.method != 'GET' or response.status_code != 200
+            or response.mimetype != 'application/json' or response.is_streamed):
+        return response
+    
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    if response.get_etag()[0] is None:
+        response.add_etag()
+    return response.make_conditional(request)
 
 
 # Historical Events API
+def _event_response(event):
+    response = success_response({'event': event})
+    if event.get('id') is None:
+        # Placeholder until the worker has generated the event: keep it out of the cache
+        response.cache_control.no_store = True
+    return response
+
+
 @api_bp.route('/today-in-history')
 @login_required
+@cached_response('today_in_history', HISTORY_CACHE_TTL, tags=('history',), vary=_today)
 def today_in_history():
     """Get historical event for today."""
     try:
         event = news_service.get_today_historical_event()
         
         if event:
-            return success_response({'event': event})
+            return _event_response(event)
         else:
             return error_response('No event found for today', 404)
             
@@ -36,7 +96,8 @@ def today_in_history():
 
 
 @api_bp.route('/history/<date>')
-@login_required  
+@login_required
+@cached_response('history_by_date', HISTORY_CACHE_TTL, tags=('history',))
 def history_by_date(date):
     """Get historical event for specific date (MM-DD format)."""
     try:
@@ -48,7 +109,7 @@ def history_by_date(date):
         event = news_service.get_today_historical_event(date)
         
         if event:
-            return success_response({'event': event})
+            return _event_response(event)
         else:
             return error_response(f'No event found for date {date}', 404)
             
@@ -76,6 +137,7 @@ def random_history():
 
 @api_bp.route('/history/featured')
 @login_required
+@cached_response('featured_history', HISTORY_CACHE_TTL, tags=('history',))
 def featured_history():
     """Get featured historical events."""
     try:
@@ -135,6 +197,7 @@ def search_historical_events():
 # News API
 @api_bp.route('/news/latest')
 @login_required
+@cached_response('latest_news', NEWS_CACHE_TTL, tags=('news',), vary=_today)
 def get_latest_news():
     """Get latest curated news articles."""
     try:
@@ -152,6 +215,7 @@ def get_latest_news():
 
 @api_bp.route('/news/category/<category>')
 @login_required
+@cached_response('news_by_category', NEWS_CACHE_TTL, tags=('news',), vary=_today)
 def get_news_by_category(category):
     """Get news articles by category."""
     try:
@@ -171,6 +235,7 @@ def get_news_by_category(category):
 
 @api_bp.route('/news/categories')
 @login_required
+@cached_response('news_categories', NEWS_CACHE_TTL, tags=('news',))
 def get_news_by_categories():
     """Get news grouped by all categories."""
     try:
@@ -187,20 +252,13 @@ def get_news_by_categories():
 @api_bp.route('/admin/news/update', methods=['POST'])
 @admin_required
 def update_news_feed():
-    """Manually trigger news update (admin only)."""
+    """Queue a news update (admin only); poll /api/tasks/<task_id> for the stats."""
     try:
-        success, message, stats = news_service.update_news_feed()
-        
-        if success:
-            return success_response({
-                'message': message,
-                'stats': stats
-            })
-        else:
-            return error_response(message, 500)
+        task_id = enqueue('news.update', priority=5, unique_key='news.update')
+        return success_response({'task_id': task_id}, message='News update queued'), 202
         
     except Exception as e:
-        logger.error(f"Error updating news feed: {e}")
+        logger.error(f"Error queueing news update: {e}")
         return error_response('Error updating news feed', 500)
 
 
@@ -264,21 +322,24 @@ def generate_historical_events_range():
         if not start_date or not end_date:
             return error_response('start_date and end_date required', 400)
         
-        success, message, count = news_service.generate_historical_events_range(start_date, end_date)
-        
-        if success:
-            return success_response({
-                'message': message,
-                'generated_count': count
-            })
-        else:
-            return error_response(message, 500)
+        task_id = enqueue('history.generate_range', {'start_date': start_date, 'end_date': end_date})
+        return success_response({'task_id': task_id}, message='Event generation queued'), 202
         
     except Exception as e:
         logger.error(f"Error generating event range: {e}")
         return error_response('Error generating events', 500)
 
 
+@api_bp.route('/tasks/<int:task_id>')
+@admin_required
+def task_status(task_id):
+    """Status and result of a background task (admin only)."""
+    task = get_task(task_id)
+    if task is None:
+        return error_response('Task not found', 404)
+    return success_response({'task': task})
+
+
 @api_bp.route('/admin/historical-events/stats')
 @admin_required
 def get_historical_events_stats():
@@ -299,6 +360,16 @@ def get_historical_events_stats():
 def get_comments(content_type, content_id):
     """Get comments for announcements or trip reports."""
     try:
+        # Validate against a cheap aggregate before loading and serializing
+        version = AdminService.get_comments_version(content_type, content_id)
+        etag = last_modified = None
+        if version:
+            etag = f"comments-{content_type}-{content_id}-{version['count']}-{version['last_id']}"
+            last_modified = version['last_modified']
+            not_modified = _not_modified(etag, last_modified)
+            if not_modified:
+                return not_modified
+        
         comments = AdminService.get_comments(content_type, content_id)
         
         # Convert to JSON format
@@ -312,7 +383,11 @@ def get_comments(content_type, content_id):
                 'created_at': comment.created_at.isoformat() if hasattr(comment.created_at, 'isoformat') else str(comment.created_at)
             })
         
-        return success_response({'comments': comments_data})
+        response = success_response({'comments': comments_data})
+        if etag:
+            response.set_etag(etag)
+            response.last_modified = last_modified
+        return response
     
     except Exception as e:
         logger.error(f"Error fetching comments: {e}")
@@ -363,6 +438,53 @@ def delete_comment(comment_id):
         return error_response('Error deleting comment', 500)
 
 
+# Direct upload API (browser uploads originals straight to storage)
+@api_bp.route('/uploads/intent', methods=['POST'])
+@login_required
+def create_upload_intent():
+    """Reserve a storage key and return a presigned upload form."""
+    try:
+        data = request.get_json() or {}
+        content_type = data.get('content_type', '')
+        
+        try:
+            intent = image_handler.create_upload_intent(content_type)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        intent['token'] = sign_upload_token(intent['key'], session['user_id'], 'intent')
+        return success_response({'upload': intent})
+        
+    except Exception as e:
+        logger.error(f"Error creating upload intent: {e}")
+        return error_response('Error preparing upload', 500)
+
+
+@api_bp.route('/uploads/complete', methods=['POST'])
+@login_required
+def complete_upload():
+    """Confirm a direct upload; the original is processed once a trip report claims it."""
+    try:
+        data = request.get_json() or {}
+        key = load_upload_token(data.get('token'), session['user_id'], 'intent')
+        if not key:
+            return error_response('Invalid or expired upload token', 400)
+        
+        if not image_handler.storage.exists(key):
+            return error_response('Upload not found', 404)
+        
+        photo = image_handler.photo_metadata_for_original(key)
+        
+        return success_response({
+            'photo': photo,
+            'token': sign_upload_token(key, session['user_id'], 'complete')
+        })
+        
+    except Exception as e:
+        logger.error(f"Error completing upload: {e}")
+        return error_response('Error completing upload', 500)
+
+
 @api_bp.route('/debug-aws')
 def debug_aws():
     """Debug AWS S3 connection - REMOVE AFTER TESTING"""
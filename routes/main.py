@@ -1,29 +1,37 @@
 """
 Main routes for the application (home, dashboard, etc.).
 """
-from flask import Blueprint, render_template, session, jsonify
+from flask import Blueprint, render_template, jsonify, request, current_app, abort, Response
 from datetime import datetime
 import logging
 
-from models import User, Announcement, TripReport
+from models import db, User, Announcement, TripReport
 from utils.decorators import login_required
+from utils.current_user import get_current_user
 from utils.helpers import handle_error
+from utils.metrics import metrics, record_pool_usage
 
 logger = logging.getLogger(__name__)
 
 main_bp = Blueprint('main', __name__)
 
 
+def _recent_announcements(limit):
+    return Announcement.query.order_by(Announcement.created_at.desc()).limit(limit).all()
+
+
+def _recent_trip_reports(limit):
+    return TripReport.query.order_by(TripReport.created_at.desc()).limit(limit).all()
+
+
 @main_bp.route('/')
 def home():
     """Home page with recent announcements."""
     try:
-        announcements = Announcement.query.order_by(Announcement.created_at.desc()).limit(3).all()
+        return render_template('home.html', load_announcements=lambda: _recent_announcements(3))
     except Exception as e:
         logger.error(f"Database error: {e}")
-        announcements = []
-    
-    return render_template('home.html', announcements=announcements)
+        return render_template('home.html', load_announcements=lambda: [])
 
 
 @main_bp.route('/dashboard')
@@ -31,14 +39,13 @@ def home():
 def dashboard():
     """User dashboard with announcements and recent trips."""
     try:
-        user = User.query.get(session['user_id'])
-        announcements = Announcement.query.order_by(Announcement.created_at.desc()).limit(5).all()
-        recent_trips = TripReport.query.order_by(TripReport.created_at.desc()).limit(5).all()
+        user = get_current_user()
         
+        # Queried inside the cached fragments, so a cache hit skips the queries
         return render_template('dashboard.html', 
                              user=user, 
-                             announcements=announcements, 
-                             recent_trips=recent_trips)
+                             load_announcements=lambda: _recent_announcements(5), 
+                             load_recent_trips=lambda: _recent_trip_reports(5))
     except Exception as e:
         logger.error(f"Error loading dashboard: {e}")
         return handle_error('Error loading dashboard', 500)
@@ -62,4 +69,22 @@ def health_check():
             'database': 'disconnected',
             'error': str(e),
             'timestamp': datetime.utcnow().isoformat()
-        }), 503
\ No newline at end of file
+        }), 503
+
+
+@main_bp.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metrics for all workers (METRICS_TOKEN bearer token, or localhost only without one)."""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            abort(401)
+    elif request.remote_addr not in ('127.0.0.1', '::1'):
+        abort(403)
+    
+    try:
+        record_pool_usage(db.engine)
+    except Exception as e:
+        logger.error(f"Error reading pool metrics: {e}")
+    
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Media routes for serving files stored by the local storage backend.
+"""
+from flask import Blueprint, abort, request, send_from_directory
+from urllib.parse import urlparse
+import os
+import logging
+
+from storage.local import LocalStorageBackend
+
+logger = logging.getLogger(__name__)
+
+media_bp = Blueprint('media', __name__, url_prefix='/media')
+
+# Stored keys contain a random UUID and are never overwritten, so they can be
+# cached by browsers and proxies for as long as S3/CloudFront would cache them.
+MEDIA_MAX_AGE = 31536000
+
+
+def media_url_prefix():
+    """
+    Path to mount the blueprint at: the path of LOCAL_STORAGE_URL, so the URLs
+    the local backend builds are the ones served here.
+    
+    Returns:
+        str: URL prefix (e.g. '/media')
+    """
+    return urlparse(LocalStorageBackend().url_prefix).path or '/media'
+
+
+def _local_storage_enabled():
+    return os.environ.get('STORAGE_BACKEND', 's3').lower() == 'local'
+
+
+@media_bp.route('/upload', methods=['POST'])
+def upload_media():
+    """Accept a signed direct upload, the local counterpart of an S3 presigned POST."""
+    if not _local_storage_enabled():
+        abort(404)
+    
+    storage = LocalStorageBackend()
+    upload = storage.verify_upload(request.form.get('token', ''))
+    if not upload or upload['key'] != request.form.get('key'):
+        abort(403)
+    
+    file = request.files.get('file')
+    if not file:
+        abort(400)
+    if file.mimetype != upload['content_type']:
+        abort(400)
+    
+    file.seek(0, 2)
+    size = file.tell()
+    file.seek(0)
+    if size < 1 or size > upload['max_size']:
+        abort(400)
+    
+    if not storage.put(file.stream, upload['key'], upload['content_type']):
+        abort(500)
+    
+    return '', 204
+
+
+@media_bp.route('/<path:key>')
+def serve_media(key):
+    """Serve a locally stored media file with long-lived cache headers."""
+    if not _local_storage_enabled():
+        abort(404)
+    
+    storage = LocalStorageBackend()
+    response = send_from_directory(storage.root, key, max_age=MEDIA_MAX_AGE, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
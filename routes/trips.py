@@ -2,20 +2,22 @@
 Trip routes for trip reports and planned trips.
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from werkzeug.local import LocalProxy
 from datetime import datetime
+import os
 import logging
 
 from services.trip_service import TripService
+from services.registry import get_service
 from utils.decorators import login_required, admin_required
-from utils.helpers import handle_error
-from image_handler import ImageHandler
+from utils.helpers import handle_error, load_upload_token
 
 logger = logging.getLogger(__name__)
 
 trips_bp = Blueprint('trips', __name__)
 
-# Initialize image handler
-image_handler = ImageHandler()
+# Image handler is created on first use and shared by the process
+image_handler = LocalProxy(lambda: get_service('image_handler'))
 
 
 @trips_bp.route('/trip-reports')
@@ -50,8 +52,16 @@ def create_trip_report():
         date = request.form.get('date')
         difficulty = request.form.get('difficulty')
         
-        # Handle file uploads
+        # Photos the browser already uploaded directly to storage
         uploaded_photos = []
+        for token in request.form.getlist('uploaded_photos'):
+            key = load_upload_token(token, session['user_id'], 'complete')
+            if key:
+                uploaded_photos.append(image_handler.photo_metadata_for_original(key))
+            else:
+                flash('An uploaded photo expired, please add it again', 'warning')
+        
+        # Handle file uploads
         files = request.files.getlist('photos')
         
         for file in files:
@@ -69,14 +79,17 @@ def create_trip_report():
                     # Process and upload image
                     result = image_handler.process_and_upload_image(file, "trip_reports")
                     
-                    uploaded_photos.append({
+                    photo = {
                         'key': result['key'],
                         'thumb_key': result['thumb_key'],
                         'url': result['url'],
                         'thumbnail_url': result['thumbnail_url'],
                         'width': result['width'],
                         'height': result['height']
-                    })
+                    }
+                    if result.get('original_key'):
+                        photo['original_key'] = result['original_key']
+                    uploaded_photos.append(photo)
                     
                 except Exception as e:
                     logger.error(f"Error uploading image: {e}")
@@ -87,12 +100,17 @@ def create_trip_report():
         )
         
         if success:
+            # Direct uploads are shown from the original until a worker has processed them
+            for photo in uploaded_photos:
+                if photo.get('status') == 'pending':
+                    image_handler.process_stored_original_in_background(photo['original_key'], trip_report.id)
             flash(message, 'success')
             return redirect(url_for('trips.view_trip_report', trip_id=trip_report.id))
         else:
             flash(message, 'error')
     
-    return render_template('create_trip_report.html')
+    return render_template('create_trip_report.html',
+                         direct_uploads=os.environ.get('DIRECT_UPLOADS', 'False').lower() == 'true')
 
 
 @trips_bp.route('/trip-reports/<int:trip_id>')
@@ -123,14 +141,15 @@ def delete_trip_report(trip_id):
             flash('Trip report not found', 'error')
             return redirect(url_for('trips.trip_reports'))
         
-        # Delete photos from S3
-        for photo in trip_report.images or []:
-            try:
-                image_handler.delete_images(photo)
-            except Exception as e:
-                logger.error(f"Error deleting image from S3: {e}")
+        # Collect every stored variant before the row is gone
+        image_keys = image_handler.collect_image_keys(trip_report.images)
         
         success, message = TripService.delete_trip_report(trip_id)
+        
+        # Remove photos from storage only once the delete has committed
+        if success:
+            image_handler.delete_keys_in_background(image_keys)
+        
         flash(message, 'success' if success else 'error')
         
     except Exception as e:
@@ -143,18 +162,51 @@ def delete_trip_report(trip_id):
 @trips_bp.route('/planned-trips')
 @login_required
 def planned_trips():
-    """Planned trips listing."""
+    """Planned trips listing with pagination."""
     try:
-        data = TripService.get_planned_trips()
+        page = request.args.get('page', 1, type=int)
+        data = TripService.get_planned_trips(page=page)
         return render_template('planned_trips.html', 
                              upcoming_trips=data['upcoming_trips'],
-                             past_trips=data['past_trips'])
+                             upcoming_total=data['total'],
+                             past_trips=data['past_trips'],
+                             has_more_past=data['has_more_past'],
+                             has_prev=data['has_prev'],
+                             has_next=data['has_next'],
+                             prev_num=data['prev_num'],
+                             next_num=data['next_num'],
+                             page=data['page'])
     except Exception as e:
         logger.error(f"Error loading planned trips: {e}")
         flash('Error loading planned trips', 'error')
         return redirect(url_for('main.dashboard'))
 
 
+@trips_bp.route('/planned-trips/archive')
+@login_required
+def planned_trips_archive():
+    """Past planned trips, paged by a (trip_date, id) cursor."""
+    try:
+        before = request.args.get('before')
+        before_id = request.args.get('before_id', type=int)
+        try:
+            before = datetime.fromisoformat(before) if before else None
+        except ValueError:
+            before = None
+        
+        data = TripService.get_past_trips(before=before, before_id=before_id)
+        next_cursor = data['next_cursor']
+        return render_template('planned_trips_archive.html',
+                             past_trips=data['trips'],
+                             next_before=next_cursor[0].isoformat() if next_cursor else None,
+                             next_before_id=next_cursor[1] if next_cursor else None,
+                             is_first_page=before is None)
+    except Exception as e:
+        logger.error(f"Error loading planned trips archive: {e}")
+        flash('Error loading planned trips archive', 'error')
+        return redirect(url_for('trips.planned_trips'))
+
+
 @trips_bp.route('/planned-trips/create', methods=['GET', 'POST'])
 @admin_required
 def create_planned_trip():
@@ -196,15 +248,22 @@ def view_planned_trip(trip_id):
             flash('Trip not found', 'error')
             return redirect(url_for('trips.planned_trips'))
         
-        # Check if current user is registered
-        user_registered = any(p.user_id == session['user_id'] for p in trip.participants)
+        # Check if current user is registered (or waiting for a seat)
+        user_registered = TripService.is_registered(trip_id, session['user_id'])
+        waitlist_position = None
+        if not user_registered and trip.waitlist_count:
+            waitlist_position = TripService.get_waitlist_position(trip_id, session['user_id'])
         
         # Check if trip is in the future
         is_future = trip.trip_date > datetime.utcnow()
         
+        participants = TripService.get_trip_participants(trip_id)
+        
         return render_template('view_planned_trip.html', 
                              trip=trip, 
                              user_registered=user_registered,
+                             waitlist_position=waitlist_position,
+                             participants=participants,
                              is_future=is_future)
     
     except Exception as e:
@@ -5,10 +5,12 @@ from .auth_service import AuthService
 from .trip_service import TripService
 from .news_service import NewsService
 from .admin_service import AdminService
+from .notification_service import NotificationService
 
 __all__ = [
     'AuthService',
     'TripService', 
     'NewsService',
-    'AdminService'
+    'AdminService',
+    'NotificationService'
 ]
\ No newline at end of file
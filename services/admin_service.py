@@ -3,9 +3,14 @@ Admin service for administrative functions.
 """
 from datetime import datetime
 from flask import session
+from sqlalchemy import func
 import logging
 
 from models import db, User, Announcement, Comment
+from utils.principal_cache import invalidate_principal
+from utils.current_user import load_user
+from utils.cache import invalidate_cache
+from utils.fragment_cache import ANNOUNCEMENTS_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -73,11 +78,12 @@ class AdminService:
                 admin_id = session.get('user_id')
                 admin_name = session.get('user_name', 'Unknown')
             else:
-                admin_user = User.query.get(admin_id)
+                admin_user = load_user(admin_id)
                 admin_name = admin_user.full_name if admin_user else 'Unknown'
             
             user.is_approved = True
             db.session.commit()
+            invalidate_principal(user.id)
             
             logger.info(f"Admin {admin_name} approved user {user.email}")
             return True, f'User {user.full_name} approved successfully'
@@ -109,7 +115,7 @@ class AdminService:
                 admin_id = session.get('user_id')
                 admin_name = session.get('user_name', 'Unknown')
             else:
-                admin_user = User.query.get(admin_id)
+                admin_user = load_user(admin_id)
                 admin_name = admin_user.full_name if admin_user else 'Unknown'
             
             user_name = user.full_name
@@ -117,6 +123,7 @@ class AdminService:
             
             db.session.delete(user)
             db.session.commit()
+            invalidate_principal(user_id)
             
             logger.info(f"Admin {admin_name} rejected user {user_email}")
             return True, f'User {user_name} rejected and removed'
@@ -148,12 +155,13 @@ class AdminService:
                 admin_id = session.get('user_id')
                 admin_name = session.get('user_name', 'Unknown')
             else:
-                admin_user = User.query.get(admin_id)
+                admin_user = load_user(admin_id)
                 admin_name = admin_user.full_name if admin_user else 'Unknown'
             
             new_admin_status = not user.is_admin
             user.is_admin = new_admin_status
             db.session.commit()
+            invalidate_principal(user_id)
             
             action = 'promoted to' if new_admin_status else 'removed from'
             logger.info(f"Admin {admin_name} changed admin status for {user.email}")
@@ -210,6 +218,7 @@ class AdminService:
             
             db.session.add(new_announcement)
             db.session.commit()
+            invalidate_cache(ANNOUNCEMENTS_TAG)
             
             author_name = session.get('user_name', 'Unknown')
             logger.info(f"Admin {author_name} created announcement: {title}")
@@ -241,12 +250,13 @@ class AdminService:
             if admin_id is None:
                 admin_name = session.get('user_name', 'Unknown')
             else:
-                admin_user = User.query.get(admin_id)
+                admin_user = load_user(admin_id)
                 admin_name = admin_user.full_name if admin_user else 'Unknown'
             
             announcement_title = announcement.title
             db.session.delete(announcement)
             db.session.commit()
+            invalidate_cache(ANNOUNCEMENTS_TAG)
             
             logger.info(f"Admin {admin_name} deleted announcement: {announcement_title}")
             return True, 'Announcement deleted successfully'
@@ -283,6 +293,41 @@ class AdminService:
             logger.error(f"Error getting comments: {e}")
             return []
     
+    @staticmethod
+    def get_comments_version(content_type, content_id):
+        """
+        Get a cheap version marker for the comments of a content item.
+        
+        Args:
+            content_type (str): Type of content ('announcement' or 'trip_report')
+            content_id (int): Content ID
+            
+        Returns:
+            dict or None: 'count', 'last_id' and 'last_modified' of the comments
+        """
+        try:
+            if content_type not in ['announcement', 'trip_report']:
+                return None
+            
+            if content_type == 'announcement':
+                condition = Comment.announcement_id == int(content_id)
+            else:  # trip_report
+                condition = Comment.trip_report_id == int(content_id)
+            
+            count, last_id, last_modified = db.session.query(
+                func.count(Comment.id), func.max(Comment.id), func.max(Comment.created_at)
+            ).filter(condition).one()
+            
+            return {
+                'count': count,
+                'last_id': last_id or 0,
+                'last_modified': last_modified
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting comments version: {e}")
+            return None
+    
     @staticmethod
     def add_comment(content_type, content_id, comment_text, author_id=None):
         """
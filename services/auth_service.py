@@ -3,10 +3,11 @@ Authentication service for user management and authentication.
 """
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask import session, flash
+from flask import session, flash, g
 import logging
 
 from models import db, User
+from utils.current_user import get_current_user
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +90,7 @@ class AuthService:
             session['user_id'] = user.id
             session['user_name'] = user.full_name
             session['is_admin'] = user.is_admin
+            g.current_user = user
             
             # Update last login
             user.last_login = datetime.utcnow()
@@ -112,6 +114,7 @@ class AuthService:
         try:
             user_name = session.get('user_name', 'Unknown')
             session.clear()
+            g.pop('current_user', None)
             logger.info(f"User logged out: {user_name}")
             return True, 'Logged out successfully'
             
@@ -127,10 +130,7 @@ class AuthService:
         Returns:
             User or None: Current user if authenticated, None otherwise
         """
-        user_id = session.get('user_id')
-        if user_id:
-            return User.query.get(user_id)
-        return None
+        return get_current_user()
     
     @staticmethod
     def is_authenticated():
@@ -189,6 +189,7 @@ class AuthService:
                 session['user_id'] = user.id
                 session['user_name'] = user.full_name
                 session['is_admin'] = user.is_admin
+                g.current_user = user
                 
                 # Update last login
                 user.last_login = datetime.utcnow()
@@ -0,0 +1,178 @@
+"""
+Export service for streaming club data as CSV or JSON Lines.
+"""
+from datetime import date, datetime
+import csv
+import io
+import json
+import logging
+import re
+
+from sqlalchemy import select
+
+from models import db, User, PlannedTrip, TripParticipant, TripReport, News
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip (server-side cursor on Postgres)
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson'
+}
+
+
+def _participants_query():
+    return (
+        select(
+            PlannedTrip.id.label('trip_id'),
+            PlannedTrip.title.label('trip_title'),
+            PlannedTrip.trip_date,
+            User.id.label('user_id'),
+            User.first_name,
+            User.last_name,
+            User.email,
+            TripParticipant.phone,
+            TripParticipant.emergency_contact,
+            TripParticipant.notes,
+            TripParticipant.registered_at
+        )
+        .join(PlannedTrip, TripParticipant.trip_id == PlannedTrip.id)
+        .join(User, TripParticipant.user_id == User.id)
+        .order_by(PlannedTrip.trip_date, PlannedTrip.id, TripParticipant.registered_at)
+    )
+
+
+def _trip_reports_query():
+    return (
+        select(
+            TripReport.id,
+            TripReport.title,
+            TripReport.date,
+            TripReport.location,
+            TripReport.difficulty,
+            User.first_name.label('author_first_name'),
+            User.last_name.label('author_last_name'),
+            User.email.label('author_email'),
+            TripReport.description,
+            TripReport.created_at
+        )
+        .join(User, TripReport.author_id == User.id)
+        .order_by(TripReport.id)
+    )
+
+
+def _news_query():
+    return (
+        select(
+            News.id,
+            News.title,
+            News.source_name,
+            News.category,
+            News.language,
+            News.relevance_score,
+            News.original_url,
+            News.summary,
+            News.published_at,
+            News.created_at
+        )
+        .order_by(News.id)
+    )
+
+
+# dataset -> query builder
+EXPORTS = {
+    'participants': _participants_query,
+    'trip_reports': _trip_reports_query,
+    'news': _news_query
+}
+
+
+def _serialize(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Numbers and phone numbers ("+386 41 123 456", "-12.5") are left as they are
+PLAIN_NUMBER = re.compile(r'[+-]?[\d ()./-]*\d[\d ()./-]*')
+
+
+def _csv_cell(value):
+    """Serialize a CSV cell, quoting member text that would run as a formula."""
+    value = _serialize(value)
+    if (isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES)
+            and not PLAIN_NUMBER.fullmatch(value)):
+        return "'" + value
+    return value
+
+
+class ExportService:
+    """Service for streaming bulk exports."""
+    
+    @staticmethod
+    def iter_rows(dataset, trip_id=None):
+        """
+        Stream the rows of a dataset without loading them all.
+        
+        Args:
+            dataset (str): Dataset name (see EXPORTS)
+            trip_id (int): Only rows of this trip (participants only)
+        
+        Returns:
+            tuple: (columns: list, rows: iterator of tuples)
+        """
+        query = EXPORTS[dataset]()
+        if trip_id is not None and dataset == 'participants':
+            query = query.where(TripParticipant.trip_id == trip_id)
+        result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        return list(result.keys()), iter(result)
+    
+    @staticmethod
+    def stream(dataset, export_format, trip_id=None, batch_size=100):
+        """
+        Encode a dataset as CSV or JSON Lines, chunk by chunk.
+        
+        The CSV header is yielded first, so responses start sending bytes
+        right away; rows follow in chunks of batch_size as they are read.
+        
+        Args:
+            dataset (str): Dataset name (see EXPORTS)
+            export_format (str): 'csv' or 'jsonl'
+            trip_id (int): Only rows of this trip (participants only)
+            batch_size (int): Rows per yielded chunk
+        
+        Yields:
+            str: Encoded chunk
+        """
+        columns, rows = ExportService.iter_rows(dataset, trip_id)
+        buffer = io.StringIO()
+        
+        if export_format == 'csv':
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            write = lambda row: writer.writerow([_csv_cell(value) for value in row])
+        else:
+            write = lambda row: buffer.write(json.dumps(
+                {column: _serialize(value) for column, value in zip(columns, row)}, ensure_ascii=False
+            ) + '\n')
+        
+        count = 0
+        for row in rows:
+            write(row)
+            count += 1
+            if count % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+        logger.info(f"Exported {count} {dataset} rows as {export_format}")
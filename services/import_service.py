@@ -0,0 +1,225 @@
+"""
+Import service for bulk loading historical events from JSON/JSONL files.
+"""
+from datetime import datetime
+from itertools import chain
+import json
+import logging
+
+from sqlalchemy import insert, select, tuple_, update
+
+from models import db, HistoricalEvent
+from ai_services.config import EVENT_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+# Days per month for MM-DD validation (02-29 is a valid anniversary)
+DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+IMPORT_FIELDS = (
+    'description', 'location', 'people', 'category', 'reference_url',
+    'source', 'language', 'is_featured', 'is_verified'
+)
+
+
+def iter_json_records(fp, buffer_size=65536):
+    """
+    Stream records from a JSON array or a JSON Lines file.
+    
+    The array form is decoded one element at a time, so memory use is
+    bounded by the largest record rather than the file size.
+    
+    Args:
+        fp: Text file object
+        buffer_size (int): Characters read per chunk
+    
+    Yields:
+        tuple: (line or element number, decoded value or JSONDecodeError)
+    """
+    first = fp.read(1)
+    while first and first.isspace():
+        first = fp.read(1)
+    
+    if first != '[':
+        # JSON Lines: one record per line
+        for number, line in enumerate(chain([first + fp.readline()], fp), start=1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield number, e
+        return
+    
+    decoder = json.JSONDecoder()
+    buffer = ''
+    number = 0
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if eof:
+                yield number + 1, e
+                return
+            chunk = fp.read(buffer_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        number += 1
+        buffer = buffer[end:]
+        yield number, value
+
+
+def _optional_text(raw, field, max_length):
+    value = raw.get(field)
+    return str(value).strip()[:max_length] or None if value else None
+
+
+class ImportService:
+    """Service for bulk importing historical events."""
+    
+    @staticmethod
+    def validate_historical_event(raw):
+        """
+        Validate and normalize one imported event.
+        
+        Args:
+            raw (dict): Decoded record
+        
+        Returns:
+            tuple: (event: dict or None, error: str or None)
+        """
+        if not isinstance(raw, dict):
+            return None, 'record is not an object'
+        
+        date = str(raw.get('date') or '').strip()
+        try:
+            month, day = (int(part) for part in date.split('-'))
+            if len(date) != 5 or not 1 <= day <= DAYS_IN_MONTH[month - 1]:
+                raise ValueError
+        except (ValueError, IndexError):
+            return None, f"invalid date '{date}' (expected MM-DD)"
+        
+        year = raw.get('year')
+        if isinstance(year, bool) or not isinstance(year, int) or not 1 <= year <= datetime.utcnow().year:
+            return None, f"invalid year '{year}'"
+        
+        title = (raw.get('title') or '').strip()
+        description = (raw.get('description') or '').strip()
+        if not title or len(title) > 200:
+            return None, 'title is required (max 200 characters)'
+        if not description:
+            return None, 'description is required'
+        
+        category = raw.get('category')
+        if category is not None and category not in EVENT_CATEGORIES:
+            return None, f"unknown category '{category}'"
+        
+        people = raw.get('people')
+        if people is not None and not (isinstance(people, list) and all(isinstance(p, str) for p in people)):
+            return None, 'people must be a list of names'
+        
+        return {
+            'date': date,
+            'year': year,
+            'title': title,
+            'description': description,
+            'location': _optional_text(raw, 'location', 200),
+            'people': people,
+            'category': category,
+            'reference_url': _optional_text(raw, 'reference_url', 500),
+            'source': (raw.get('source') or 'import')[:50],
+            'language': (raw.get('language') or 'sl')[:5],
+            'is_featured': bool(raw.get('is_featured', False)),
+            'is_verified': bool(raw.get('is_verified', False))
+        }, None
+    
+    @staticmethod
+    def import_historical_events(records, chunk_size=1000, update_existing=True, dry_run=False):
+        """
+        Bulk upsert historical events on (date, year, title).
+        
+        Each chunk costs one SELECT of the existing keys, one multi-row
+        INSERT and one executemany UPDATE, committed together.
+        
+        Args:
+            records: Iterable of (number, decoded value) as from iter_json_records
+            chunk_size (int): Records per transaction
+            update_existing (bool): Update events that already exist (skip them otherwise)
+            dry_run (bool): Validate and count without writing
+        
+        Returns:
+            tuple: (success: bool, message: str, stats: dict)
+        """
+        stats = {'inserted': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+        chunk = {}
+        
+        try:
+            for number, raw in records:
+                if isinstance(raw, Exception):
+                    event, error = None, f"invalid JSON: {raw}"
+                else:
+                    event, error = ImportService.validate_historical_event(raw)
+                if error:
+                    stats['skipped'] += 1
+                    if len(stats['errors']) < 100:
+                        stats['errors'].append(f"record {number}: {error}")
+                    continue
+                
+                key = (event['date'], event['year'], event['title'])
+                if key in chunk:
+                    # Later duplicate in the same chunk wins
+                    stats['skipped'] += 1
+                chunk[key] = event
+                
+                if len(chunk) >= chunk_size:
+                    ImportService._write_chunk(chunk, stats, update_existing, dry_run)
+                    chunk = {}
+            
+            if chunk:
+                ImportService._write_chunk(chunk, stats, update_existing, dry_run)
+            
+            message = (f"Imported historical events: {stats['inserted']} inserted, "
+                       f"{stats['updated']} updated, {stats['skipped']} skipped")
+            logger.info(message)
+            return True, message, stats
+        
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error importing historical events: {e}")
+            return False, f"Import failed: {e}", stats
+    
+    @staticmethod
+    def _write_chunk(chunk, stats, update_existing, dry_run):
+        existing = {
+            (row.date, row.year, row.title): row
+            for row in db.session.execute(
+                select(HistoricalEvent.id, HistoricalEvent.date, HistoricalEvent.year, HistoricalEvent.title,
+                       *(getattr(HistoricalEvent, field) for field in IMPORT_FIELDS))
+                .where(tuple_(HistoricalEvent.date, HistoricalEvent.year, HistoricalEvent.title).in_(list(chunk)))
+            )
+        }
+        
+        new_rows = []
+        changed_rows = []
+        for key, event in chunk.items():
+            row = existing.get(key)
+            if row is None:
+                new_rows.append(dict(event, created_at=datetime.utcnow()))
+            elif update_existing and any(getattr(row, field) != event[field] for field in IMPORT_FIELDS):
+                changed_rows.append(dict({field: event[field] for field in IMPORT_FIELDS}, id=row.id))
+            else:
+                stats['skipped'] += 1
+        
+        if not dry_run:
+            if new_rows:
+                db.session.execute(insert(HistoricalEvent), new_rows)
+            if changed_rows:
+                db.session.execute(update(HistoricalEvent), changed_rows)
+            db.session.commit()
+        
+        stats['inserted'] += len(new_rows)
+        stats['updated'] += len(changed_rows)
@@ -3,11 +3,15 @@ News service for managing news curation and AI content.
 """
 from datetime import datetime
 import logging
+import time
 
-from models import db, News, HistoricalEvent
+from models import db, News, NewsFeedState, HistoricalEvent
 from ai_services.news_curator import NewsCurator
 from ai_services.content_generator_sqlalchemy import HistoricalEventGenerator
 from ai_services.deepseek_client import DeepSeekClient
+from utils.cache import invalidate_cache
+from utils.metrics import metrics
+from jobs.queue import enqueue
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +27,11 @@ class NewsService:
             ai_client: AI client instance (optional, creates new DeepSeekClient if not provided)
         """
         self.ai_client = ai_client or DeepSeekClient()
-        self.news_curator = NewsCurator(db, News, self.ai_client)
-        self.historical_generator = HistoricalEventGenerator(db, HistoricalEvent, self.ai_client)
+        self.news_curator = NewsCurator(db, News, self.ai_client, FeedState=NewsFeedState)
+        self.historical_generator = HistoricalEventGenerator(
+            db, HistoricalEvent, self.ai_client,
+            on_event_stored=lambda event: invalidate_cache('history')
+        )
     
     def get_latest_news(self, limit=5, category=None):
         """
@@ -63,13 +70,61 @@ class NewsService:
         Returns:
             tuple: (success: bool, message: str, stats: dict)
         """
+        start = time.perf_counter()
         try:
             stats = self.news_curator.fetch_and_process_feeds()
+            invalidate_cache('news')
+            self._record_curation_metrics(start, 'success', stats)
             return True, 'News feed updated successfully', stats
         except Exception as e:
             logger.error(f"Error updating news feed: {e}")
+            self._record_curation_metrics(start, 'error', {})
             return False, 'Failed to update news feed', {}
     
+    def refresh_feeds(self, feed_urls):
+        """
+        Incrementally refresh the given feeds, processing only new entries.
+        
+        Args:
+            feed_urls (list): Feed URLs to refresh
+            
+        Returns:
+            tuple: (success: bool, message: str, stats: dict)
+        """
+        start = time.perf_counter()
+        try:
+            stats = self.news_curator.fetch_and_process_feeds(feed_urls, incremental=True)
+            if stats['articles_stored']:
+                invalidate_cache('news')
+            self._record_curation_metrics(start, 'success', stats)
+            return True, f"Refreshed {len(feed_urls)} feeds", stats
+        except Exception as e:
+            logger.error(f"Error refreshing news feeds: {e}")
+            self._record_curation_metrics(start, 'error', {})
+            return False, 'Failed to refresh news feeds', {}
+    
+    def cleanup_old_news(self):
+        """
+        Remove expired news articles.
+        
+        Returns:
+            tuple: (success: bool, message: str, stats: dict)
+        """
+        stats = self.news_curator.cleanup_old_articles()
+        if stats['deleted']:
+            invalidate_cache('news')
+            metrics.inc('news_articles_total', stats['deleted'], stage='deleted')
+        if stats['errors']:
+            return False, f"Removed {stats['deleted']} old articles with errors", stats
+        return True, f"Removed {stats['deleted']} old articles", stats
+    
+    @staticmethod
+    def _record_curation_metrics(start, result, stats):
+        metrics.observe('news_curation_duration_seconds', time.perf_counter() - start)
+        metrics.inc('news_curation_runs_total', result=result)
+        metrics.inc('news_articles_total', stats.get('articles_found', 0), stage='found')
+        metrics.inc('news_articles_total', stats.get('articles_stored', 0), stage='stored')
+    
     def get_news_statistics(self):
         """
         Get news curation statistics.
@@ -94,7 +149,12 @@ class NewsService:
             dict or None: Historical event data
         """
         try:
-            event = self.historical_generator.get_today_event(date)
+            date = date or datetime.now().strftime("%m-%d")
+            event = self.historical_generator.get_today_event(date, generate=False)
+            if event and event.get('id') is None:
+                # Not stored yet: generate it in a worker and serve the placeholder meanwhile
+                enqueue('history.generate', {'date': date}, unique_key=f'history.generate:{date}')
+                event = self.historical_generator.get_today_event(date, generate=False)
             return event
         except Exception as e:
             logger.error(f"Error getting today's historical event: {e}")
@@ -180,6 +240,7 @@ class NewsService:
         try:
             success = self.historical_generator.verify_event(event_id)
             if success:
+                invalidate_cache('history')
                 return True, 'Event verified successfully'
             else:
                 return False, 'Event not found'
@@ -200,6 +261,7 @@ class NewsService:
         try:
             success = self.historical_generator.mark_as_featured(event_id)
             if success:
+                invalidate_cache('history')
                 return True, 'Event marked as featured'
             else:
                 return False, 'Event not found'
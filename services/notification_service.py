@@ -0,0 +1,77 @@
+"""
+Notification service for emailing members about their trips.
+"""
+from email.message import EmailMessage
+import os
+import smtplib
+import logging
+
+from models import db, User, PlannedTrip
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    """Service for member notifications (email over SMTP)."""
+    
+    @staticmethod
+    def send_email(to, subject, body):
+        """
+        Send a plain text email.
+        
+        Args:
+            to (str): Recipient address
+            subject (str): Subject line
+            body (str): Message text
+        
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        server = os.environ.get('MAIL_SERVER')
+        if not server:
+            logger.info(f"Email to {to} not sent (MAIL_SERVER not configured): {subject}")
+            return False, 'Email not configured'
+        
+        message = EmailMessage()
+        message['From'] = os.environ.get('MAIL_FROM', 'noreply@planinsko-drustvo.si')
+        message['To'] = to
+        message['Subject'] = subject
+        message.set_content(body)
+        
+        with smtplib.SMTP(server, int(os.environ.get('MAIL_PORT', 587)), timeout=30) as smtp:
+            if os.environ.get('MAIL_USE_TLS', 'True').lower() == 'true':
+                smtp.starttls()
+            if os.environ.get('MAIL_USERNAME'):
+                smtp.login(os.environ['MAIL_USERNAME'], os.environ.get('MAIL_PASSWORD', ''))
+            smtp.send_message(message)
+        
+        logger.info(f"Email sent to {to}: {subject}")
+        return True, 'Email sent'
+    
+    @staticmethod
+    def notify_waitlist_promotion(trip_id, user_id):
+        """
+        Tell a member they moved from the waitlist into a seat.
+        
+        Args:
+            trip_id (int): Planned trip ID
+            user_id (int): Promoted user ID
+        
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        user = db.session.get(User, user_id)
+        trip = db.session.get(PlannedTrip, trip_id)
+        if user is None or trip is None or not user.email:
+            return False, 'Member or trip not found'
+        
+        subject = f'You are registered for {trip.title}'
+        body = (
+            f"Hello {user.first_name},\n\n"
+            f"A seat has freed up on {trip.title} "
+            f"({trip.trip_date.strftime('%d. %m. %Y %H:%M')}) and you have been moved "
+            f"from the waitlist to the participant list.\n\n"
+            f"If you can no longer join, please unregister on the trip page so the "
+            f"next member on the waitlist gets your seat.\n"
+        )
+        return NotificationService.send_email(user.email, subject, body)
@@ -0,0 +1,118 @@
+"""
+Lazy service registry for expensive per-process service objects.
+
+The image handler (boto3 client) and news service (DeepSeek client, news
+curator, historical event generator) are created on first use and then shared
+by all requests handled by the process.
+"""
+import threading
+import logging
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Registry that builds services on first access and caches them per process."""
+    
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name, factory):
+        """
+        Register a factory for a service.
+        
+        Args:
+            name (str): Service name
+            factory (callable): Zero-argument callable building the service
+        """
+        self._factories[name] = factory
+        self._instances.pop(name, None)
+    
+    def get(self, name):
+        """
+        Get a service, building it on first use.
+        
+        Args:
+            name (str): Service name
+            
+        Returns:
+            object: Service instance
+            
+        Raises:
+            KeyError: If no factory is registered under the name
+        """
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories[name]
+                self._instances[name] = factory()
+                logger.info(f"Service initialized: {name}")
+            return self._instances[name]
+    
+    def is_loaded(self, name):
+        """Check whether a service has already been built."""
+        return name in self._instances
+    
+    def reset(self, name=None):
+        """Drop cached instances (all, or a single service) so they are rebuilt."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+
+def _build_image_handler():
+    from image_handler import ImageHandler
+    return ImageHandler()
+
+
+def _build_news_service():
+    from services.news_service import NewsService
+    return NewsService()
+
+
+DEFAULT_SERVICES = {
+    'image_handler': _build_image_handler,
+    'news_service': _build_news_service
+}
+
+
+def init_service_registry(app):
+    """
+    Attach a service registry with the default services to the app.
+    
+    Args:
+        app: Flask application
+        
+    Returns:
+        ServiceRegistry: The app's registry
+    """
+    registry = ServiceRegistry()
+    for name, factory in DEFAULT_SERVICES.items():
+        registry.register(name, factory)
+    app.extensions['service_registry'] = registry
+    return registry
+
+
+def get_service(name):
+    """
+    Get a service from the current app's registry.
+    
+    Args:
+        name (str): Service name
+        
+    Returns:
+        object: Service instance
+    """
+    registry = current_app.extensions.get('service_registry')
+    if registry is None:
+        registry = init_service_registry(current_app)
+    return registry.get(name)
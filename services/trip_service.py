@@ -3,12 +3,20 @@ Trip service for managing trip reports and planned trips.
 """
 from datetime import datetime
 from flask import session
+from sqlalchemy import and_, case, delete, exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 import logging
 
-from models import db, TripReport, PlannedTrip, TripParticipant, User
+from models import db, TripReport, PlannedTrip, TripParticipant, TripWaitlistEntry, User
+from utils.cache import invalidate_cache
+from utils.fragment_cache import TRIP_REPORTS_TAG, PLANNED_TRIPS_TAG
+from utils.signals import waitlist_promoted
 
 logger = logging.getLogger(__name__)
 
+# Characters of the description shown on trip cards
+DESCRIPTION_PREVIEW_LENGTH = 120
+
 
 class TripService:
     """Service for handling trip reports and planned trips."""
@@ -61,6 +69,7 @@ class TripService:
             
             db.session.add(new_trip_report)
             db.session.commit()
+            invalidate_cache(TRIP_REPORTS_TAG)
             
             logger.info(f"Trip report created: {title} by user {author_id}")
             return True, 'Trip report created successfully', new_trip_report
@@ -70,6 +79,51 @@ class TripService:
             db.session.rollback()
             return False, 'Failed to create trip report', None
     
+    @staticmethod
+    def update_report_photo(trip_report_id, original_key, metadata):
+        """
+        Replace the pending photo of a processed original with its final metadata.
+        
+        Args:
+            trip_report_id (int): Trip report ID
+            original_key (str): Storage key of the processed original
+            metadata (dict): Photo metadata from ImageHandler.process_stored_original
+            
+        Returns:
+            bool: True if a photo was updated
+        """
+        trip_report = db.session.get(TripReport, trip_report_id)
+        if trip_report is None:
+            return False
+        
+        photos = [
+            dict(metadata) if photo.get('original_key') == original_key else photo
+            for photo in trip_report.photos
+        ]
+        if photos == trip_report.photos:
+            return False
+        
+        # New list so the JSON column is marked as changed
+        trip_report.images = photos
+        db.session.commit()
+        invalidate_cache(TRIP_REPORTS_TAG)
+        return True
+    
+    @staticmethod
+    def claimed_original_keys():
+        """
+        Collect the original keys referenced by trip report photos.
+        
+        Returns:
+            set: Storage keys
+        """
+        keys = set()
+        for images, in db.session.execute(
+            select(TripReport.images).execution_options(yield_per=500)
+        ):
+            keys.update(photo['original_key'] for photo in images or [] if photo.get('original_key'))
+        return keys
+    
     @staticmethod
     def get_trip_reports(page=1, per_page=6):
         """
@@ -160,6 +214,7 @@ class TripService:
             # Delete trip report
             db.session.delete(trip_report)
             db.session.commit()
+            invalidate_cache(TRIP_REPORTS_TAG)
             
             logger.info(f"Trip report deleted: {trip_report.title} by user {user_id}")
             return True, 'Trip report deleted successfully'
@@ -229,6 +284,7 @@ class TripService:
             
             db.session.add(new_trip)
             db.session.commit()
+            invalidate_cache(PLANNED_TRIPS_TAG)
             
             logger.info(f"Planned trip created: {title} by user {organizer_id}")
             return True, 'Planned trip created successfully', new_trip
@@ -239,36 +295,118 @@ class TripService:
             return False, 'Failed to create planned trip', None
     
     @staticmethod
-    def get_planned_trips():
+    def _trip_card_query():
+        """Only the columns trip cards render, with the description cut in SQL."""
+        return select(
+            PlannedTrip.id,
+            PlannedTrip.title,
+            PlannedTrip.location,
+            PlannedTrip.trip_date,
+            PlannedTrip.difficulty,
+            PlannedTrip.status,
+            PlannedTrip.max_participants,
+            PlannedTrip.participant_count,
+            PlannedTrip.price,
+            # One extra character tells the template whether to add "..."
+            func.substr(PlannedTrip.description, 1, DESCRIPTION_PREVIEW_LENGTH + 1).label('description_preview'),
+            (User.first_name + ' ' + User.last_name).label('organizer_name')
+        ).join(User, PlannedTrip.organizer_id == User.id)
+    
+    @staticmethod
+    def get_planned_trips(page=1, per_page=12, past_limit=6):
         """
-        Get upcoming and past planned trips.
+        Get a page of upcoming planned trips and the most recent past trips.
         
+        Args:
+            page (int): Page of upcoming trips
+            per_page (int): Upcoming trips per page
+            past_limit (int): Number of past trips (older ones are in the archive)
+            
         Returns:
-            dict: Upcoming and past planned trips
+            dict: Trip card rows and pagination data
         """
+        page = max(page, 1)
         try:
             current_date = datetime.utcnow()
             
-            upcoming_trips = PlannedTrip.query.filter(
-                PlannedTrip.trip_date >= current_date
-            ).order_by(PlannedTrip.trip_date.asc()).all()
+            total = db.session.execute(
+                select(func.count(PlannedTrip.id)).where(PlannedTrip.trip_date >= current_date)
+            ).scalar()
+            upcoming_trips = db.session.execute(
+                TripService._trip_card_query()
+                .where(PlannedTrip.trip_date >= current_date)
+                .order_by(PlannedTrip.trip_date.asc(), PlannedTrip.id.asc())
+                .offset((page - 1) * per_page).limit(per_page)
+            ).all()
             
-            past_trips = PlannedTrip.query.filter(
-                PlannedTrip.trip_date < current_date
-            ).order_by(PlannedTrip.trip_date.desc()).limit(10).all()
+            past = TripService.get_past_trips(limit=past_limit)
             
             return {
                 'upcoming_trips': upcoming_trips,
-                'past_trips': past_trips
+                'past_trips': past['trips'],
+                'has_more_past': past['next_cursor'] is not None,
+                'total': total,
+                'page': page,
+                'per_page': per_page,
+                'has_prev': page > 1,
+                'has_next': (page * per_page) < total,
+                'prev_num': page - 1 if page > 1 else None,
+                'next_num': page + 1 if (page * per_page) < total else None
             }
             
         except Exception as e:
             logger.error(f"Error getting planned trips: {e}")
             return {
                 'upcoming_trips': [],
-                'past_trips': []
+                'past_trips': [],
+                'has_more_past': False,
+                'total': 0,
+                'page': page,
+                'per_page': per_page,
+                'has_prev': False,
+                'has_next': False,
+                'prev_num': None,
+                'next_num': None
             }
     
+    @staticmethod
+    def get_past_trips(before=None, before_id=None, limit=12):
+        """
+        Page through past trips, newest first, by a (trip_date, id) cursor.
+        
+        Unlike OFFSET paging, each page is an index range scan starting at the
+        cursor, so old pages cost the same as the first one.
+        
+        Args:
+            before (datetime): trip_date of the last trip on the previous page
+            before_id (int): ID of the last trip on the previous page
+            limit (int): Trips per page
+            
+        Returns:
+            dict: Trip card rows and the (before, before_id) cursor of the next page or None
+        """
+        try:
+            query = TripService._trip_card_query().where(PlannedTrip.trip_date < datetime.utcnow())
+            if before is not None:
+                query = query.where(or_(
+                    PlannedTrip.trip_date < before,
+                    (PlannedTrip.trip_date == before) & (PlannedTrip.id < (before_id or 0))
+                ))
+            
+            trips = db.session.execute(
+                query.order_by(PlannedTrip.trip_date.desc(), PlannedTrip.id.desc()).limit(limit + 1)
+            ).all()
+            
+            next_cursor = None
+            if len(trips) > limit:
+                trips = trips[:limit]
+                next_cursor = (trips[-1].trip_date, trips[-1].id)
+            return {'trips': trips, 'next_cursor': next_cursor}
+            
+        except Exception as e:
+            logger.error(f"Error getting past trips: {e}")
+            return {'trips': [], 'next_cursor': None}
+    
     @staticmethod
     def get_planned_trip(trip_id):
         """
@@ -286,6 +424,268 @@ class TripService:
             logger.error(f"Error getting planned trip {trip_id}: {e}")
             return None
     
+    @staticmethod
+    def is_registered(trip_id, user_id):
+        """
+        Check whether a user is registered for a trip (EXISTS, no rows loaded).
+        
+        Args:
+            trip_id (int): Planned trip ID
+            user_id (int): User ID
+            
+        Returns:
+            bool: True if registered
+        """
+        return db.session.query(
+            exists().where(TripParticipant.trip_id == trip_id, TripParticipant.user_id == user_id)
+        ).scalar()
+    
+    @staticmethod
+    def get_trip_participants(trip_id):
+        """
+        Get the participant names shown on a trip's page.
+        
+        Args:
+            trip_id (int): Planned trip ID
+            
+        Returns:
+            list: Rows with user_id, first_name, last_name and registered_at
+        """
+        try:
+            return db.session.execute(
+                select(
+                    TripParticipant.user_id,
+                    User.first_name,
+                    User.last_name,
+                    TripParticipant.registered_at
+                )
+                .join(User, TripParticipant.user_id == User.id)
+                .where(TripParticipant.trip_id == trip_id)
+                .order_by(TripParticipant.registered_at)
+            ).all()
+        except Exception as e:
+            logger.error(f"Error getting participants of trip {trip_id}: {e}")
+            return []
+    
+    @staticmethod
+    def recount_participants():
+        """
+        Repair participant/waitlist counters and full/open status from the rows.
+        
+        Returns:
+            tuple: (success: bool, message: str, fixed: int)
+        """
+        try:
+            actual = select(func.count(TripParticipant.id)).where(
+                TripParticipant.trip_id == PlannedTrip.id
+            ).scalar_subquery()
+            waiting = select(func.count(TripWaitlistEntry.id)).where(
+                TripWaitlistEntry.trip_id == PlannedTrip.id
+            ).scalar_subquery()
+            fixed = db.session.execute(
+                update(PlannedTrip)
+                .where((PlannedTrip.participant_count != actual) | (PlannedTrip.waitlist_count != waiting))
+                .values(participant_count=actual, waitlist_count=waiting)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            
+            has_limit = PlannedTrip.max_participants > 0
+            db.session.execute(
+                update(PlannedTrip)
+                .where(PlannedTrip.status == 'open', has_limit,
+                       PlannedTrip.participant_count >= PlannedTrip.max_participants)
+                .values(status='full')
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                update(PlannedTrip)
+                .where(PlannedTrip.status == 'full',
+                       ~has_limit | (PlannedTrip.participant_count < PlannedTrip.max_participants))
+                .values(status='open')
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            invalidate_cache(PLANNED_TRIPS_TAG)
+            
+            logger.info(f"Recounted trip participants, {fixed} counters fixed")
+            return True, f"{fixed} trip counters fixed", fixed
+            
+        except Exception as e:
+            logger.error(f"Error recounting trip participants: {e}")
+            db.session.rollback()
+            return False, 'Failed to recount trip participants', 0
+    
+    @staticmethod
+    def get_waitlist_position(trip_id, user_id):
+        """
+        Get a member's current place on a trip's waitlist.
+        
+        Args:
+            trip_id (int): Planned trip ID
+            user_id (int): User ID
+            
+        Returns:
+            int or None: 1-based place, None if not on the waitlist
+        """
+        own_position = select(TripWaitlistEntry.position).where(
+            TripWaitlistEntry.trip_id == trip_id, TripWaitlistEntry.user_id == user_id
+        ).scalar_subquery()
+        place = db.session.execute(
+            select(func.count(TripWaitlistEntry.id)).where(
+                TripWaitlistEntry.trip_id == trip_id, TripWaitlistEntry.position <= own_position
+            )
+        ).scalar()
+        return place or None
+    
+    @staticmethod
+    def _join_waitlist(trip_id, user_id, phone, emergency_contact, notes):
+        """
+        Queue a member for a full trip.
+        
+        The counter UPDATE only matches while the trip is still full and locks
+        the trip row, so positions are handed out one at a time and nobody is
+        queued for a trip that has just freed a seat.
+        
+        Returns:
+            bool: False if the trip is no longer full
+        """
+        result = db.session.execute(
+            update(PlannedTrip)
+            .where(
+                PlannedTrip.id == trip_id,
+                PlannedTrip.max_participants > 0,
+                PlannedTrip.participant_count >= PlannedTrip.max_participants
+            )
+            .values(waitlist_count=PlannedTrip.waitlist_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+        
+        position = db.session.execute(
+            select(func.coalesce(func.max(TripWaitlistEntry.position), 0) + 1)
+            .where(TripWaitlistEntry.trip_id == trip_id)
+        ).scalar()
+        db.session.add(TripWaitlistEntry(
+            trip_id=trip_id,
+            user_id=user_id,
+            position=position,
+            phone=phone,
+            emergency_contact=emergency_contact,
+            notes=notes,
+            created_at=datetime.utcnow()
+        ))
+        return True
+    
+    @staticmethod
+    def _promote_from_waitlist(trip_id):
+        """
+        Move the first waitlisted member into the seat just released.
+        
+        Runs after _release_seat, which holds the trip row lock, so concurrent
+        cancellations promote different members. Nobody is promoted when no
+        seat is available (e.g. the capacity was lowered); the queue is kept.
+        
+        Returns:
+            int or None: Promoted user ID
+        """
+        while True:
+            head = TripWaitlistEntry.query.filter_by(trip_id=trip_id).order_by(
+                TripWaitlistEntry.position
+            ).first()
+            if head is None:
+                return None
+            
+            if not TripService._reserve_seat(trip_id):
+                db.session.expunge(head)
+                return None
+            
+            # Another transaction may have promoted this entry already
+            removed = db.session.execute(
+                delete(TripWaitlistEntry)
+                .where(TripWaitlistEntry.id == head.id)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.expunge(head)
+            if removed == 0:
+                TripService._release_seat(trip_id)
+                continue
+            
+            db.session.execute(
+                update(PlannedTrip)
+                .where(PlannedTrip.id == trip_id)
+                .values(waitlist_count=PlannedTrip.waitlist_count - 1)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.add(TripParticipant(
+                user_id=head.user_id,
+                trip_id=trip_id,
+                phone=head.phone,
+                emergency_contact=head.emergency_contact,
+                notes=head.notes,
+                registered_at=datetime.utcnow()
+            ))
+            return head.user_id
+    
+    @staticmethod
+    def _reserve_seat(trip_id):
+        """
+        Atomically take a seat on a trip, marking an open trip full on the last one.
+        
+        The capacity check and the increment are one conditional UPDATE, so
+        concurrent registrations can never overbook (the row lock serializes
+        them on Postgres, the write lock on SQLite).
+        
+        Returns:
+            bool: True if a seat was taken
+        """
+        result = db.session.execute(
+            update(PlannedTrip)
+            .where(
+                PlannedTrip.id == trip_id,
+                PlannedTrip.status != 'cancelled',
+                or_(
+                    PlannedTrip.max_participants.is_(None),
+                    PlannedTrip.max_participants <= 0,
+                    PlannedTrip.participant_count < PlannedTrip.max_participants
+                )
+            )
+            .values(
+                participant_count=PlannedTrip.participant_count + 1,
+                status=case(
+                    # Unlimited (<= 0) trips never fill up; other statuses are kept
+                    (and_(
+                        PlannedTrip.max_participants > 0,
+                        PlannedTrip.status == 'open',
+                        PlannedTrip.participant_count + 1 >= PlannedTrip.max_participants
+                    ), 'full'),
+                    else_=PlannedTrip.status
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    @staticmethod
+    def _release_seat(trip_id):
+        """Give a seat back, reopening a full trip that is now below its capacity."""
+        db.session.execute(
+            update(PlannedTrip)
+            .where(PlannedTrip.id == trip_id, PlannedTrip.participant_count > 0)
+            .values(
+                participant_count=PlannedTrip.participant_count - 1,
+                status=case(
+                    (and_(
+                        PlannedTrip.status == 'full',
+                        or_(PlannedTrip.max_participants <= 0,
+                            PlannedTrip.participant_count - 1 < PlannedTrip.max_participants)
+                    ), 'open'),
+                    else_=PlannedTrip.status
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
     @staticmethod
     def register_for_trip(trip_id, user_id=None, phone='', 
                          emergency_contact='', notes=''):
@@ -313,19 +713,35 @@ class TripService:
                 if not user_id:
                     return False, 'User not authenticated'
             
-            # Check if already registered
-            if any(p.user_id == user_id for p in trip.participants):
-                return False, 'Already registered for this trip'
-            
-            # Check if trip is full
-            if trip.max_participants and len(trip.participants) >= trip.max_participants:
-                return False, 'Trip is full'
-            
             # Check if trip date has passed
             if trip.trip_date < datetime.utcnow():
                 return False, 'Cannot register for past trips'
             
-            # Register user
+            if trip.status == 'cancelled':
+                return False, 'Trip has been cancelled'
+            
+            # Check if already registered or waiting
+            if TripService.is_registered(trip_id, user_id):
+                return False, 'Already registered for this trip'
+            if TripService.get_waitlist_position(trip_id, user_id):
+                return False, 'Already on the waitlist for this trip'
+            
+            # Take a seat; a full trip queues the member on the waitlist instead.
+            # Retried because a seat can free up between the two attempts.
+            for _ in range(3):
+                if TripService._reserve_seat(trip_id):
+                    break
+                if TripService._join_waitlist(trip_id, user_id, phone, emergency_contact, notes):
+                    db.session.commit()
+                    invalidate_cache(PLANNED_TRIPS_TAG)
+                    place = TripService.get_waitlist_position(trip_id, user_id)
+                    logger.info(f"User {user_id} waitlisted for trip: {trip.title} (#{place})")
+                    return True, f'Trip is full - you are number {place} on the waitlist'
+            else:
+                db.session.rollback()
+                return False, 'Trip is full'
+            
+            # Register user (same transaction as the seat)
             participant = TripParticipant(
                 user_id=user_id,
                 trip_id=trip_id,
@@ -337,10 +753,16 @@ class TripService:
             
             db.session.add(participant)
             db.session.commit()
+            invalidate_cache(PLANNED_TRIPS_TAG)
             
             logger.info(f"User {user_id} registered for trip: {trip.title}")
             return True, 'Successfully registered for trip'
             
+        except IntegrityError:
+            # Concurrent double click: the unique (trip_id, user_id) constraints
+            # rejected the second row and the rollback returns its seat
+            db.session.rollback()
+            return False, 'Already registered for this trip'
         except Exception as e:
             logger.error(f"Error registering for trip {trip_id}: {e}")
             db.session.rollback()
@@ -373,19 +795,27 @@ class TripService:
             if trip.trip_date < datetime.utcnow():
                 return False, 'Cannot unregister from past trips'
             
-            # Remove user from participants
-            participant = TripParticipant.query.filter_by(
-                trip_id=trip_id,
-                user_id=user_id
-            ).first()
+            # Remove user from participants; the rowcount makes a concurrent
+            # second unregister a no-op instead of releasing two seats
+            result = db.session.execute(
+                delete(TripParticipant)
+                .where(TripParticipant.trip_id == trip_id, TripParticipant.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            )
             
-            if not participant:
-                return False, 'Not registered for this trip'
+            if result.rowcount == 0:
+                return TripService._leave_waitlist(trip, user_id)
             
-            db.session.delete(participant)
+            # Release the seat and hand it to the waitlist in one transaction
+            TripService._release_seat(trip_id)
+            promoted_user_id = TripService._promote_from_waitlist(trip_id)
             db.session.commit()
+            invalidate_cache(PLANNED_TRIPS_TAG)
             
             logger.info(f"User {user_id} unregistered from trip: {trip.title}")
+            if promoted_user_id is not None:
+                logger.info(f"User {promoted_user_id} promoted from the waitlist: {trip.title}")
+                waitlist_promoted.send(trip_id, user_id=promoted_user_id, trip_title=trip.title)
             return True, 'Successfully unregistered from trip'
             
         except Exception as e:
@@ -393,6 +823,30 @@ class TripService:
             db.session.rollback()
             return False, 'Failed to unregister from trip'
     
+    @staticmethod
+    def _leave_waitlist(trip, user_id):
+        """Remove a member from a trip's waitlist (unregister of a waiting member)."""
+        removed = db.session.execute(
+            delete(TripWaitlistEntry)
+            .where(TripWaitlistEntry.trip_id == trip.id, TripWaitlistEntry.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if removed == 0:
+            db.session.rollback()
+            return False, 'Not registered for this trip'
+        
+        db.session.execute(
+            update(PlannedTrip)
+            .where(PlannedTrip.id == trip.id)
+            .values(waitlist_count=PlannedTrip.waitlist_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        invalidate_cache(PLANNED_TRIPS_TAG)
+        
+        logger.info(f"User {user_id} left the waitlist of trip: {trip.title}")
+        return True, 'Removed from the waitlist'
+    
     @staticmethod
     def update_gear_list(trip_id, gear_items):
         """
@@ -0,0 +1,33 @@
+"""
+Storage backends for uploaded media (S3 or local filesystem).
+"""
+import os
+
+from .base import StorageBackend
+
+__all__ = [
+    'StorageBackend',
+    'get_storage_backend'
+]
+
+
+def get_storage_backend(name=None):
+    """
+    Create the storage backend selected by configuration.
+    
+    Args:
+        name (str): Backend name ('s3' or 'local'), defaults to STORAGE_BACKEND env
+        
+    Returns:
+        StorageBackend: Configured storage backend
+    """
+    name = (name or os.environ.get('STORAGE_BACKEND', 's3')).lower()
+    
+    if name == 's3':
+        from .s3 import S3StorageBackend
+        return S3StorageBackend()
+    if name == 'local':
+        from .local import LocalStorageBackend
+        return LocalStorageBackend()
+    
+    raise ValueError(f"Unknown storage backend: {name}")
@@ -0,0 +1,114 @@
+"""
+Storage backend interface.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackend:
+    """Interface for media storage backends."""
+    
+    name = 'base'
+    
+    def put(self, fileobj, key, content_type='application/octet-stream'):
+        """
+        Store a file object under the given key.
+        
+        Args:
+            fileobj: Readable binary file object (read from its current start)
+            key (str): Object key
+            content_type (str): MIME type of the object
+            
+        Returns:
+            bool: True if stored, False otherwise
+        """
+        raise NotImplementedError
+    
+    def get(self, key):
+        """
+        Open a stored object for reading.
+        
+        Args:
+            key (str): Object key
+            
+        Returns:
+            file object or None: Readable binary file object, None if missing
+        """
+        raise NotImplementedError
+    
+    def delete(self, key):
+        """
+        Delete a stored object.
+        
+        Args:
+            key (str): Object key
+            
+        Returns:
+            bool: True if deleted (or already missing), False on error
+        """
+        raise NotImplementedError
+    
+    def url(self, key):
+        """
+        Get the public URL for a stored object.
+        
+        Args:
+            key (str): Object key
+            
+        Returns:
+            str: Public URL
+        """
+        raise NotImplementedError
+    
+    def exists(self, key):
+        """
+        Check whether an object exists.
+        
+        Args:
+            key (str): Object key
+            
+        Returns:
+            bool: True if the object exists
+        """
+        raise NotImplementedError
+    
+    def create_upload(self, key, content_type, max_size, expires_in=3600):
+        """
+        Create a presigned form upload so a browser can send a file
+        directly to storage without passing through the web process.
+        
+        Args:
+            key (str): Object key the upload will be stored under
+            content_type (str): Required MIME type of the upload
+            max_size (int): Maximum upload size in bytes
+            expires_in (int): Seconds the upload stays valid
+            
+        Returns:
+            dict: 'url' to POST to and form 'fields' to send with the file
+        """
+        raise NotImplementedError
+    
+    def list(self, prefix):
+        """
+        List stored objects under a key prefix.
+        
+        Args:
+            prefix (str): Key prefix
+            
+        Yields:
+            tuple: (key, last_modified as naive UTC datetime)
+        """
+        raise NotImplementedError
+    
+    def delete_many(self, keys):
+        """
+        Delete several objects.
+        
+        Args:
+            keys (list): Object keys
+            
+        Returns:
+            list: Keys that could not be deleted
+        """
+        return [key for key in keys if not self.delete(key)]
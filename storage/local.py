@@ -0,0 +1,136 @@
+"""
+Local filesystem storage backend for offline development, tests and load tests.
+"""
+import os
+import shutil
+import tempfile
+import logging
+from datetime import datetime
+from flask import current_app, url_for
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+from .base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStorageBackend(StorageBackend):
+    """Storage backend that keeps objects on local disk, served by the media blueprint."""
+    
+    name = 'local'
+    
+    def __init__(self, root=None, url_prefix=None):
+        self.root = os.path.abspath(root or os.environ.get('LOCAL_STORAGE_PATH', 'uploads'))
+        self.url_prefix = (url_prefix or os.environ.get('LOCAL_STORAGE_URL', '/media')).rstrip('/')
+    
+    def path_for(self, key):
+        """
+        Resolve an object key to a path inside the storage root.
+        
+        Raises:
+            ValueError: If the key escapes the storage root
+        """
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root or path == self.root:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+    
+    def put(self, fileobj, key, content_type='application/octet-stream'):
+        """Copy a file object to disk, replacing any existing file atomically"""
+        try:
+            path = self.path_for(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            
+            fileobj.seek(0)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.upload-')
+            try:
+                with os.fdopen(fd, 'wb') as tmp_file:
+                    shutil.copyfileobj(fileobj, tmp_file)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except (OSError, ValueError) as e:
+            logger.error(f"Error writing {key} to local storage: {e}")
+            return False
+    
+    def get(self, key):
+        """Open a stored file for reading"""
+        try:
+            return open(self.path_for(key), 'rb')
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading {key} from local storage: {e}")
+            return None
+    
+    def delete(self, key):
+        """Delete a stored file"""
+        try:
+            os.remove(self.path_for(key))
+            return True
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError) as e:
+            logger.error(f"Error deleting {key} from local storage: {e}")
+            return False
+    
+    def exists(self, key):
+        """Check whether a file exists"""
+        try:
+            return os.path.isfile(self.path_for(key))
+        except ValueError:
+            return False
+    
+    def list(self, prefix):
+        """List stored files under a key prefix"""
+        directory = os.path.join(self.root, os.path.dirname(prefix))
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.startswith('.upload-'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                key = os.path.relpath(path, self.root).replace(os.sep, '/')
+                if key.startswith(prefix):
+                    yield key, datetime.utcfromtimestamp(os.path.getmtime(path))
+    
+    def create_upload(self, key, content_type, max_size, expires_in=3600):
+        """
+        Create a signed form upload handled by the media blueprint,
+        mirroring an S3 presigned POST. Requires an application context.
+        """
+        token = self._upload_serializer().dumps({
+            'key': key,
+            'content_type': content_type,
+            'max_size': max_size,
+            'expires_in': expires_in
+        })
+        return {
+            'url': url_for('media.upload_media'),
+            'fields': {
+                'key': key,
+                'Content-Type': content_type,
+                'token': token
+            }
+        }
+    
+    def verify_upload(self, token):
+        """
+        Verify a signed upload token and its expiry.
+        
+        Returns:
+            dict or None: Upload constraints if the token is valid
+        """
+        serializer = self._upload_serializer()
+        try:
+            upload = serializer.loads(token)
+            serializer.loads(token, max_age=upload.get('expires_in', 3600))
+        except BadSignature:
+            return None
+        return upload
+    
+    def _upload_serializer(self):
+        return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='local-storage-upload')
+    
+    def url(self, key):
+        """Get the URL the media blueprint serves the file from"""
+        return f"{self.url_prefix}/{key}"
@@ -0,0 +1,184 @@
+"""
+Amazon S3 (or S3-compatible) storage backend.
+"""
+import os
+import logging
+from datetime import timezone
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from .base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# S3 accepts at most this many keys per DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+# Shared client configuration: a larger connection pool so concurrent uploads
+# from one worker reuse keep-alive connections instead of queueing on 10.
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('AWS_S3_MAX_POOL_CONNECTIONS', 32)),
+    retries={'max_attempts': 3, 'mode': 'standard'},
+    tcp_keepalive=True
+)
+
+# Files above the threshold are sent as multipart uploads, read from the
+# file object chunk by chunk instead of being held in memory as one blob.
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=int(os.environ.get('AWS_S3_MULTIPART_THRESHOLD_MB', 8)) * MB,
+    multipart_chunksize=int(os.environ.get('AWS_S3_MULTIPART_CHUNKSIZE_MB', 8)) * MB,
+    max_concurrency=4,
+    use_threads=True
+)
+
+
+class _UnclosableFile:
+    """
+    File object proxy whose close() is a no-op.
+    
+    s3transfer closes the file object it uploads; callers that keep using
+    the stream afterwards (e.g. to optimize an original they just stored)
+    need it left open.
+    """
+    
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+    
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def close(self):
+        pass
+
+
+class S3StorageBackend(StorageBackend):
+    """Storage backend that keeps objects in an S3 bucket."""
+    
+    name = 's3'
+    
+    def __init__(self):
+        self.s3_client = boto3.client(
+            's3',
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            region_name=os.environ.get('AWS_REGION', 'eu-north-1'),
+            endpoint_url=os.environ.get('AWS_S3_ENDPOINT_URL'),
+            config=S3_CLIENT_CONFIG
+        )
+        self.bucket_name = os.environ.get('AWS_S3_BUCKET')
+        self.cloudfront_domain = os.environ.get('AWS_CLOUDFRONT_DOMAIN', '')
+    
+    def put(self, fileobj, key, content_type='application/octet-stream'):
+        """
+        Upload a buffer or file object to S3.
+        The object is streamed as-is (no intermediate bytes copy); large
+        files switch to multipart transfer automatically. The file object is
+        left open for the caller.
+        """
+        try:
+            fileobj.seek(0)
+            self.s3_client.upload_fileobj(
+                _UnclosableFile(fileobj),
+                self.bucket_name,
+                key,
+                ExtraArgs={
+                    'ContentType': content_type,
+                    'CacheControl': 'max-age=31536000'  # Cache for 1 year
+                },
+                Config=S3_TRANSFER_CONFIG
+            )
+            return True
+        except (ClientError, boto3.exceptions.S3UploadFailedError) as e:
+            logger.error(f"Error uploading to S3: {e}")
+            return False
+    
+    def get(self, key):
+        """Open an S3 object as a streaming body"""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            return response['Body']
+        except ClientError as e:
+            logger.error(f"Error reading {key} from S3: {e}")
+            return None
+    
+    def delete(self, key):
+        """Delete an object from S3"""
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            logger.error(f"Error deleting from S3: {e}")
+            return False
+    
+    def exists(self, key):
+        """Check whether an object exists in the bucket"""
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+                logger.error(f"Error checking {key} in S3: {e}")
+            return False
+    
+    def list(self, prefix):
+        """List objects under a key prefix, 1000 per ListObjectsV2 page"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield obj['Key'], obj['LastModified'].astimezone(timezone.utc).replace(tzinfo=None)
+    
+    def create_upload(self, key, content_type, max_size, expires_in=3600):
+        """Create a presigned POST restricted to one key, type and size range"""
+        return self.s3_client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=key,
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size]
+            ],
+            ExpiresIn=expires_in
+        )
+    
+    def delete_many(self, keys):
+        """
+        Delete objects with DeleteObjects, up to 1000 keys per request.
+        
+        Returns:
+            list: Keys that could not be deleted
+        """
+        failed = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': key} for key in batch],
+                        'Quiet': True
+                    }
+                )
+                for error in response.get('Errors', []):
+                    logger.error(f"Error deleting {error.get('Key')} from S3: {error.get('Code')} {error.get('Message')}")
+                    failed.append(error.get('Key'))
+            except ClientError as e:
+                logger.error(f"Error batch deleting from S3: {e}")
+                failed.extend(batch)
+        return failed
+    
+    def url(self, key):
+        """Get public URL for an object"""
+        if self.cloudfront_domain:
+            return f"https://{self.cloudfront_domain}/{key}"
+        else:
+            return f"https://{self.bucket_name}.s3.{os.environ.get('AWS_REGION', 'eu-central-1')}.amazonaws.com/{key}"
@@ -0,0 +1,131 @@
+"""
+Unit tests for the response cache.
+"""
+import pytest
+from flask import jsonify, request
+
+from utils.cache import DatabaseTagCache, LRUCache, cached_response, invalidate_cache
+
+
+@pytest.fixture
+def counted_view(app):
+    """Register a cached JSON view that counts how often it really runs."""
+    calls = []
+    
+    @app.route('/cached/<name>')
+    @cached_response('cached_view', 60, tags=('news',))
+    def cached_view(name):
+        calls.append(name)
+        return jsonify({'name': name, 'limit': request.args.get('limit'), 'calls': len(calls)})
+    
+    return calls
+
+
+@pytest.mark.unit
+class TestLRUCache:
+    """Test cases for LRUCache."""
+    
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        now = [0.0]
+        cache = LRUCache(clock=lambda: now[0])
+        cache.set('a', 1, ttl=10)
+        
+        assert cache.get('a') == 1
+        now[0] = 10
+        assert cache.get('a') is None
+    
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted."""
+        cache = LRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+    
+    def test_counters_survive_eviction(self):
+        """Test tag versions are not evicted by entries."""
+        cache = LRUCache(max_entries=1)
+        cache.incr('tag:news')
+        cache.set('a', 1)
+        cache.set('b', 2)
+        
+        assert cache.get('tag:news') == 1
+    
+    def test_database_tag_versions_are_shared(self, app):
+        """Test a tag bumped by one process is seen by another."""
+        web, worker = DatabaseTagCache(), DatabaseTagCache()
+        assert web.get('tag:news') is None
+        
+        worker.incr('tag:news')
+        worker.incr('tag:news')
+        web.set('a', 1)
+        
+        assert web.get_many(['tag:news', 'tag:history', 'a']) == [2, None, 1]
+
+
+@pytest.mark.unit
+class TestCachedResponse:
+    """Test cases for the cached_response decorator."""
+    
+    def test_hit_and_miss(self, client, counted_view):
+        """Test the second identical request is served from cache."""
+        first = client.get('/cached/a?limit=5')
+        second = client.get('/cached/a?limit=5')
+        
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.get_json() == first.get_json()
+        assert counted_view == ['a']
+    
+    def test_key_includes_arguments(self, client, counted_view):
+        """Test view and query arguments produce separate entries."""
+        client.get('/cached/a?limit=5')
+        client.get('/cached/a?limit=10')
+        client.get('/cached/b?limit=5')
+        
+        assert counted_view == ['a', 'a', 'b']
+    
+    def test_invalidation_by_tag(self, app, client, counted_view):
+        """Test invalidating a tag forces a fresh response."""
+        client.get('/cached/a')
+        with app.app_context():
+            invalidate_cache('news')
+        response = client.get('/cached/a')
+        
+        assert response.headers['X-Cache'] == 'MISS'
+        assert counted_view == ['a', 'a']
+    
+    def test_no_store_response_is_not_cached(self, app, client):
+        """Test a view can keep a response out of the cache."""
+        calls = []
+        
+        @app.route('/placeholder')
+        @cached_response('placeholder', 60)
+        def placeholder():
+            calls.append(1)
+            response = jsonify({'placeholder': True})
+            response.cache_control.no_store = True
+            return response
+        
+        client.get('/placeholder')
+        response = client.get('/placeholder')
+        
+        assert response.headers['X-Cache'] == 'MISS'
+        assert calls == [1, 1]
+    
+    def test_conditional_hit_returns_not_modified(self, client, counted_view):
+        """Test a matching If-None-Match is answered from the cached ETag."""
+        first = client.get('/cached/a')
+        etag = first.headers['ETag']
+        
+        second = client.get('/cached/a', headers={'If-None-Match': etag})
+        
+        assert second.status_code == 304
+        assert second.get_data() == b''
+        assert second.headers['ETag'] == etag
+        assert counted_view == ['a']
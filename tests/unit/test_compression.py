@@ -0,0 +1,79 @@
+"""
+Unit tests for response compression.
+"""
+import gzip
+
+import pytest
+from flask import Response, jsonify, request, stream_with_context
+
+from utils.compression import init_compression
+
+
+@pytest.fixture
+def compressed_views(app):
+    """Register views with large, small and streamed bodies."""
+    init_compression(app)
+    
+    @app.route('/compress/large')
+    def large_view():
+        return jsonify({'items': ['summit'] * 500})
+    
+    @app.route('/compress/small')
+    def small_view():
+        return jsonify({'ok': True})
+    
+    @app.route('/compress/stream')
+    def stream_view():
+        def generate():
+            for i in range(100):
+                yield f'<p>line {i}</p>\n'
+        return Response(stream_with_context(generate()), mimetype='text/html')
+    
+    @app.route('/compress/etag')
+    def etag_view():
+        response = jsonify({'items': ['ridge'] * 500})
+        response.set_etag('v1')
+        return response.make_conditional(request)
+
+
+@pytest.mark.unit
+class TestCompression:
+    """Test cases for gzip response compression."""
+    
+    def test_large_json_is_gzipped(self, client, compressed_views):
+        """Test responses above the threshold are compressed."""
+        response = client.get('/compress/large', headers={'Accept-Encoding': 'gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert b'summit' in gzip.decompress(response.get_data())
+    
+    def test_small_and_unaccepted_are_untouched(self, client, compressed_views):
+        """Test small bodies and clients without gzip get identity."""
+        small = client.get('/compress/small', headers={'Accept-Encoding': 'gzip'})
+        identity = client.get('/compress/large', headers={'Accept-Encoding': 'identity'})
+        
+        assert 'Content-Encoding' not in small.headers
+        assert 'Content-Encoding' not in identity.headers
+        assert identity.get_json()['items'][0] == 'summit'
+    
+    def test_streamed_response_is_compressed(self, client, compressed_views):
+        """Test streamed bodies are compressed without a Content-Length."""
+        response = client.get('/compress/stream', headers={'Accept-Encoding': 'gzip'})
+        body = gzip.decompress(response.get_data()).decode()
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert body.count('<p>') == 100
+    
+    def test_etag_suffix_round_trips(self, client, compressed_views):
+        """Test the encoded ETag still validates a conditional request."""
+        first = client.get('/compress/etag', headers={'Accept-Encoding': 'gzip'})
+        etag = first.headers['ETag']
+        second = client.get('/compress/etag', headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': etag
+        })
+        
+        assert etag == '"v1-gzip"'
+        assert second.status_code == 304
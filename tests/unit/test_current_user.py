@@ -0,0 +1,66 @@
+"""
+Unit tests for the request-scoped current-user loader.
+"""
+import pytest
+from flask import render_template_string, session
+from sqlalchemy import event
+
+from models import db
+from utils.current_user import get_current_user, load_user, init_current_user
+
+
+@pytest.mark.unit
+class TestCurrentUser:
+    """Test cases for get_current_user."""
+    
+    def test_loads_user_once_per_request(self, app, sample_user):
+        """Test the user row is fetched a single time per request."""
+        db.session.add(sample_user)
+        db.session.commit()
+        user_id = sample_user.id
+        db.session.expunge_all()
+        
+        statements = []
+        
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            with app.test_request_context():
+                session['user_id'] = user_id
+                
+                first = get_current_user()
+                second = get_current_user()
+                third = load_user(user_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        
+        assert first is second is third
+        assert first.email == 'test@example.com'
+        assert len(statements) == 1
+    
+    def test_anonymous_request(self, app):
+        """Test no user is loaded without a session."""
+        with app.test_request_context():
+            assert get_current_user() is None
+    
+    def test_template_access_and_duplicate_counter(self, app, client, sample_user):
+        """Test templates see current_user and duplicate loads are reported."""
+        app.config['DEBUG_IDENTITY_LOADS'] = True
+        init_current_user(app)
+        
+        @app.route('/whoami')
+        def whoami():
+            return render_template_string('{{ current_user.full_name }}')
+        
+        db.session.add(sample_user)
+        db.session.commit()
+        with client.session_transaction() as sess:
+            sess['user_id'] = sample_user.id
+        db.session.remove()
+        
+        response = client.get('/whoami')
+        
+        assert response.get_data(as_text=True) == 'Test User'
+        assert response.headers['X-Identity-Load-Duplicates'] == '0'
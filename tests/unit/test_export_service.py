@@ -0,0 +1,88 @@
+"""
+Unit tests for streaming exports.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from commands import register_commands
+from models import db, News, PlannedTrip, TripParticipant, User
+from services.export_service import ExportService
+
+
+@pytest.fixture
+def trip_with_participants(app, admin_user):
+    """A trip with three participants."""
+    db.session.add(admin_user)
+    db.session.commit()
+    trip = PlannedTrip(title='Triglav', trip_date=datetime(2026, 11, 1), organizer_id=admin_user.id)
+    db.session.add(trip)
+    db.session.commit()
+    for i in range(3):
+        user = User(email=f'member{i}@example.com', password_hash='x', first_name='Član', last_name=str(i))
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(TripParticipant(user_id=user.id, trip_id=trip.id, phone=f'04{i}', registered_at=datetime(2026, 10, 1, i)))
+    db.session.commit()
+    return trip
+
+
+@pytest.mark.unit
+class TestExportService:
+    """Test cases for ExportService."""
+    
+    def test_participants_csv(self, trip_with_participants):
+        """Test participants are exported with trip and user columns."""
+        chunks = list(ExportService.stream('participants', 'csv', batch_size=2))
+        rows = list(csv.DictReader(io.StringIO(''.join(chunks))))
+        
+        assert chunks[0].startswith('trip_id,trip_title,trip_date,user_id,first_name')
+        assert len(chunks) == 3  # header, 2 rows, 1 row
+        assert [row['last_name'] for row in rows] == ['0', '1', '2']
+        assert rows[0]['trip_title'] == 'Triglav'
+        assert rows[0]['first_name'] == 'Član'
+        assert rows[0]['trip_date'] == '2026-11-01T00:00:00'
+    
+    def test_csv_escapes_formulas(self, trip_with_participants):
+        """Test member text starting with a formula character is prefixed in CSV only, numbers are kept."""
+        first, second = TripParticipant.query.order_by(TripParticipant.registered_at).limit(2).all()
+        first.notes = '=HYPERLINK("http://evil.example")'
+        first.phone = '+386 40 123 456'
+        second.notes = '\t@SUM(A1)'
+        second.emergency_contact = '-5'
+        db.session.commit()
+        
+        rows = list(csv.DictReader(io.StringIO(''.join(ExportService.stream('participants', 'csv')))))
+        record = json.loads(''.join(ExportService.stream('participants', 'jsonl')).splitlines()[0])
+        
+        assert rows[0]['notes'] == '\'=HYPERLINK("http://evil.example")'
+        assert rows[0]['phone'] == '+386 40 123 456'
+        assert rows[1]['notes'] == "'\t@SUM(A1)"
+        assert rows[1]['emergency_contact'] == '-5'
+        assert record['notes'] == '=HYPERLINK("http://evil.example")'
+    
+    def test_news_jsonl(self, app, sample_news_article):
+        """Test JSON Lines rows carry column names and ISO dates."""
+        db.session.add(sample_news_article)
+        db.session.commit()
+        
+        lines = ''.join(ExportService.stream('news', 'jsonl')).splitlines()
+        record = json.loads(lines[0])
+        
+        assert len(lines) == 1
+        assert record['title'] == 'Test News Article'
+        assert record['created_at'] == sample_news_article.created_at.isoformat()
+    
+    def test_cli_export_to_file(self, app, runner, trip_with_participants, tmp_path):
+        """Test flask export writes the file for one trip."""
+        register_commands(app)
+        output = tmp_path / 'participants.csv'
+        
+        result = runner.invoke(args=['export', 'participants', '--trip-id', str(trip_with_participants.id),
+                                     '-o', str(output)])
+        
+        assert result.exit_code == 0
+        assert len(output.read_text(encoding='utf-8').splitlines()) == 4
@@ -0,0 +1,72 @@
+"""
+Unit tests for template fragment caching.
+"""
+import pytest
+from flask import render_template_string
+
+from models import db, Announcement
+from services.admin_service import AdminService
+from utils.fragment_cache import init_fragment_cache
+
+TEMPLATE = "{% cache 'fragment-' ~ name, 60, ['announcements'] %}{{ value }}{% endcache %}"
+
+
+@pytest.fixture
+def fragment_app(app):
+    """App with the {% cache %} tag enabled."""
+    init_fragment_cache(app)
+    return app
+
+
+@pytest.mark.unit
+class TestFragmentCache:
+    """Test cases for the {% cache %} template tag."""
+    
+    def test_fragment_is_reused(self, fragment_app):
+        """Test a cached block is not re-rendered."""
+        with fragment_app.test_request_context():
+            first = render_template_string(TEMPLATE, name='a', value='first')
+            second = render_template_string(TEMPLATE, name='a', value='second')
+            other = render_template_string(TEMPLATE, name='b', value='other')
+        
+        assert first == second == 'first'
+        assert other == 'other'
+    
+    def test_queries_inside_the_block_are_skipped_on_a_hit(self, fragment_app):
+        """Test a loader called inside the block only runs when the fragment is rendered."""
+        calls = []
+        html = "{% cache 'loaded', 60 %}{% set items = load_items() %}{{ items|length }}{% endcache %}"
+        
+        def load_items():
+            calls.append(1)
+            return ['a', 'b']
+        
+        with fragment_app.test_request_context():
+            first = render_template_string(html, load_items=load_items)
+            second = render_template_string(html, load_items=load_items)
+        
+        assert first == second == '2'
+        assert calls == [1]
+    
+    def test_cached_html_is_not_escaped_twice(self, fragment_app):
+        """Test markup survives a round trip through the cache."""
+        with fragment_app.test_request_context():
+            html = "{% cache 'markup', 60 %}<b>{{ value }}</b>{% endcache %}"
+            render_template_string(html, value='<x>')
+            cached = render_template_string(html, value='<x>')
+        
+        assert cached == '<b>&lt;x&gt;</b>'
+    
+    def test_announcement_write_invalidates(self, fragment_app, sample_user):
+        """Test creating an announcement drops cached announcement fragments."""
+        db.session.add(sample_user)
+        db.session.commit()
+        
+        with fragment_app.test_request_context():
+            render_template_string(TEMPLATE, name='a', value='stale')
+            success, _, _ = AdminService.create_announcement('Title', 'Content', author_id=sample_user.id)
+            fresh = render_template_string(TEMPLATE, name='a', value='fresh')
+        
+        assert success
+        assert Announcement.query.count() == 1
+        assert fresh == 'fresh'
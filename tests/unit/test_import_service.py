@@ -0,0 +1,74 @@
+"""
+Unit tests for the historical events bulk import.
+"""
+import io
+import json
+
+import pytest
+
+from commands import register_commands
+from models import HistoricalEvent
+from services.import_service import ImportService, iter_json_records
+
+
+def make_event(title, **fields):
+    return dict({
+        'date': '05-29',
+        'year': 1953,
+        'title': title,
+        'description': 'Vzpon',
+        'category': 'first_ascent'
+    }, **fields)
+
+
+@pytest.mark.unit
+class TestImportService:
+    """Test cases for ImportService."""
+    
+    def test_streams_json_array_and_lines(self):
+        """Test both file formats decode record by record."""
+        events = [make_event(f'Event {i}', description='x' * 50) for i in range(5)]
+        array_records = list(iter_json_records(io.StringIO(json.dumps(events, indent=2)), buffer_size=16))
+        lines_records = list(iter_json_records(io.StringIO('\n'.join(map(json.dumps, events)) + '\n')))
+        
+        assert [value for _, value in array_records] == events
+        assert [value for _, value in lines_records] == events
+    
+    def test_validation(self):
+        """Test malformed events are rejected with a reason."""
+        assert ImportService.validate_historical_event(make_event('Everest'))[1] is None
+        assert 'date' in ImportService.validate_historical_event(make_event('Everest', date='02-30'))[1]
+        assert 'year' in ImportService.validate_historical_event(make_event('Everest', year='1953'))[1]
+        assert 'category' in ImportService.validate_historical_event(make_event('Everest', category='x'))[1]
+        assert 'description' in ImportService.validate_historical_event(make_event('Everest', description=''))[1]
+    
+    def test_upsert_counts(self, app):
+        """Test new events are inserted, changed ones updated and the rest skipped."""
+        first = [(1, make_event('Everest')), (2, make_event('K2', date='07-31', year=1954))]
+        success, _, stats = ImportService.import_historical_events(first, chunk_size=1)
+        assert success and stats['inserted'] == 2
+        
+        second = [
+            (1, make_event('Everest', description='Hillary in Norgay')),
+            (2, make_event('K2', date='07-31', year=1954)),
+            (3, make_event('Matterhorn', date='07-14', year=1865)),
+            (4, {'title': 'Broken'})
+        ]
+        success, _, stats = ImportService.import_historical_events(second)
+        
+        assert (stats['inserted'], stats['updated'], stats['skipped']) == (1, 1, 2)
+        assert len(stats['errors']) == 1
+        assert HistoricalEvent.query.count() == 3
+        assert HistoricalEvent.query.filter_by(title='Everest').one().description == 'Hillary in Norgay'
+    
+    def test_cli_command(self, app, runner, tmp_path):
+        """Test flask history import reports counts."""
+        register_commands(app)
+        path = tmp_path / 'events.jsonl'
+        path.write_text('\n'.join(json.dumps(make_event(f'Event {i}')) for i in range(3)))
+        
+        result = runner.invoke(args=['history', 'import', str(path), '--chunk-size', '2'])
+        
+        assert result.exit_code == 0
+        assert '3 inserted, 0 updated, 0 skipped' in result.output
+        assert HistoricalEvent.query.count() == 3
@@ -0,0 +1,59 @@
+"""
+Unit tests for request instrumentation.
+"""
+import pytest
+from flask import render_template_string
+
+from models import db, User
+from utils.instrumentation import EndpointStats, endpoint_stats, init_instrumentation
+
+
+@pytest.fixture
+def instrumented_app(app):
+    """App with instrumentation enabled and a view that queries and renders."""
+    app.config['INSTRUMENTATION_ENABLED'] = True
+    init_instrumentation(app)
+    endpoint_stats.reset()
+    
+    @app.route('/instrumented')
+    def instrumented_view():
+        User.query.count()
+        db.session.execute(db.select(User)).all()
+        return render_template_string('{{ users }} users', users=0)
+    
+    return app
+
+
+@pytest.mark.unit
+class TestInstrumentation:
+    """Test cases for per-request timing."""
+    
+    def test_server_timing_header(self, instrumented_app):
+        """Test the response reports app, SQL and template timings."""
+        response = instrumented_app.test_client().get('/instrumented')
+        header = response.headers['Server-Timing']
+        
+        assert 'app;dur=' in header
+        assert 'desc="2 queries"' in header
+        assert 'tpl;dur=' in header
+    
+    def test_endpoint_histogram(self, instrumented_app):
+        """Test requests are aggregated per endpoint."""
+        client = instrumented_app.test_client()
+        client.get('/instrumented')
+        client.get('/instrumented')
+        
+        summary = endpoint_stats.snapshot()[0]
+        assert summary['endpoint'] == 'instrumented_view'
+        assert summary['count'] == 2
+        assert summary['avg_sql_count'] == 2
+        assert sum(summary['buckets'].values()) == 2
+    
+    def test_percentile_uses_bucket_bounds(self):
+        """Test p95 is the upper bound of the matching bucket."""
+        stats = EndpointStats()
+        for _ in range(19):
+            stats.record('view', 3, 0, 0, 0)
+        stats.record('view', 300, 0, 0, 0)
+        
+        assert stats.snapshot()[0]['p95_ms'] == 5
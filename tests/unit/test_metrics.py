@@ -0,0 +1,129 @@
+"""
+Unit tests for Prometheus metrics.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from utils.metrics import MetricsRegistry, init_metrics, metrics
+
+
+def write_worker_file(directory, pid, snapshot):
+    with open(os.path.join(directory, f'metrics-{pid}.json'), 'w') as f:
+        json.dump(snapshot, f)
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+    
+    def test_render_counter_and_histogram(self):
+        """Test the text exposition format."""
+        registry = MetricsRegistry()
+        registry.inc('news_curation_runs_total', result='success')
+        registry.observe('ai_request_duration_seconds', 0.3, model='deepseek-chat')
+        text = registry.render()
+        
+        assert '# TYPE news_curation_runs_total counter' in text
+        assert 'news_curation_runs_total{result="success"} 1' in text
+        assert 'ai_request_duration_seconds_bucket{model="deepseek-chat",le="0.25"} 0' in text
+        assert 'ai_request_duration_seconds_bucket{model="deepseek-chat",le="0.5"} 1' in text
+        assert 'ai_request_duration_seconds_bucket{model="deepseek-chat",le="+Inf"} 1' in text
+        assert 'ai_request_duration_seconds_count{model="deepseek-chat"} 1' in text
+    
+    def test_merges_worker_files(self, tmp_path):
+        """Test counters are summed across workers and dead workers' gauges dropped."""
+        registry = MetricsRegistry(directory=str(tmp_path))
+        registry.inc('news_curation_runs_total', result='success')
+        registry.set('db_pool_checked_out', 1)
+        
+        other = MetricsRegistry()
+        other.inc('news_curation_runs_total', 2, result='success')
+        other.set('db_pool_checked_out', 3)
+        write_worker_file(str(tmp_path), os.getppid(), other.snapshot())
+        write_worker_file(str(tmp_path), 2 ** 22 + 1, other.snapshot())
+        
+        merged = registry.collect()
+        
+        assert merged['news_curation_runs_total'][(('result', 'success'),)] == 5
+        assert merged['db_pool_checked_out'][()] == 4
+    
+    def test_dead_workers_are_archived(self, tmp_path):
+        """Test dead workers' counters survive the removal of their files, gauges do not."""
+        registry = MetricsRegistry(directory=str(tmp_path))
+        dead = MetricsRegistry()
+        dead.inc('news_curation_runs_total', 2, result='success')
+        dead.observe('ai_request_duration_seconds', 0.3, model='deepseek-chat')
+        dead.set('db_pool_checked_out', 3)
+        for pid in (2 ** 22 + 1, 2 ** 22 + 2):
+            write_worker_file(str(tmp_path), pid, dead.snapshot())
+        
+        registry.remove_dead_workers()
+        write_worker_file(str(tmp_path), 2 ** 22 + 3, dead.snapshot())
+        registry.remove_dead_workers()
+        merged = registry.collect()
+        
+        assert sorted(os.listdir(tmp_path)) == ['archive.lock', 'metrics-archived.json']
+        assert merged['news_curation_runs_total'][(('result', 'success'),)] == 6
+        assert merged['ai_request_duration_seconds'][(('model', 'deepseek-chat'),)]['count'] == 3
+        assert merged['db_pool_checked_out'] == {}
+    
+    def test_flush_writes_worker_file(self, tmp_path):
+        """Test a worker's values are written to its own file."""
+        registry = MetricsRegistry(directory=str(tmp_path), flush_interval=0)
+        registry.inc('news_articles_total', 3, stage='stored')
+        
+        with open(tmp_path / f'metrics-{os.getpid()}.json') as f:
+            snapshot = json.load(f)
+        assert snapshot['news_articles_total'] == [[[['stage', 'stored']], 3]]
+    
+    def test_idle_writes_are_flushed_in_background(self, tmp_path):
+        """Test values recorded just after a flush are written without further writes."""
+        registry = MetricsRegistry(directory=str(tmp_path), flush_interval=0.2)
+        registry.inc('news_articles_total', 1, stage='stored')
+        registry.inc('news_articles_total', 1, stage='stored')
+        
+        time.sleep(0.6)
+        
+        with open(tmp_path / f'metrics-{os.getpid()}.json') as f:
+            snapshot = json.load(f)
+        assert snapshot['news_articles_total'] == [[[['stage', 'stored']], 2]]
+
+
+@pytest.mark.unit
+class TestRequestMetrics:
+    """Test cases for request metrics."""
+    
+    def test_requests_are_counted(self, app):
+        """Test request count and latency are recorded per endpoint."""
+        app.config['METRICS_DIR'] = ''
+        init_metrics(app)
+        
+        @app.route('/measured')
+        def measured():
+            return 'ok'
+        
+        app.test_client().get('/measured')
+        text = metrics.render()
+        
+        assert 'http_requests_total{blueprint="app",endpoint="measured",method="GET",status="200"}' in text
+        assert 'http_request_duration_seconds_count{blueprint="app",endpoint="measured"}' in text
+    
+    def test_endpoint_requires_token_or_localhost(self, app):
+        """Test /metrics is closed to remote clients unless they send METRICS_TOKEN."""
+        from routes.main import main_bp
+        app.register_blueprint(main_bp)
+        app.config['METRICS_DIR'] = ''
+        init_metrics(app)
+        client = app.test_client()
+        remote = {'REMOTE_ADDR': '203.0.113.7'}
+        
+        assert client.get('/metrics').status_code == 200
+        assert client.get('/metrics', environ_base=remote).status_code == 403
+        
+        app.config['METRICS_TOKEN'] = 'secret'
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', environ_base=remote,
+                          headers={'Authorization': 'Bearer secret'}).status_code == 200
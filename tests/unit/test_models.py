@@ -2,10 +2,11 @@
 Unit tests for database models.
 """
 import pytest
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from werkzeug.security import generate_password_hash
 
 from models import db, User, Announcement, TripReport, PlannedTrip, TripParticipant, News, HistoricalEvent, Comment
+from services.trip_service import TripService
 
 
 @pytest.mark.unit
@@ -182,7 +183,7 @@ class TestPlannedTrip:
                 title='Test Trip',
                 description='Test description',
                 location='Test Location',
-                trip_date=datetime.utcnow(),
+                trip_date=datetime.utcnow() + timedelta(days=7),
                 max_participants=2,
                 organizer_id=admin_user.id
             )
@@ -194,27 +195,18 @@ class TestPlannedTrip:
             assert planned_trip.is_full is False
             assert planned_trip.organizer_name == 'Admin User'
             
-            # Add participant
-            participant = TripParticipant(
-                user_id=sample_user.id,
-                trip_id=planned_trip.id
-            )
-            db.session.add(participant)
-            db.session.commit()
+            # Add participant (the service maintains the counter)
+            TripService.register_for_trip(planned_trip.id, user_id=sample_user.id)
             
             assert planned_trip.participant_count == 1
             assert planned_trip.is_full is False
             
             # Add second participant to fill trip
-            participant2 = TripParticipant(
-                user_id=admin_user.id,
-                trip_id=planned_trip.id
-            )
-            db.session.add(participant2)
-            db.session.commit()
+            TripService.register_for_trip(planned_trip.id, user_id=admin_user.id)
             
             assert planned_trip.participant_count == 2
             assert planned_trip.is_full is True
+            assert planned_trip.status == 'full'
 
 
 @pytest.mark.unit
@@ -0,0 +1,143 @@
+"""
+Unit tests for incremental news refresh and retention cleanup.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_services.config import NEWS_SOURCES
+from ai_services.news_curator import NewsCurator
+from models import db, News, NewsFeedState
+
+
+RSS_ITEM = """
+<item>
+  <title>{title}</title>
+  <link>https://example.com/{guid}</link>
+  <guid>{guid}</guid>
+  <description>Mountain news</description>
+  <pubDate>{date}</pubDate>
+</item>"""
+
+
+def write_feed(path, items):
+    """Write an RSS file with (guid, day) items, newest first."""
+    body = ''.join(
+        RSS_ITEM.format(title=f'Article {guid}', guid=guid, date=f'{day:02d} Oct 2026 08:00:00 GMT')
+        for guid, day in items
+    )
+    path.write_text(f'<?xml version="1.0"?><rss version="2.0"><channel><title>Test</title>{body}</channel></rss>')
+    return str(path)
+
+
+@pytest.fixture
+def curator(app):
+    return NewsCurator(db, News, FeedState=NewsFeedState)
+
+
+@pytest.mark.unit
+class TestNewsRefresh:
+    """Test cases for incremental feed refresh."""
+    
+    def test_feeds_spread_across_the_hour(self, curator):
+        """Test every feed is due once per hour and safety feeds every 15 minutes."""
+        due_counts = {}
+        for minute in range(0, 60, 5):
+            for feed_url in curator.feeds_due(datetime(2026, 10, 19, 7, minute), 5):
+                due_counts[feed_url] = due_counts.get(feed_url, 0) + 1
+        
+        safety_feeds = set(NEWS_SOURCES['safety'])
+        assert set(due_counts) == set(curator.all_feeds())
+        assert all(count == (4 if url in safety_feeds else 1) for url, count in due_counts.items())
+    
+    def test_only_new_entries_are_processed(self, curator, tmp_path):
+        """Test a second run skips entries seen in the first one."""
+        feed_path = tmp_path / 'feed.xml'
+        write_feed(feed_path, [('a-2', 2), ('a-1', 1)])
+        
+        first = curator.fetch_and_process_feeds([str(feed_path)], incremental=True)
+        write_feed(feed_path, [('a-3', 3), ('a-2', 2), ('a-1', 1)])
+        second = curator.fetch_and_process_feeds([str(feed_path)], incremental=True)
+        
+        state = NewsFeedState.query.filter_by(feed_url=str(feed_path)).one()
+        assert first['articles_stored'] == 2
+        assert second['articles_found'] == 1
+        assert second['articles_stored'] == 1
+        assert state.last_guid == 'a-3'
+        assert state.last_published_at == datetime(2026, 10, 3, 8, 0)
+        assert News.query.count() == 3
+    
+    def test_entries_over_the_source_limit_come_in_next_run(self, curator, tmp_path):
+        """Test entries skipped by the per-source limit are not marked as seen."""
+        feed_path = write_feed(tmp_path / 'feed.xml', [('c-3', 3), ('c-2', 2), ('c-1', 1)])
+        
+        first = curator.fetch_and_process_feeds([feed_path], incremental=True)
+        state = NewsFeedState.query.filter_by(feed_url=feed_path).one()
+        assert first['articles_stored'] == 2
+        assert (state.last_guid, state.etag) == ('c-2', None)
+        
+        second = curator.fetch_and_process_feeds([feed_path], incremental=True)
+        assert second['articles_stored'] == 1
+        assert state.last_guid == 'c-3'
+        assert News.query.count() == 3
+    
+    def test_failed_entries_are_retried(self, curator, tmp_path, monkeypatch):
+        """Test the saved position stops before an entry that failed to process."""
+        feed_path = write_feed(tmp_path / 'feed.xml', [('d-2', 2), ('d-1', 1)])
+        process_article = curator._process_article
+        monkeypatch.setattr(curator, '_process_article',
+                            lambda entry, feed_url: None if entry.get('id') == 'd-2' else process_article(entry, feed_url))
+        
+        curator.fetch_and_process_feeds([feed_path], incremental=True)
+        state = NewsFeedState.query.filter_by(feed_url=feed_path).one()
+        assert state.last_guid == 'd-1'
+        
+        monkeypatch.setattr(curator, '_process_article', process_article)
+        assert curator.fetch_and_process_feeds([feed_path], incremental=True)['articles_stored'] == 1
+        assert state.last_guid == 'd-2'
+    
+    def test_fetch_does_not_clean_up(self, curator, tmp_path):
+        """Test cleanup is left to its own job."""
+        db.session.add(News(title='Old', original_url='https://example.com/old', created_at=datetime(2020, 1, 1)))
+        db.session.commit()
+        
+        curator.fetch_and_process_feeds([write_feed(tmp_path / 'feed.xml', [('b-1', 1)])], incremental=True)
+        assert News.query.count() == 2
+        
+        assert curator.cleanup_old_articles()['deleted'] == 1
+        assert News.query.count() == 1
+
+
+@pytest.mark.unit
+class TestNewsCleanup:
+    """Test cases for retention cleanup."""
+    
+    def add_articles(self, category, age_days, count):
+        created_at = datetime.utcnow() - timedelta(days=age_days)
+        db.session.add_all([
+            News(title=f'{category} {i}', category=category, created_at=created_at) for i in range(count)
+        ])
+        db.session.commit()
+    
+    def test_retention_per_category(self, curator):
+        """Test category overrides apply and other categories keep the default."""
+        self.add_articles('safety', 20, 2)
+        self.add_articles('achievement', 40, 1)
+        self.add_articles('general', 40, 3)
+        self.add_articles(None, 40, 1)
+        self.add_articles('general', 5, 1)
+        
+        stats = curator.cleanup_old_articles(retention_days=30, retention_by_category={'safety': 14, 'achievement': 90})
+        
+        assert stats['deleted'] == 6
+        assert stats['by_category'] == {'safety': 2, 'default': 4}
+        assert sorted(article.category for article in News.query.all()) == ['achievement', 'general']
+    
+    def test_deletes_in_chunks(self, curator):
+        """Test more rows than the chunk size are all deleted."""
+        self.add_articles('general', 40, 7)
+        
+        stats = curator.cleanup_old_articles(retention_days=30, retention_by_category={}, chunk_size=3)
+        
+        assert stats['deleted'] == 7
+        assert News.query.count() == 0
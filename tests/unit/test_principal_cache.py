@@ -0,0 +1,91 @@
+"""
+Unit tests for the admin authorization principal cache.
+"""
+import pytest
+from flask import jsonify
+from sqlalchemy import event
+
+from models import db
+from services.admin_service import AdminService
+from utils.decorators import admin_required
+from utils.principal_cache import PrincipalCache, principal_cache
+
+
+@pytest.fixture
+def admin_client(app, client, admin_user):
+    """Client logged in as an admin, with an admin-only JSON view registered."""
+    @app.route('/api/admin-only')
+    @admin_required
+    def api_admin_only():
+        return jsonify({'ok': True})
+    
+    db.session.add(admin_user)
+    db.session.commit()
+    principal_cache.invalidate()
+    
+    with client.session_transaction() as sess:
+        sess['user_id'] = admin_user.id
+        sess['is_admin'] = True
+    return client
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SQL statements executed on the engine."""
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', count)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', count)
+
+
+@pytest.mark.unit
+class TestPrincipalCache:
+    """Test cases for PrincipalCache."""
+    
+    def test_entries_expire_after_ttl(self):
+        """Test cached principals expire."""
+        now = [100.0]
+        cache = PrincipalCache(ttl=5, clock=lambda: now[0])
+        cache.set(1, {'id': 1, 'is_admin': True})
+        
+        assert cache.get(1)['is_admin'] is True
+        now[0] += 5
+        assert cache.get(1) is None
+    
+    def test_invalidate(self):
+        """Test explicit invalidation."""
+        cache = PrincipalCache(ttl=60)
+        cache.set(1, {'id': 1})
+        cache.set(2, {'id': 2})
+        
+        cache.invalidate(1)
+        assert cache.get(1) is None
+        assert cache.get(2) is not None
+        
+        cache.invalidate()
+        assert cache.get(2) is None
+    
+    def test_admin_required_uses_cache(self, admin_client, query_counter):
+        """Test repeated admin requests run no user queries."""
+        assert admin_client.get('/api/admin-only').status_code == 200
+        first_request_queries = len(query_counter)
+        
+        assert admin_client.get('/api/admin-only').status_code == 200
+        assert admin_client.get('/api/admin-only').status_code == 200
+        
+        assert first_request_queries == 1
+        assert len(query_counter) == first_request_queries
+    
+    def test_revocation_invalidates_cache(self, app, admin_client, admin_user):
+        """Test removing admin rights takes effect immediately in this process."""
+        assert admin_client.get('/api/admin-only').status_code == 200
+        
+        with app.test_request_context():
+            success, _ = AdminService.toggle_admin_status(admin_user.id, admin_id=admin_user.id)
+        assert success is True
+        
+        assert admin_client.get('/api/admin-only').status_code == 403
@@ -0,0 +1,194 @@
+"""
+Unit tests for the cron parser and the database-backed scheduler.
+"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from jobs.cron import CronSchedule
+from jobs import scheduler as scheduler_module
+from jobs.scheduler import JobDefinition, Scheduler, init_scheduler
+from models import db, JobRun, ScheduledJob
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(datetime(2026, 10, 19, 5, 0))
+
+
+@pytest.fixture
+def job_definitions(monkeypatch):
+    """Replace the registered jobs with an empty registry."""
+    definitions = {}
+    monkeypatch.setattr(scheduler_module, 'JOB_DEFINITIONS', definitions)
+    return definitions
+
+
+@pytest.fixture
+def test_job(job_definitions):
+    """Register a job that records its calls (hourly, 10 minute grace)."""
+    calls = []
+    job_definitions['test_job'] = JobDefinition(
+        'test_job', lambda: calls.append(1), '0 * * * *', misfire_grace_seconds=600
+    )
+    return calls
+
+
+def make_scheduler(app, clock, owner='worker-1'):
+    return Scheduler(app, owner=owner, lock_ttl=90, timezone_name='UTC', clock=clock)
+
+
+@pytest.mark.unit
+class TestCronSchedule:
+    """Test cases for CronSchedule."""
+    
+    def test_steps_and_ranges(self):
+        """Test step and range fields."""
+        schedule = CronSchedule('*/15 8-9 * * *')
+        
+        assert schedule.next_local(datetime(2026, 1, 1, 8, 14)) == datetime(2026, 1, 1, 8, 15)
+        assert schedule.next_local(datetime(2026, 1, 1, 9, 45)) == datetime(2026, 1, 2, 8, 0)
+    
+    def test_weekday(self):
+        """Test weekday fields (0 = Sunday)."""
+        assert CronSchedule('30 3 * * 0').next_local(datetime(2026, 10, 19)) == datetime(2026, 10, 25, 3, 30)
+    
+    def test_time_zone_conversion(self):
+        """Test local schedules are returned in UTC."""
+        from zoneinfo import ZoneInfo
+        next_run = CronSchedule('0 6 * * *').next_after(datetime(2026, 10, 19, 5, 0), ZoneInfo('Europe/Ljubljana'))
+        
+        assert next_run == datetime(2026, 10, 20, 4, 0)
+    
+    def test_invalid_expression(self):
+        """Test malformed expressions are rejected."""
+        with pytest.raises(ValueError):
+            CronSchedule('61 * * * *')
+        with pytest.raises(ValueError):
+            CronSchedule('* * *')
+
+
+@pytest.mark.unit
+class TestScheduler:
+    """Test cases for Scheduler."""
+    
+    def test_only_one_leader(self, app, clock):
+        """Test the lease is exclusive until it expires."""
+        first = make_scheduler(app, clock, 'worker-1')
+        second = make_scheduler(app, clock, 'worker-2')
+        
+        assert first.acquire_leadership()
+        assert not second.acquire_leadership()
+        assert first.acquire_leadership()
+        
+        clock.now += timedelta(seconds=91)
+        assert second.acquire_leadership()
+        assert not first.acquire_leadership()
+    
+    def test_takeover_fails_interrupted_runs(self, app, clock):
+        """Test a new leader closes runs the expired leader left running."""
+        first = make_scheduler(app, clock, 'worker-1')
+        second = make_scheduler(app, clock, 'worker-2')
+        assert first.acquire_leadership()
+        db.session.add(JobRun(job_name='test_job', started_at=clock.now, status='running'))
+        db.session.commit()
+        
+        assert first.acquire_leadership()
+        assert JobRun.query.one().status == 'running'
+        
+        clock.now += timedelta(seconds=91)
+        assert second.acquire_leadership()
+        
+        run = JobRun.query.one()
+        assert run.status == 'error'
+        assert 'worker-1' in run.error
+    
+    def test_lease_is_renewed_while_a_job_runs(self, app, clock, job_definitions):
+        """Test a job that outlives the lease keeps it, so no second leader takes over."""
+        def long_job():
+            clock.now += timedelta(seconds=200)
+            time.sleep(0.2)
+        job_definitions['long_job'] = JobDefinition('long_job', long_job, '0 * * * *')
+        scheduler = make_scheduler(app, clock, 'worker-1')
+        scheduler.heartbeat_interval = 0.01
+        assert scheduler.acquire_leadership()
+        scheduler.sync_jobs()
+        
+        clock.now = datetime(2026, 10, 19, 6, 0)
+        scheduler.run_pending()
+        
+        assert JobRun.query.filter_by(job_name='long_job').one().status == 'success'
+        assert not make_scheduler(app, clock, 'worker-2').acquire_leadership()
+    
+    def test_init_does_not_start_loop(self, app):
+        """Test creating the app (e.g. for a CLI command) starts no scheduler thread."""
+        app.testing = False
+        app.config['SCHEDULER_ENABLED'] = True
+        
+        scheduler = init_scheduler(app)
+        
+        assert scheduler._thread is None
+    
+    def test_due_job_runs_once_and_is_recorded(self, app, clock, test_job):
+        """Test a due job runs, is rescheduled and leaves a run record."""
+        scheduler = make_scheduler(app, clock)
+        scheduler.sync_jobs()
+        job = ScheduledJob.query.filter_by(name='test_job').first()
+        assert job.next_run_at == datetime(2026, 10, 19, 6, 0)
+        
+        clock.now = datetime(2026, 10, 19, 6, 1)
+        assert scheduler.run_pending() == 1
+        assert scheduler.run_pending() == 0
+        
+        run = JobRun.query.filter_by(job_name='test_job').one()
+        assert test_job == [1]
+        assert run.status == 'success'
+        assert run.duration_ms is not None
+        assert job.next_run_at == datetime(2026, 10, 19, 7, 0)
+    
+    def test_sync_removes_undefined_jobs(self, app, clock, test_job):
+        """Test rows of jobs removed from the code are deleted on sync."""
+        db.session.add(ScheduledJob(name='news_update', schedule='0 6 * * *'))
+        db.session.commit()
+        
+        make_scheduler(app, clock).sync_jobs()
+        
+        assert [job.name for job in ScheduledJob.query.all()] == ['test_job']
+    
+    def test_misfires_are_skipped_and_coalesced(self, app, clock, test_job):
+        """Test late runs beyond the grace period are recorded once as missed."""
+        scheduler = make_scheduler(app, clock)
+        scheduler.sync_jobs()
+        
+        clock.now = datetime(2026, 10, 19, 6, 30)
+        scheduler.run_pending()
+        clock.now = datetime(2026, 10, 19, 8, 30)
+        scheduler.run_pending()
+        
+        runs = JobRun.query.filter_by(job_name='test_job').all()
+        assert test_job == []
+        assert [run.status for run in runs] == ['missed']
+    
+    def test_failed_job_is_recorded(self, app, clock, job_definitions):
+        """Test exceptions are stored on the run."""
+        def fail():
+            raise RuntimeError('feed down')
+        job_definitions['failing_job'] = JobDefinition('failing_job', fail, '0 * * * *')
+        scheduler = make_scheduler(app, clock)
+        scheduler.sync_jobs()
+        
+        clock.now = datetime(2026, 10, 19, 6, 0)
+        scheduler.run_pending()
+        
+        run = JobRun.query.filter_by(job_name='failing_job').one()
+        assert run.status == 'error'
+        assert 'feed down' in run.error
@@ -0,0 +1,80 @@
+"""
+Unit tests for the slow query log.
+"""
+import pytest
+
+from models import db, HistoricalEvent
+from utils.instrumentation import install_sql_hooks, query_listeners
+from utils.slow_query_log import SlowQueryLog, explain_statement, redact_parameters
+
+
+@pytest.fixture
+def query_log(app):
+    """A slow query log that records every statement, with EXPLAIN."""
+    install_sql_hooks()
+    log = SlowQueryLog(threshold_ms=1e-9, size=5, explain=True)
+    query_listeners.append(log)
+    yield log
+    query_listeners.remove(log)
+
+
+@pytest.mark.unit
+class TestSlowQueryLog:
+    """Test cases for SlowQueryLog."""
+    
+    def test_records_redacted_statement_and_plan(self, query_log):
+        """Test a LIKE search is logged with types only and flagged as a scan."""
+        HistoricalEvent.query.filter(HistoricalEvent.title.like('%Everest%')).all()
+        
+        entry = query_log.entries()[0]
+        assert 'historical_event' in entry['sql']
+        assert 'Everest' not in str(entry['params'])
+        assert entry['endpoint'] == 'background'
+        assert entry['plan']
+        assert entry['full_scan']
+    
+    def test_ring_buffer_keeps_last_entries(self, query_log):
+        """Test only the newest entries are kept."""
+        for _ in range(10):
+            db.session.execute(db.text('SELECT 1'))
+        
+        assert len(query_log.entries()) == 5
+    
+    def test_below_threshold_is_ignored(self, query_log):
+        """Test fast statements are not recorded."""
+        query_log.configure(threshold_ms=10_000, size=5, explain=False)
+        db.session.execute(db.text('SELECT 1'))
+        
+        assert query_log.entries() == []
+    
+    def test_failed_explain_is_rolled_back_to_savepoint(self):
+        """Test a failing Postgres EXPLAIN leaves the request's transaction usable."""
+        executed = []
+        
+        class FakeCursor:
+            def execute(self, sql, parameters=None):
+                executed.append(sql.split(' ')[0] if sql.startswith('EXPLAIN') else sql)
+                if sql.startswith('EXPLAIN'):
+                    raise RuntimeError('cannot explain')
+            
+            def close(self):
+                pass
+        
+        class FakeContext:
+            class dialect:
+                name = 'postgresql'
+            
+            class root_connection:
+                class connection:
+                    cursor = FakeCursor
+        
+        assert explain_statement(FakeContext, 'SELECT 1', ()) is None
+        assert executed == [
+            'SAVEPOINT slow_query_explain', 'EXPLAIN', 'ROLLBACK TO SAVEPOINT slow_query_explain'
+        ]
+    
+    def test_redact_parameters(self):
+        """Test values are replaced by type names."""
+        assert redact_parameters(('secret', 3)) == ['str', 'int']
+        assert redact_parameters({'email': 'a@b.c'}) == {'email': 'str'}
+        assert redact_parameters([(1,), (2,)]) == '2 parameter sets'
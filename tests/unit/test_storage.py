@@ -0,0 +1,287 @@
+"""
+Unit tests for storage backends and the image handler pipeline.
+"""
+import io
+from datetime import datetime, timedelta
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+from PIL import Image
+
+from storage import get_storage_backend
+from storage.local import LocalStorageBackend
+from storage.s3 import S3StorageBackend
+from image_handler import ImageHandler
+
+
+def make_jpeg(width=1600, height=1200):
+    """Create an in-memory JPEG image."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (120, 140, 160)).save(buffer, format='JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.unit
+class TestLocalStorageBackend:
+    """Test cases for LocalStorageBackend."""
+    
+    def test_put_get_delete(self, tmp_path):
+        """Test storing, reading and deleting a file."""
+        storage = LocalStorageBackend(root=str(tmp_path))
+        
+        assert storage.put(io.BytesIO(b'hello'), 'a/b/file.txt', 'text/plain') is True
+        
+        stored = storage.get('a/b/file.txt')
+        assert stored.read() == b'hello'
+        stored.close()
+        
+        assert storage.delete('a/b/file.txt') is True
+        assert storage.get('a/b/file.txt') is None
+        # Deleting a missing file is not an error
+        assert storage.delete('a/b/file.txt') is True
+    
+    def test_url(self, tmp_path):
+        """Test public URL generation."""
+        storage = LocalStorageBackend(root=str(tmp_path), url_prefix='/media/')
+        assert storage.url('x/y.jpg') == '/media/x/y.jpg'
+    
+    def test_media_served_at_configured_url(self, app, monkeypatch, tmp_path):
+        """Test the media blueprint is mounted where LOCAL_STORAGE_URL points."""
+        from routes.media import media_bp, media_url_prefix
+        monkeypatch.setenv('STORAGE_BACKEND', 'local')
+        monkeypatch.setenv('LOCAL_STORAGE_PATH', str(tmp_path))
+        monkeypatch.setenv('LOCAL_STORAGE_URL', 'https://cdn.example.com/files/')
+        app.register_blueprint(media_bp, url_prefix=media_url_prefix())
+        storage = LocalStorageBackend()
+        storage.put(io.BytesIO(b'data'), 'x/y.txt')
+        
+        assert storage.url('x/y.txt') == 'https://cdn.example.com/files/x/y.txt'
+        assert app.test_client().get('/files/x/y.txt').data == b'data'
+    
+    def test_rejects_keys_outside_root(self, tmp_path):
+        """Test path traversal keys are refused."""
+        storage = LocalStorageBackend(root=str(tmp_path / 'root'))
+        
+        assert storage.put(io.BytesIO(b'x'), '../escape.txt') is False
+        assert not (tmp_path / 'escape.txt').exists()
+    
+    def test_delete_many(self, tmp_path):
+        """Test deleting several files at once."""
+        storage = LocalStorageBackend(root=str(tmp_path))
+        keys = [f'files/{i}.txt' for i in range(3)]
+        for key in keys:
+            storage.put(io.BytesIO(b'data'), key)
+        
+        assert storage.delete_many(keys) == []
+        assert all(storage.get(key) is None for key in keys)
+    
+    def test_backend_selected_by_config(self, monkeypatch, tmp_path):
+        """Test the factory honours STORAGE_BACKEND."""
+        monkeypatch.setenv('STORAGE_BACKEND', 'local')
+        monkeypatch.setenv('LOCAL_STORAGE_PATH', str(tmp_path))
+        
+        storage = get_storage_backend()
+        assert isinstance(storage, LocalStorageBackend)
+        assert storage.root == str(tmp_path)
+    
+    def test_unknown_backend(self):
+        """Test an unknown backend name raises."""
+        with pytest.raises(ValueError):
+            get_storage_backend('ftp')
+
+
+@pytest.mark.unit
+class TestS3StorageBackend:
+    """Test cases for S3StorageBackend batch operations."""
+    
+    def test_delete_many_batches_requests(self):
+        """Test keys are deleted in DeleteObjects batches of 1000."""
+        class FakeS3Client:
+            def __init__(self):
+                self.batches = []
+            
+            def delete_objects(self, Bucket, Delete):
+                keys = [obj['Key'] for obj in Delete['Objects']]
+                self.batches.append(keys)
+                errors = [{'Key': key, 'Code': 'InternalError'} for key in keys if key == 'bad']
+                return {'Errors': errors}
+        
+        storage = S3StorageBackend.__new__(S3StorageBackend)
+        storage.s3_client = FakeS3Client()
+        storage.bucket_name = 'test-bucket'
+        
+        keys = [f'k{i}' for i in range(2499)] + ['bad']
+        failed = storage.delete_many(keys)
+        
+        assert [len(batch) for batch in storage.s3_client.batches] == [1000, 1000, 500]
+        assert failed == ['bad']
+    
+    def test_keep_original_leaves_stream_open(self):
+        """Test the original is still readable for optimizing after its S3 upload."""
+        client = boto3.client('s3', region_name='us-east-1',
+                              aws_access_key_id='test', aws_secret_access_key='test')
+        stubber = Stubber(client)
+        for _ in range(3):
+            stubber.add_response('put_object', {})
+        stubber.activate()
+        
+        storage = S3StorageBackend.__new__(S3StorageBackend)
+        storage.s3_client = client
+        storage.bucket_name = 'test-bucket'
+        storage.cloudfront_domain = ''
+        original = make_jpeg()
+        
+        result = ImageHandler(storage=storage).process_and_upload_image(
+            original, 'trip_reports', keep_original=True
+        )
+        
+        assert not original.closed
+        assert result['original_key'].startswith('mountaineering_club/trip_reports/originals/')
+        stubber.assert_no_pending_responses()
+
+
+@pytest.mark.unit
+class TestImageHandler:
+    """Test cases for ImageHandler on top of local storage."""
+    
+    def test_process_and_upload_image(self, tmp_path):
+        """Test the full pipeline stores main image and thumbnail."""
+        handler = ImageHandler(storage=LocalStorageBackend(root=str(tmp_path)))
+        
+        result = handler.process_and_upload_image(make_jpeg(), 'trip_reports')
+        
+        assert result['width'] <= 1200 and result['height'] <= 800
+        assert result['thumb_width'] <= 300 and result['thumb_height'] <= 200
+        assert (tmp_path / result['key']).exists()
+        assert (tmp_path / result['thumb_key']).exists()
+        assert result['url'] == f"/media/{result['key']}"
+        assert 'original_key' not in result
+    
+    def test_keep_original(self, tmp_path):
+        """Test the untouched original is stored when requested."""
+        handler = ImageHandler(storage=LocalStorageBackend(root=str(tmp_path)))
+        original = make_jpeg()
+        
+        result = handler.process_and_upload_image(original, 'trip_reports', keep_original=True)
+        
+        assert (tmp_path / result['original_key']).read_bytes() == original.getvalue()
+        
+        handler.delete_images(result)
+        assert not (tmp_path / result['key']).exists()
+        assert not (tmp_path / result['original_key']).exists()
+    
+    def test_collect_image_keys(self):
+        """Test every variant of every photo is collected."""
+        photos = [
+            {'key': 'a.jpg', 'thumb_key': 'thumbs/a.jpg'},
+            {'key': 'b.jpg', 'thumb_key': 'thumbs/b.jpg', 'original_key': 'originals/b'}
+        ]
+        
+        assert ImageHandler.collect_image_keys(photos) == [
+            'a.jpg', 'thumbs/a.jpg', 'b.jpg', 'thumbs/b.jpg', 'originals/b'
+        ]
+        assert ImageHandler.collect_image_keys(None) == []
+    
+    def test_delete_keys_retries_failures(self, tmp_path):
+        """Test failed keys are retried until they succeed."""
+        class FlakyStorage(LocalStorageBackend):
+            calls = []
+            
+            def delete_many(self, keys):
+                self.calls.append(list(keys))
+                return keys[:1] if len(self.calls) == 1 else []
+        
+        handler = ImageHandler(storage=FlakyStorage(root=str(tmp_path)))
+        
+        remaining = handler.delete_keys(['a', 'b', 'c'], retry_delay=0)
+        
+        assert remaining == []
+        assert FlakyStorage.calls == [['a', 'b', 'c'], ['a']]
+    
+    def test_delete_task_leaves_retries_to_the_queue(self, tmp_path, monkeypatch):
+        """Test the images.delete task makes one storage pass per attempt, without sleeping."""
+        import jobs.tasks
+        
+        class FailingStorage(LocalStorageBackend):
+            calls = []
+            
+            def delete_many(self, keys):
+                self.calls.append(list(keys))
+                return keys[:1]
+        
+        handler = ImageHandler(storage=FailingStorage(root=str(tmp_path)))
+        monkeypatch.setattr(jobs.tasks, 'get_service', lambda name: handler)
+        monkeypatch.setattr('image_handler.time.sleep', lambda seconds: pytest.fail('slept'))
+        
+        with pytest.raises(RuntimeError):
+            jobs.tasks.delete_images(['a', 'b'])
+        assert FailingStorage.calls == [['a', 'b']]
+    
+    def test_process_stored_original(self, tmp_path):
+        """Test a directly uploaded original is optimized in place."""
+        storage = LocalStorageBackend(root=str(tmp_path))
+        handler = ImageHandler(storage=storage)
+        key = 'mountaineering_club/trip_reports/originals/0f8fad5b-d9cb-469f-a165-70867728950e'
+        storage.put(make_jpeg(), key, 'image/jpeg')
+        
+        result = handler.process_stored_original(key)
+        
+        assert result['original_key'] == key
+        assert result['key'] == 'mountaineering_club/trip_reports/0f8fad5b-d9cb-469f-a165-70867728950e.jpg'
+        assert result['status'] == 'ready'
+        assert result['url'] == f"/media/{result['key']}"
+        assert result['width'] <= 1200
+        assert (tmp_path / result['key']).exists()
+        assert (tmp_path / result['thumb_key']).exists()
+    
+    def test_pending_photo_is_updated_when_processed(self, app, tmp_path, sample_user):
+        """Test a report shows the original until processing, then the optimized image."""
+        from models import db
+        from services.trip_service import TripService
+        
+        storage = LocalStorageBackend(root=str(tmp_path))
+        handler = ImageHandler(storage=storage)
+        key = 'mountaineering_club/trip_reports/originals/0f8fad5b-d9cb-469f-a165-70867728950e'
+        storage.put(make_jpeg(), key, 'image/jpeg')
+        db.session.add(sample_user)
+        db.session.commit()
+        
+        pending = handler.photo_metadata_for_original(key)
+        assert (pending['status'], pending['url']) == ('pending', f'/media/{key}')
+        _, _, report = TripService.create_trip_report(
+            'Triglav', 'Opis', 'Julijske Alpe', '2026-10-01', None, [pending], author_id=sample_user.id
+        )
+        
+        assert TripService.update_report_photo(report.id, key, handler.process_stored_original(key))
+        
+        photo = db.session.get(type(report), report.id).photos[0]
+        assert photo['status'] == 'ready'
+        assert photo['width'] <= 1200
+        assert TripService.claimed_original_keys() == {key}
+    
+    def test_delete_unclaimed_originals(self, tmp_path):
+        """Test only old originals no photo refers to are deleted."""
+        storage = LocalStorageBackend(root=str(tmp_path))
+        handler = ImageHandler(storage=storage)
+        prefix = 'mountaineering_club/trip_reports/originals/'
+        claimed = prefix + '0f8fad5b-d9cb-469f-a165-70867728950e'
+        abandoned = prefix + '1f8fad5b-d9cb-469f-a165-70867728950e'
+        for key in (claimed, abandoned):
+            storage.put(io.BytesIO(b'x'), key)
+        
+        assert handler.delete_unclaimed_originals({claimed}, datetime.utcnow() - timedelta(days=1)) == []
+        deleted = handler.delete_unclaimed_originals({claimed}, datetime.utcnow() + timedelta(minutes=1))
+        
+        assert deleted == [abandoned]
+        assert storage.exists(claimed) and not storage.exists(abandoned)
+    
+    def test_photo_metadata_rejects_foreign_keys(self, tmp_path):
+        """Test only keys issued for originals are accepted."""
+        handler = ImageHandler(storage=LocalStorageBackend(root=str(tmp_path)))
+        
+        with pytest.raises(ValueError):
+            handler.photo_metadata_for_original('mountaineering_club/trip_reports/other.jpg')
+        with pytest.raises(ValueError):
+            handler.create_upload_intent('application/pdf')
@@ -0,0 +1,159 @@
+"""
+Unit tests for the database-backed task queue.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from jobs import queue as queue_module
+from jobs.queue import (
+    DatabaseTaskQueue, TaskDefinition, Worker, enqueue, get_task, retry_delay, start_task_worker, tasks_run_eagerly
+)
+from models import db, Task
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(datetime(2026, 10, 19, 5, 0))
+
+
+@pytest.fixture
+def task_definitions(monkeypatch):
+    """Replace the registered tasks with an empty registry."""
+    definitions = {}
+    monkeypatch.setattr(queue_module, 'TASKS', definitions)
+    return definitions
+
+
+@pytest.fixture
+def task_queue(app, clock):
+    backend = DatabaseTaskQueue(clock=clock)
+    app.extensions['task_queue'] = backend
+    return backend
+
+
+@pytest.mark.unit
+class TestDatabaseTaskQueue:
+    """Test cases for DatabaseTaskQueue."""
+    
+    def test_claims_by_priority_then_age(self, task_queue):
+        """Test higher priority tasks are claimed first, then older ones."""
+        low = task_queue.enqueue('test.low', {}, priority=0, max_attempts=3)
+        high = task_queue.enqueue('test.high', {}, priority=10, max_attempts=3)
+        later = task_queue.enqueue('test.low', {}, priority=0, max_attempts=3)
+        
+        claimed = [task_queue.claim('worker-1', lambda name: 60)['id'] for _ in range(3)]
+        
+        assert claimed == [high, low, later]
+        assert task_queue.claim('worker-1', lambda name: 60) is None
+    
+    def test_unique_key_deduplicates_active_tasks(self, task_queue):
+        """Test a queued task with the same key is reused until it finishes."""
+        first = task_queue.enqueue('news.update', {}, 0, 3, unique_key='news.update')
+        second = task_queue.enqueue('news.update', {}, 0, 3, unique_key='news.update')
+        assert first == second
+        
+        task_queue.claim('worker-1', lambda name: 60)
+        task_queue.complete(first, {'articles_stored': 2}, 'worker-1')
+        third = task_queue.enqueue('news.update', {}, 0, 3, unique_key='news.update')
+        
+        assert third != first
+    
+    def test_expired_lease_is_reclaimed(self, task_queue, clock):
+        """Test a task held by a dead worker becomes claimable after its timeout."""
+        task_id = task_queue.enqueue('test.task', {}, 0, 3)
+        assert task_queue.claim('worker-1', lambda name: 60)['id'] == task_id
+        assert task_queue.claim('worker-2', lambda name: 60) is None
+        
+        clock.now += timedelta(seconds=61)
+        claimed = task_queue.claim('worker-2', lambda name: 60)
+        
+        assert claimed['id'] == task_id
+        assert claimed['attempts'] == 2
+        assert db.session.get(Task, task_id).locked_by == 'worker-2'
+        
+        # The first worker finishing late cannot overwrite the new run
+        assert not task_queue.complete(task_id, {'stale': True}, 'worker-1')
+        assert not task_queue.fail(task_id, 'stale', 1, 3, 'worker-1')
+        assert task_queue.get(task_id)['status'] == 'running'
+        assert task_queue.complete(task_id, {'fresh': True}, 'worker-2')
+        assert task_queue.get(task_id)['result'] == {'fresh': True}
+    
+    def test_retry_with_backoff_then_failed(self, task_queue, clock):
+        """Test failed attempts are rescheduled until max_attempts is reached."""
+        task_id = task_queue.enqueue('test.task', {}, 0, max_attempts=2)
+        
+        claimed = task_queue.claim('worker-1', lambda name: 60)
+        assert task_queue.fail(task_id, 'boom', claimed['attempts'], claimed['max_attempts'], 'worker-1')
+        assert task_queue.claim('worker-1', lambda name: 60) is None
+        
+        clock.now += timedelta(seconds=retry_delay(1) * 2)
+        claimed = task_queue.claim('worker-1', lambda name: 60)
+        assert not task_queue.fail(task_id, 'boom again', claimed['attempts'], claimed['max_attempts'], 'worker-1')
+        
+        record = task_queue.get(task_id)
+        assert record['status'] == 'failed'
+        assert record['attempts'] == 2
+        assert record['error'] == 'boom again'
+
+
+@pytest.mark.unit
+class TestWorker:
+    """Test cases for enqueue and Worker."""
+    
+    def test_worker_runs_task_and_stores_result(self, task_queue, task_definitions):
+        """Test the payload is passed as keyword arguments and the result saved."""
+        task_definitions['test.add'] = TaskDefinition('test.add', lambda a, b: {'sum': a + b})
+        task_id = enqueue('test.add', {'a': 2, 'b': 3})
+        
+        assert Worker(task_queue).run_next()
+        
+        record = get_task(task_id)
+        assert record['status'] == 'succeeded'
+        assert record['result'] == {'sum': 5}
+    
+    def test_eager_mode_runs_at_enqueue(self, app, task_queue, task_definitions):
+        """Test TASK_QUEUE_EAGER runs the task without a worker."""
+        calls = []
+        task_definitions['test.record'] = TaskDefinition('test.record', lambda: calls.append(1))
+        app.config['TASK_QUEUE_EAGER'] = False
+        waiting = enqueue('test.record', priority=10)
+        app.config['TASK_QUEUE_EAGER'] = True
+        
+        task_id = enqueue('test.record')
+        
+        # Only the task just enqueued runs, not the higher priority one already waiting
+        assert calls == [1]
+        assert get_task(task_id)['status'] == 'succeeded'
+        assert get_task(waiting)['status'] == 'queued'
+    
+    def test_queue_only_by_default(self, app, monkeypatch):
+        """Test tasks are left to a worker unless TASK_QUEUE_EAGER is set."""
+        monkeypatch.delenv('TASK_QUEUE_EAGER', raising=False)
+        assert not tasks_run_eagerly(app)
+        
+        app.config.pop('TASK_QUEUE_EAGER')
+        monkeypatch.setenv('TASK_QUEUE_EAGER', 'True')
+        assert tasks_run_eagerly(app)
+    
+    def test_in_process_worker_can_be_disabled(self, app, task_queue):
+        """Test no worker thread is started when a separate worker is deployed or tasks run eagerly."""
+        app.config.update(TASK_WORKER_IN_PROCESS=False, TASK_QUEUE_EAGER=False)
+        assert start_task_worker(app) is None
+        
+        app.config.update(TASK_WORKER_IN_PROCESS=True, TASK_QUEUE_EAGER=True)
+        assert start_task_worker(app) is None
+        assert 'task_worker_thread' not in app.extensions
+    
+    def test_unknown_task_is_rejected(self, task_queue, task_definitions):
+        """Test enqueueing an unregistered task name fails fast."""
+        with pytest.raises(ValueError):
+            enqueue('test.missing')
@@ -0,0 +1,43 @@
+"""
+Unit tests for the template bytecode cache and warmup.
+"""
+import os
+
+import pytest
+from flask import Flask
+
+from utils.template_cache import init_template_cache, warm_templates
+
+
+@pytest.fixture
+def template_app(tmp_path):
+    """App with two templates and a bytecode cache in a temp directory."""
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'one.html').write_text('<p>{{ value }}</p>')
+    (templates / 'two.html').write_text('{% include "one.html" %}')
+    
+    app = Flask(__name__, template_folder=str(templates))
+    app.config['TEMPLATE_CACHE_DIR'] = str(tmp_path / 'cache')
+    init_template_cache(app)
+    return app
+
+
+@pytest.mark.unit
+class TestTemplateCache:
+    """Test cases for compiled template caching."""
+    
+    def test_warmup_fills_bytecode_cache(self, template_app):
+        """Test warmup compiles every template into the cache directory."""
+        compiled = warm_templates(template_app)
+        
+        assert compiled == 2
+        assert len(os.listdir(template_app.config['TEMPLATE_CACHE_DIR'])) == 2
+    
+    def test_cache_can_be_disabled(self):
+        """Test no bytecode cache is configured when turned off."""
+        app = Flask(__name__)
+        app.config['TEMPLATE_BYTECODE_CACHE'] = False
+        init_template_cache(app)
+        
+        assert app.jinja_env.bytecode_cache is None
@@ -0,0 +1,75 @@
+"""
+Unit tests for the planned trip listings.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, PlannedTrip
+from services.trip_service import TripService
+
+
+@pytest.fixture
+def organizer(app, admin_user):
+    db.session.add(admin_user)
+    db.session.commit()
+    return admin_user
+
+
+def make_trips(organizer, days, description='Opis'):
+    now = datetime.utcnow()
+    trips = [
+        PlannedTrip(title=f'Trip {day}', trip_date=now + timedelta(days=day),
+                    description=description, organizer_id=organizer.id, status='open')
+        for day in days
+    ]
+    db.session.add_all(trips)
+    db.session.commit()
+    return [trip.id for trip in trips]
+
+
+@pytest.mark.unit
+class TestTripListing:
+    """Test cases for TripService listing queries."""
+    
+    def test_upcoming_trips_are_paginated(self, organizer):
+        """Test upcoming trips come in date order, one page at a time."""
+        make_trips(organizer, [3, 1, 2, 5, 4])
+        
+        first = TripService.get_planned_trips(page=1, per_page=2)
+        last = TripService.get_planned_trips(page=3, per_page=2)
+        
+        assert [trip.title for trip in first['upcoming_trips']] == ['Trip 1', 'Trip 2']
+        assert (first['total'], first['has_next'], first['next_num']) == (5, True, 2)
+        assert [trip.title for trip in last['upcoming_trips']] == ['Trip 5']
+        assert (last['has_prev'], last['has_next']) == (True, False)
+        
+        clamped = TripService.get_planned_trips(page=-1, per_page=2)
+        assert [trip.title for trip in clamped['upcoming_trips']] == ['Trip 1', 'Trip 2']
+        assert (clamped['page'], clamped['has_prev']) == (1, False)
+    
+    def test_card_rows_are_projected(self, organizer):
+        """Test rows carry the organizer name and a description cut in SQL."""
+        make_trips(organizer, [1], description='x' * 500)
+        
+        trip = TripService.get_planned_trips()['upcoming_trips'][0]
+        
+        assert len(trip.description_preview) == 121
+        assert trip.organizer_name == f'{organizer.first_name} {organizer.last_name}'
+        assert 'gear_list' not in trip._fields
+    
+    def test_archive_pages_by_date_cursor(self, organizer):
+        """Test the archive walks past trips newest first without gaps or repeats."""
+        trip_ids = make_trips(organizer, [-1, -2, -3, -4, -5, 1])
+        
+        seen = []
+        before = before_id = None
+        while True:
+            page = TripService.get_past_trips(before=before, before_id=before_id, limit=2)
+            seen.extend(trip.id for trip in page['trips'])
+            if page['next_cursor'] is None:
+                break
+            before, before_id = page['next_cursor']
+        
+        assert seen == trip_ids[:5]
+        assert TripService.get_planned_trips(past_limit=3)['has_more_past']
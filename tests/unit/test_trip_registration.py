@@ -0,0 +1,256 @@
+"""
+Unit tests for atomic trip registration.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+import jobs.tasks  # noqa: F401 (connects the waitlist notification receiver)
+from jobs.queue import DatabaseTaskQueue
+from models import db, PlannedTrip, Task, TripParticipant, TripWaitlistEntry, User
+from services.notification_service import NotificationService
+from services.trip_service import TripService
+from utils.signals import waitlist_promoted
+
+
+def make_users(count):
+    users = [
+        User(email=f'member{i}@example.com', password_hash='x', first_name='Member', last_name=str(i))
+        for i in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.id for user in users]
+
+
+@pytest.fixture
+def trip(app, admin_user):
+    """An upcoming trip with room for three."""
+    db.session.add(admin_user)
+    db.session.commit()
+    trip = PlannedTrip(
+        title='Triglav',
+        trip_date=datetime.utcnow() + timedelta(days=7),
+        max_participants=3,
+        organizer_id=admin_user.id,
+        status='open'
+    )
+    db.session.add(trip)
+    db.session.commit()
+    return trip
+
+
+@pytest.mark.unit
+class TestTripRegistration:
+    """Test cases for TripService registration."""
+    
+    def test_last_seat_marks_trip_full(self, trip):
+        """Test the counter and status follow registrations and cancellations."""
+        user_ids = make_users(3)
+        
+        for user_id in user_ids:
+            TripService.register_for_trip(trip.id, user_id=user_id)
+        
+        assert (trip.participant_count, trip.status) == (3, 'full')
+        
+        assert TripService.unregister_from_trip(trip.id, user_id=user_ids[0])[0]
+        assert (trip.participant_count, trip.status) == (2, 'open')
+        assert not TripService.unregister_from_trip(trip.id, user_id=user_ids[0])[0]
+        assert trip.participant_count == 2
+    
+    def test_unlimited_and_cancelled_trips_keep_status(self, trip):
+        """Test registration never marks an unlimited or cancelled trip full."""
+        user_ids = make_users(2)
+        trip.max_participants = 0
+        db.session.commit()
+        
+        assert TripService.register_for_trip(trip.id, user_id=user_ids[0])[0]
+        assert (trip.participant_count, trip.status) == (1, 'open')
+        
+        trip.max_participants = 2
+        trip.status = 'cancelled'
+        db.session.commit()
+        
+        assert TripService.register_for_trip(trip.id, user_id=user_ids[1]) == (False, 'Trip has been cancelled')
+        assert not TripService._reserve_seat(trip.id)
+        db.session.refresh(trip)
+        assert (trip.participant_count, trip.status) == (1, 'cancelled')
+    
+    def test_duplicate_registration_is_rejected(self, trip):
+        """Test registering twice keeps one row and one seat."""
+        user_id = make_users(1)[0]
+        
+        assert TripService.register_for_trip(trip.id, user_id=user_id)[0]
+        assert TripService.register_for_trip(trip.id, user_id=user_id) == (False, 'Already registered for this trip')
+        assert trip.participant_count == 1
+    
+    def test_parallel_registrations_never_overbook(self, app, trip):
+        """Test hundreds of concurrent registrations fill exactly the available seats."""
+        trip.max_participants = 25
+        db.session.commit()
+        user_ids = make_users(200)
+        trip_id = trip.id
+        
+        def register(user_id):
+            with app.app_context():
+                try:
+                    return TripService.register_for_trip(trip_id, user_id=user_id)
+                finally:
+                    db.session.remove()
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(register, user_ids + user_ids[:50]))
+        
+        db.session.expire_all()
+        trip = db.session.get(PlannedTrip, trip_id)
+        positions = [entry.position for entry in TripWaitlistEntry.query.filter_by(trip_id=trip_id)]
+        assert sum(success for success, _ in results) == 200
+        assert TripParticipant.query.filter_by(trip_id=trip_id).count() == 25
+        assert trip.participant_count == 25
+        assert trip.status == 'full'
+        assert len(positions) == len(set(positions)) == trip.waitlist_count == 175
+    
+    def test_is_registered_and_participant_list(self, trip):
+        """Test the EXISTS check and the participant list (names only)."""
+        user_ids = make_users(2)
+        TripService.register_for_trip(trip.id, user_id=user_ids[0], phone='041 000 000')
+        
+        participants = TripService.get_trip_participants(trip.id)
+        
+        assert TripService.is_registered(trip.id, user_ids[0])
+        assert not TripService.is_registered(trip.id, user_ids[1])
+        assert [(p.user_id, p.last_name) for p in participants] == [(user_ids[0], '0')]
+        assert 'phone' not in participants[0]._fields
+    
+    def test_recount_repairs_drifted_counters(self, trip):
+        """Test recount fixes the counter and the full/open status."""
+        user_ids = make_users(3)
+        db.session.add_all([TripParticipant(trip_id=trip.id, user_id=user_id) for user_id in user_ids])
+        db.session.commit()
+        assert trip.participant_count == 0
+        
+        success, _, fixed = TripService.recount_participants()
+        db.session.refresh(trip)
+        
+        assert success and fixed == 1
+        assert (trip.participant_count, trip.status) == (3, 'full')
+
+
+@pytest.mark.unit
+class TestTripWaitlist:
+    """Test cases for the trip waitlist."""
+    
+    def test_full_trip_queues_and_promotes_in_order(self, trip):
+        """Test a cancellation hands the seat to the first waiting member."""
+        user_ids = make_users(5)
+        promoted = []
+        
+        def on_promoted(sender, **kwargs):
+            promoted.append((sender, kwargs['user_id']))
+        
+        for user_id in user_ids[:3]:
+            TripService.register_for_trip(trip.id, user_id=user_id)
+        assert TripService.register_for_trip(trip.id, user_id=user_ids[3]) == (
+            True, 'Trip is full - you are number 1 on the waitlist'
+        )
+        TripService.register_for_trip(trip.id, user_id=user_ids[4], phone='040')
+        assert TripService.get_waitlist_position(trip.id, user_ids[4]) == 2
+        
+        with waitlist_promoted.connected_to(on_promoted):
+            assert TripService.unregister_from_trip(trip.id, user_id=user_ids[0])[0]
+        
+        assert promoted == [(trip.id, user_ids[3])]
+        assert TripService.is_registered(trip.id, user_ids[3])
+        assert TripService.get_waitlist_position(trip.id, user_ids[4]) == 1
+        assert (trip.participant_count, trip.waitlist_count, trip.status) == (3, 1, 'full')
+    
+    def test_no_promotion_without_a_free_seat(self, trip):
+        """Test lowering the capacity keeps waiting members queued."""
+        user_ids = make_users(4)
+        for user_id in user_ids:
+            TripService.register_for_trip(trip.id, user_id=user_id)
+        trip.max_participants = 1
+        db.session.commit()
+        
+        assert TripService.unregister_from_trip(trip.id, user_id=user_ids[0])[0]
+        
+        assert not TripService.is_registered(trip.id, user_ids[3])
+        assert TripService.get_waitlist_position(trip.id, user_ids[3]) == 1
+        assert (trip.participant_count, trip.waitlist_count, trip.status) == (2, 1, 'full')
+    
+    def test_promotion_queues_an_email(self, app, trip, monkeypatch):
+        """Test a promoted member is emailed through the task queue."""
+        app.extensions['task_queue'] = DatabaseTaskQueue()
+        app.config['TASK_QUEUE_EAGER'] = False
+        user_ids = make_users(4)
+        for user_id in user_ids:
+            TripService.register_for_trip(trip.id, user_id=user_id)
+        
+        TripService.unregister_from_trip(trip.id, user_id=user_ids[0])
+        
+        task = Task.query.filter_by(name='notifications.waitlist_promoted').one()
+        assert task.payload == {'trip_id': trip.id, 'user_id': user_ids[3]}
+        
+        sent = []
+        
+        class FakeSMTP:
+            def __init__(self, host, port, timeout):
+                pass
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *exc_info):
+                return False
+            
+            def starttls(self):
+                pass
+            
+            def send_message(self, message):
+                sent.append(message)
+        
+        monkeypatch.setenv('MAIL_SERVER', 'smtp.example.com')
+        monkeypatch.setattr('services.notification_service.smtplib.SMTP', FakeSMTP)
+        
+        assert NotificationService.notify_waitlist_promotion(trip.id, user_ids[3])[0]
+        assert sent[0]['To'] == 'member3@example.com'
+        assert 'Triglav' in sent[0]['Subject']
+    
+    def test_leaving_the_waitlist(self, trip):
+        """Test unregistering a waiting member removes the entry only."""
+        user_ids = make_users(4)
+        for user_id in user_ids:
+            TripService.register_for_trip(trip.id, user_id=user_id)
+        
+        assert TripService.unregister_from_trip(trip.id, user_id=user_ids[3]) == (True, 'Removed from the waitlist')
+        assert TripService.register_for_trip(trip.id, user_id=user_ids[3])[0]
+        assert TripService.register_for_trip(trip.id, user_id=user_ids[3]) == (
+            False, 'Already on the waitlist for this trip'
+        )
+        assert (trip.participant_count, trip.waitlist_count) == (3, 1)
+    
+    def test_parallel_cancellations_promote_distinct_members(self, app, trip):
+        """Test concurrent cancellations each promote the next member exactly once."""
+        trip.max_participants = 10
+        db.session.commit()
+        user_ids = make_users(30)
+        trip_id = trip.id
+        for user_id in user_ids:
+            TripService.register_for_trip(trip_id, user_id=user_id)
+        
+        def unregister(user_id):
+            with app.app_context():
+                try:
+                    return TripService.unregister_from_trip(trip_id, user_id=user_id)
+                finally:
+                    db.session.remove()
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(unregister, user_ids[:10]))
+        
+        db.session.expire_all()
+        trip = db.session.get(PlannedTrip, trip_id)
+        registered = {p.user_id for p in TripParticipant.query.filter_by(trip_id=trip_id)}
+        assert registered == set(user_ids[10:20])
+        assert (trip.participant_count, trip.waitlist_count, trip.status) == (10, 10, 'full')
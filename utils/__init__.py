@@ -3,10 +3,13 @@ Utilities for the mountaineering club application.
 """
 from .decorators import login_required, admin_required
 from .helpers import format_datetime, handle_error
+from .current_user import get_current_user, current_user
 
 __all__ = [
     'login_required',
     'admin_required',
     'format_datetime',
-    'handle_error'
+    'handle_error',
+    'get_current_user',
+    'current_user'
 ]
\ No newline at end of file
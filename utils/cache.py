@@ -0,0 +1,285 @@
+"""
+Server-side cache for read-mostly responses.
+
+The backend is an in-process LRU by default, or Redis when CACHE_REDIS_URL is
+configured (shared by all workers). Cached entries are grouped by tags
+('news', 'history', ...); invalidating a tag bumps its version so every key
+built with the old version is ignored and ages out on its own.
+
+When tasks run in a separate worker process and there is no Redis, the LRU
+keeps its tag versions in the database (cache_tag table), so invalidations
+made by the worker reach the web processes.
+"""
+import os
+import json
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, has_app_context
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with per-entry TTL."""
+    
+    def __init__(self, max_entries=1024, clock=time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        # Counters (tag versions) are kept apart so they are never evicted
+        self._counters = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+    
+    def set(self, key, value, ttl=None):
+        expires_at = self._clock() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class DatabaseTagCache(LRUCache):
+    """In-process LRU whose tag versions are stored in the database."""
+    
+    TAG_PREFIX = 'tag:'
+    
+    def get(self, key):
+        if key.startswith(self.TAG_PREFIX):
+            return self.get_many([key])[0]
+        return super().get(key)
+    
+    def get_many(self, keys):
+        from models import db, CacheTag
+        
+        prefix = self.TAG_PREFIX
+        tags = [key[len(prefix):] for key in keys if key.startswith(prefix)]
+        versions = {}
+        if tags:
+            # Own connection: never joins or commits the request's transaction
+            with db.engine.connect() as connection:
+                versions = dict(connection.execute(
+                    select(CacheTag.tag, CacheTag.version).where(CacheTag.tag.in_(tags))
+                ).all())
+        return [
+            versions.get(key[len(prefix):]) if key.startswith(prefix) else LRUCache.get(self, key)
+            for key in keys
+        ]
+    
+    def incr(self, key):
+        if not key.startswith(self.TAG_PREFIX):
+            return super().incr(key)
+        
+        from models import db, CacheTag
+        
+        tag = key[len(self.TAG_PREFIX):]
+        for _ in range(3):
+            try:
+                with db.engine.begin() as connection:
+                    bumped = connection.execute(
+                        update(CacheTag).where(CacheTag.tag == tag).values(version=CacheTag.version + 1)
+                    )
+                    if bumped.rowcount == 0:
+                        connection.execute(insert(CacheTag).values(tag=tag, version=1))
+                    return connection.execute(select(CacheTag.version).where(CacheTag.tag == tag)).scalar()
+            except IntegrityError:
+                # Another process created the row first; bump it instead
+                continue
+        raise RuntimeError(f"Could not bump cache tag {tag}")
+
+
+class RedisCache:
+    """Redis-backed cache shared by all worker processes."""
+    
+    def __init__(self, url, prefix='mc:'):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.prefix = prefix
+    
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+    
+    def get_many(self, keys):
+        if not keys:
+            return []
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [json.loads(value) if value is not None else None for value in values]
+    
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+    
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+    
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+    
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+def init_cache(app):
+    """
+    Attach the cache backend selected by configuration to the app.
+    
+    Args:
+        app: Flask application
+        
+    Returns:
+        LRUCache, DatabaseTagCache or RedisCache: Cache backend
+    """
+    from jobs.queue import tasks_run_eagerly
+    
+    redis_url = app.config.get('CACHE_REDIS_URL', os.environ.get('CACHE_REDIS_URL'))
+    if redis_url:
+        backend = RedisCache(redis_url)
+        logger.info("Response cache: Redis")
+    elif not tasks_run_eagerly(app):
+        # Tasks invalidate tags from the worker process
+        backend = DatabaseTagCache(max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024))
+        logger.info("Response cache: in-process LRU, tag versions in the database")
+    else:
+        backend = LRUCache(max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024))
+        logger.info("Response cache: in-process LRU")
+    app.extensions['cache'] = backend
+    return backend
+
+
+def get_cache():
+    """Get the current app's cache backend, creating the default one if needed."""
+    backend = current_app.extensions.get('cache')
+    if backend is None:
+        backend = init_cache(current_app)
+    return backend
+
+
+def tag_versions(backend, tags):
+    versions = backend.get_many([f'tag:{tag}' for tag in tags])
+    return '.'.join(str(version or 0) for version in versions)
+
+
+def invalidate_cache(*tags):
+    """
+    Invalidate every cached entry built with any of the given tags.
+    
+    Args:
+        *tags (str): Tags to invalidate
+    """
+    if not has_app_context():
+        return
+    try:
+        backend = get_cache()
+        for tag in tags:
+            backend.incr(f'tag:{tag}')
+        logger.info(f"Cache invalidated: {', '.join(tags)}")
+    except Exception as e:
+        logger.error(f"Error invalidating cache {tags}: {e}")
+
+
+def make_cache_key(name, tags=(), vary=None):
+    """
+    Build the cache key for the current request.
+    
+    The key includes the tag versions, view arguments and query string, plus
+    anything returned by the optional vary callable (e.g. today's date).
+    """
+    backend = get_cache()
+    parts = [name, tag_versions(backend, tags)]
+    parts.extend(f'{k}={v}' for k, v in sorted((request.view_args or {}).items()))
+    parts.extend(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+    if vary is not None:
+        parts.append(str(vary()))
+    return 'resp:' + '|'.join(parts)
+
+
+def cached_response(name, ttl, tags=(), vary=None):
+    """
+    Cache successful GET responses of a view.
+    
+    Args:
+        name (str): Endpoint name used in the cache key
+        ttl (int): Seconds an entry stays valid
+        tags (tuple): Invalidation tags
+        vary (callable): Optional callable whose result is added to the key
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'GET' or current_app.config.get('CACHE_DISABLED'):
+                return f(*args, **kwargs)
+            
+            try:
+                backend = get_cache()
+                key = make_cache_key(name, tags, vary)
+                entry = backend.get(key)
+            except Exception as e:
+                logger.error(f"Cache unavailable for {name}: {e}")
+                return f(*args, **kwargs)
+            
+            if entry is not None:
+                response = current_app.response_class(
+                    entry['body'], status=entry['status'], mimetype=entry['mimetype']
+                )
+                response.set_etag(entry['etag'])
+                response.headers['X-Cache'] = 'HIT'
+                # Answers 304 straight from the cached ETag, without running the view
+                return response.make_conditional(request)
+            
+            response = current_app.make_response(f(*args, **kwargs))
+            # Views opt out per response with Cache-Control: no-store (e.g. placeholders)
+            if response.status_code == 200 and not response.is_streamed and not response.cache_control.no_store:
+                body = response.get_data(as_text=True)
+                etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+                response.set_etag(etag)
+                try:
+                    backend.set(key, {
+                        'body': body,
+                        'etag': etag,
+                        'status': response.status_code,
+                        'mimetype': response.mimetype
+                    }, ttl)
+                except Exception as e:
+                    logger.error(f"Error storing {name} in cache: {e}")
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,145 @@
+"""
+Response compression (gzip, and brotli when the Brotli package is installed).
+
+HTML, JSON, CSS and JS responses above COMPRESS_MIN_SIZE are compressed with
+the best encoding the client accepts. Streamed responses (including static
+files) are compressed chunk by chunk, so nothing is buffered in full.
+Compressed responses get an encoding suffix on their ETag; the suffix is
+stripped from incoming If-None-Match headers so validators keep matching.
+"""
+import os
+import re
+import zlib
+import logging
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml'
+}
+
+_ETAG_ENCODING_SUFFIX = re.compile(r'-(gzip|br)"')
+
+
+def init_compression(app):
+    """
+    Register response compression on the app.
+    
+    Args:
+        app: Flask application
+    """
+    app.config.setdefault('COMPRESS_ENABLED', os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true')
+    app.config.setdefault('COMPRESS_LEVEL', int(os.environ.get('COMPRESS_LEVEL', 6)))
+    app.config.setdefault('COMPRESS_BR_LEVEL', int(os.environ.get('COMPRESS_BR_LEVEL', 4)))
+    app.config.setdefault('COMPRESS_MIN_SIZE', int(os.environ.get('COMPRESS_MIN_SIZE', 500)))
+    app.config.setdefault('COMPRESS_BROTLI', os.environ.get('COMPRESS_BROTLI', 'True').lower() == 'true')
+    
+    if not app.config['COMPRESS_ENABLED']:
+        return
+    
+    if app.config['COMPRESS_BROTLI'] and brotli is None:
+        logger.info("Brotli not installed, compressing with gzip only")
+    
+    app.before_request(_strip_encoding_from_etags)
+    app.after_request(lambda response: compress_response(response, app.config))
+
+
+def _strip_encoding_from_etags():
+    """Map ETags of compressed representations back to the view's ETags."""
+    if_none_match = request.environ.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and ('-gzip"' in if_none_match or '-br"' in if_none_match):
+        request.environ['HTTP_IF_NONE_MATCH'] = _ETAG_ENCODING_SUFFIX.sub('"', if_none_match)
+
+
+def choose_encoding(config):
+    """Pick the best content encoding the client accepts, or None."""
+    offered = ['br', 'gzip'] if config['COMPRESS_BROTLI'] and brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+class _Compressor:
+    """Incremental compressor with a common interface for gzip and brotli."""
+    
+    def __init__(self, encoding, config):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=config['COMPRESS_BR_LEVEL'])
+            self.compress, self.flush = compressor.process, compressor.finish
+        else:
+            # wbits=31 writes a gzip header and trailer
+            compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+            self.compress, self.flush = compressor.compress, compressor.flush
+
+
+def _compress_stream(iterable, compressor):
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+
+def compress_response(response, config):
+    """
+    Compress a response in place if it is eligible.
+    
+    Args:
+        response: Flask response
+        config: Application config with COMPRESS_* settings
+        
+    Returns:
+        Response: The (possibly compressed) response
+    """
+    if (response.status_code < 200 or response.status_code >= 300
+            or response.status_code in (204, 206)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or request.method == 'HEAD'):
+        return response
+    
+    if response.content_length is not None and response.content_length < config['COMPRESS_MIN_SIZE']:
+        return response
+    
+    encoding = choose_encoding(config)
+    if not encoding:
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    compressor = _Compressor(encoding, config)
+    
+    if response.is_streamed or response.direct_passthrough:
+        # Compress chunk by chunk as the body is sent
+        response.direct_passthrough = False
+        response.response = _compress_stream(response.response, compressor)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compressor.compress(data) + compressor.flush())
+    
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    
+    return response
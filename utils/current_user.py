@@ -0,0 +1,84 @@
+"""
+Request-scoped current-user loader.
+
+The logged-in user is fetched at most once per request and shared by routes,
+services, decorators and templates through g.current_user. When
+DEBUG_IDENTITY_LOADS is enabled (or the app runs in debug mode), every User
+row loaded from the database is counted per request, and duplicate loads of
+the same row (identity-map misses) are logged and reported in the
+X-Identity-Load-Duplicates response header.
+"""
+import logging
+from flask import g, session, has_request_context
+from sqlalchemy import event
+from werkzeug.local import LocalProxy
+
+from models import db, User
+
+logger = logging.getLogger(__name__)
+
+_NOT_LOADED = object()
+
+
+def get_current_user():
+    """
+    Get the logged-in user, loading it at most once per request.
+    
+    Returns:
+        User or None: Current user if authenticated, None otherwise
+    """
+    user = g.get('current_user', _NOT_LOADED)
+    if user is _NOT_LOADED:
+        user_id = session.get('user_id')
+        user = db.session.get(User, user_id) if user_id else None
+        g.current_user = user
+    return user
+
+
+def load_user(user_id):
+    """
+    Get a user by ID, reusing the request's current user when it matches.
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        User or None: User if found
+    """
+    if user_id is not None and user_id == session.get('user_id'):
+        return get_current_user()
+    return db.session.get(User, user_id)
+
+
+current_user = LocalProxy(get_current_user)
+
+
+def _count_user_load(target, context):
+    """Count User rows materialized from the database during a request."""
+    if has_request_context():
+        loads = g.setdefault('_identity_loads', {})
+        loads[target.id] = loads.get(target.id, 0) + 1
+
+
+def _report_duplicate_loads(response):
+    loads = g.get('_identity_loads', {})
+    duplicates = sum(count - 1 for count in loads.values())
+    response.headers['X-Identity-Load-Duplicates'] = str(duplicates)
+    if duplicates:
+        logger.warning(f"User rows loaded more than once in one request: {loads}")
+    return response
+
+
+def init_current_user(app):
+    """
+    Expose current_user to templates and register the debug load counter.
+    
+    Args:
+        app: Flask application
+    """
+    app.context_processor(lambda: {'current_user': current_user})
+    
+    if app.config.get('DEBUG_IDENTITY_LOADS', app.debug):
+        if not event.contains(User, 'load', _count_user_load):
+            event.listen(User, 'load', _count_user_load)
+        app.after_request(_report_duplicate_loads)
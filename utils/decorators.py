@@ -3,7 +3,7 @@ Decorators for authentication and authorization.
 """
 from functools import wraps
 from flask import session, redirect, url_for, flash, jsonify
-from models import User
+from .principal_cache import load_principal
 
 
 def login_required(f):
@@ -27,8 +27,8 @@ def admin_required(f):
                 return jsonify({'error': 'Authentication required'}), 401
             return redirect(url_for('auth.login'))
         
-        user = User.query.get(session['user_id'])
-        if not user or not user.is_admin:
+        principal = load_principal(session['user_id'])
+        if not principal['is_admin']:
             if 'api' in f.__name__ or '/api/' in str(f):
                 return jsonify({'error': 'Admin access required'}), 403
             flash('Admin access required', 'error')
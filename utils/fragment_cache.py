@@ -0,0 +1,100 @@
+"""
+Fragment caching for shared template blocks.
+
+Adds a ``{% cache key, ttl[, tags] %}...{% endcache %}`` tag to Jinja. The
+rendered HTML of the block is stored in the response cache backend, so it
+shares the backend (LRU or Redis) and the tag invalidation of utils.cache:
+
+    {% cache 'dashboard-announcements', 300, ['announcements'] %}
+        ...
+    {% endcache %}
+
+Only cache blocks that render the same for every user.
+"""
+import logging
+from flask import current_app, has_app_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from utils.cache import get_cache, tag_versions
+
+logger = logging.getLogger(__name__)
+
+# Tags invalidated by service writes
+ANNOUNCEMENTS_TAG = 'announcements'
+TRIP_REPORTS_TAG = 'trip_reports'
+PLANNED_TRIPS_TAG = 'planned_trips'
+
+
+class FragmentCacheExtension(Extension):
+    """Jinja extension implementing the ``cache`` block tag."""
+    
+    tags = {'cache'}
+    
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        parser.stream.expect('comma')
+        args.append(parser.parse_expression())
+        if parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(()))
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render_cached', args), [], [], body
+        ).set_lineno(lineno)
+    
+    def _render_cached(self, key, ttl, tags, caller):
+        return render_fragment(key, ttl, tags, caller)
+
+
+def render_fragment(key, ttl, tags, render):
+    """
+    Return the cached HTML for a fragment, rendering and storing it on a miss.
+    
+    Args:
+        key (str): Fragment name (include anything the block depends on, e.g. page)
+        ttl (int): Seconds the fragment stays valid
+        tags (iterable): Invalidation tags
+        render (callable): Renders the fragment body
+        
+    Returns:
+        Markup: Rendered fragment
+    """
+    if not has_app_context() or current_app.config.get('CACHE_DISABLED'):
+        return render()
+    
+    try:
+        backend = get_cache()
+        cache_key = f'fragment:{key}|{tag_versions(backend, tags)}'
+        html = backend.get(cache_key)
+    except Exception as e:
+        logger.error(f"Fragment cache unavailable for {key}: {e}")
+        return render()
+    
+    if html is not None:
+        return Markup(html)
+    
+    html = render()
+    try:
+        backend.set(cache_key, str(html), ttl)
+    except Exception as e:
+        logger.error(f"Error storing fragment {key}: {e}")
+    return html
+
+
+def init_fragment_cache(app):
+    """
+    Enable the ``{% cache %}`` template tag.
+    
+    Goes through jinja_options so the Jinja environment is still created
+    lazily, with every other option applied.
+    
+    Args:
+        app: Flask application
+    """
+    options = dict(app.jinja_options)
+    options['extensions'] = [*options.get('extensions', ()), FragmentCacheExtension]
+    app.jinja_options = options
@@ -2,7 +2,8 @@
 Helper functions for the application.
 """
 from datetime import datetime
-from flask import jsonify
+from flask import jsonify, current_app
+from itsdangerous import URLSafeTimedSerializer, BadSignature
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,4 +34,22 @@ def success_response(data=None, message='Success'):
 
 def error_response(message='Error', status_code=400):
     """Create error response."""
-    return jsonify({'success': False, 'error': message}), status_code
\ No newline at end of file
+    return jsonify({'success': False, 'error': message}), status_code
+
+
+def sign_upload_token(key, user_id, stage):
+    """Sign a direct-upload token binding a storage key to a user and stage."""
+    serializer = URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='direct-upload')
+    return serializer.dumps({'key': key, 'user_id': user_id, 'stage': stage})
+
+
+def load_upload_token(token, user_id, stage, max_age=86400):
+    """Verify a direct-upload token; return its storage key or None."""
+    serializer = URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='direct-upload')
+    try:
+        payload = serializer.loads(token or '', max_age=max_age)
+    except BadSignature:
+        return None
+    if payload.get('user_id') != user_id or payload.get('stage') != stage:
+        return None
+    return payload.get('key')
@@ -0,0 +1,209 @@
+"""
+Opt-in request instrumentation.
+
+When INSTRUMENTATION_ENABLED is set, every request records its wall time,
+the number and total time of SQL statements (SQLAlchemy cursor events) and
+the template render time (Flask template signals). The numbers are sent
+back in a Server-Timing header and aggregated per endpoint into an
+in-memory histogram, readable from the admin panel.
+"""
+import os
+import time
+import bisect
+import logging
+import threading
+from flask import g, request, has_request_context, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Called with (statement, parameters, duration_ms, context) after each SQL statement
+query_listeners = []
+
+_sql_hooks_installed = False
+
+
+class RequestTiming:
+    """Timings collected while handling one request."""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self._template_starts = []
+    
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+    
+    def server_timing(self, total_ms):
+        return ', '.join([
+            f'app;dur={total_ms:.1f}',
+            f'db;dur={self.sql_ms:.1f};desc="{self.sql_count} queries"',
+            f'tpl;dur={self.template_ms:.1f}'
+        ])
+
+
+class EndpointStats:
+    """Per-endpoint aggregates: latency histogram plus SQL and template totals."""
+    
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+    
+    def record(self, endpoint, total_ms, sql_count, sql_ms, template_ms):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = {
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'sql_count': 0,
+                    'sql_ms': 0.0,
+                    'template_ms': 0.0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+            stats['count'] += 1
+            stats['total_ms'] += total_ms
+            stats['max_ms'] = max(stats['max_ms'], total_ms)
+            stats['sql_count'] += sql_count
+            stats['sql_ms'] += sql_ms
+            stats['template_ms'] += template_ms
+            stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, total_ms)] += 1
+    
+    def snapshot(self):
+        """
+        Return per-endpoint summaries, slowest (by total time) first.
+        
+        Returns:
+            list: Dicts with averages, max, approximate p95 and bucket counts
+        """
+        with self._lock:
+            items = [(endpoint, dict(stats, buckets=list(stats['buckets'])))
+                     for endpoint, stats in self._stats.items()]
+        
+        summaries = []
+        for endpoint, stats in items:
+            count = stats['count']
+            summaries.append({
+                'endpoint': endpoint,
+                'count': count,
+                'avg_ms': round(stats['total_ms'] / count, 2),
+                'max_ms': round(stats['max_ms'], 2),
+                'p95_ms': _percentile(stats['buckets'], count, 0.95),
+                'avg_sql_count': round(stats['sql_count'] / count, 2),
+                'avg_sql_ms': round(stats['sql_ms'] / count, 2),
+                'avg_template_ms': round(stats['template_ms'] / count, 2),
+                'total_ms': round(stats['total_ms'], 2),
+                'buckets': dict(zip([*map(str, LATENCY_BUCKETS_MS), '+Inf'], stats['buckets']))
+            })
+        return sorted(summaries, key=lambda summary: summary['total_ms'], reverse=True)
+    
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def _percentile(buckets, count, fraction):
+    """Upper bound of the bucket containing the given percentile (None for +Inf)."""
+    threshold = count * fraction
+    seen = 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS_MS, buckets):
+        seen += bucket_count
+        if seen >= threshold:
+            return bound
+    return None
+
+
+endpoint_stats = EndpointStats()
+
+
+def current_timing():
+    """Return the RequestTiming of the current request, or None."""
+    if not has_request_context():
+        return None
+    return g.get('_request_timing')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_query_start')
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    
+    timing = current_timing()
+    if timing is not None:
+        timing.sql_count += 1
+        timing.sql_ms += duration_ms
+    
+    for listener in query_listeners:
+        try:
+            listener(statement, parameters, duration_ms, context)
+        except Exception as e:
+            logger.error(f"Query listener failed: {e}")
+
+
+def install_sql_hooks():
+    """Attach the cursor timing hooks to every SQLAlchemy engine (once per process)."""
+    global _sql_hooks_installed
+    if _sql_hooks_installed:
+        return
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    _sql_hooks_installed = True
+
+
+def _template_started(sender, template, context, **extra):
+    timing = current_timing()
+    if timing is not None:
+        timing._template_starts.append(time.perf_counter())
+
+
+def _template_finished(sender, template, context, **extra):
+    timing = current_timing()
+    if timing is not None and timing._template_starts:
+        timing.template_ms += (time.perf_counter() - timing._template_starts.pop()) * 1000
+
+
+def init_instrumentation(app):
+    """
+    Register request instrumentation if INSTRUMENTATION_ENABLED is set.
+    
+    Args:
+        app: Flask application
+    """
+    app.config.setdefault('INSTRUMENTATION_ENABLED', os.environ.get('INSTRUMENTATION_ENABLED', 'False').lower() == 'true')
+    if not app.config['INSTRUMENTATION_ENABLED']:
+        return
+    
+    install_sql_hooks()
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+    
+    @app.before_request
+    def start_request_timing():
+        g._request_timing = RequestTiming()
+    
+    @app.after_request
+    def record_request_timing(response):
+        timing = current_timing()
+        if timing is None:
+            return response
+        total_ms = timing.elapsed_ms()
+        response.headers['Server-Timing'] = timing.server_timing(total_ms)
+        endpoint_stats.record(
+            request.endpoint or 'unmatched', total_ms,
+            timing.sql_count, timing.sql_ms, timing.template_ms
+        )
+        return response
+    
+    logger.info("Request instrumentation enabled")
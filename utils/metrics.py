@@ -0,0 +1,364 @@
+"""
+Prometheus-format application metrics.
+
+Metrics are recorded in-process and, when METRICS_DIR is set (metrics/ in
+the app's instance folder by default), each worker periodically writes its
+values to its own file in that directory (from a background thread, and
+once more at exit, so idle processes publish their last values). /metrics
+merges the files of all workers:
+counters and histograms are summed, gauges are summed or maxed depending
+on the metric, and gauges of workers that are no longer running are
+dropped. The counters and histograms of dead workers are folded into an
+archive file, so merged counters never go backwards. No external service
+is needed.
+"""
+import os
+import json
+import time
+import atexit
+import bisect
+import logging
+import tempfile
+import threading
+from flask import g, request
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+# Counters and histograms of workers that exited
+ARCHIVE_FILENAME = 'metrics-archived.json'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# name: (type, help, options)
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests handled', {}),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency', {}),
+    'db_pool_size': ('gauge', 'Database connections kept in the pool', {'aggregate': 'sum'}),
+    'db_pool_checked_out': ('gauge', 'Database connections in use', {'aggregate': 'sum'}),
+    'db_pool_overflow': ('gauge', 'Database connections above the pool size', {'aggregate': 'sum'}),
+    'news_curation_runs_total': ('counter', 'News curation runs', {}),
+    'news_curation_duration_seconds': ('histogram', 'News curation run duration', {
+        'buckets': (1, 5, 10, 30, 60, 120, 300, 600, 1200)
+    }),
+    'news_articles_total': ('counter', 'News articles found, stored and deleted by curation', {}),
+    'ai_requests_total': ('counter', 'AI API requests', {}),
+    'ai_request_duration_seconds': ('histogram', 'AI API request latency', {
+        'buckets': (0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+    }),
+    'ai_tokens_total': ('counter', 'AI API tokens used', {}),
+    'image_processing_duration_seconds': ('histogram', 'Image optimization and upload time', {}),
+    'scheduler_lag_seconds': ('gauge', 'Delay between scheduled and actual job start', {'aggregate': 'max'}),
+    'scheduler_last_run_timestamp_seconds': ('gauge', 'Unix time of the last job run', {'aggregate': 'max'})
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """In-process metric values, optionally mirrored to a per-worker file."""
+    
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._values = {name: {} for name in METRICS}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._dirty = False
+        self._flusher_pid = None
+    
+    def inc(self, name, value=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+            self._dirty = True
+        self.maybe_flush()
+    
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[name][_label_key(labels)] = value
+            self._dirty = True
+        self.maybe_flush()
+    
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2].get('buckets', DEFAULT_BUCKETS)
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'][bisect.bisect_left(buckets, value)] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+            self._dirty = True
+        self.maybe_flush()
+    
+    def snapshot(self):
+        """JSON-serializable copy of all values."""
+        with self._lock:
+            return {
+                name: [[list(key), _copy(value)] for key, value in series.items()]
+                for name, series in self._values.items()
+            }
+    
+    def _path(self, pid):
+        return os.path.join(self.directory, f'metrics-{pid}.json')
+    
+    def maybe_flush(self):
+        if not self.directory:
+            return
+        if self._flusher_pid != os.getpid():
+            # First write in this process (threads do not survive a fork)
+            self._start_flusher()
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
+    def _start_flusher(self):
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True).start()
+    
+    def _flush_periodically(self):
+        while self._flusher_pid == os.getpid():
+            time.sleep(max(self.flush_interval, 0.1))
+            if self._dirty:
+                self.flush()
+    
+    def flush(self):
+        """Write this worker's values to its file (atomically)."""
+        if not self.directory:
+            return
+        self._last_flush = time.monotonic()
+        self._dirty = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_snapshot(self.snapshot(), os.path.basename(self._path(os.getpid())))
+        except OSError as e:
+            logger.error(f"Error writing metrics file: {e}")
+    
+    def remove_dead_workers(self):
+        """Fold the counters of workers that are no longer running into the archive, then delete their files."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        dead = [(pid, path) for pid, path in self._worker_files() if pid != os.getpid() and not _pid_alive(pid)]
+        if not dead:
+            return
+        
+        try:
+            with open(os.path.join(self.directory, 'archive.lock'), 'w') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                archive = self._read_snapshot(os.path.join(self.directory, ARCHIVE_FILENAME)) or {}
+                folded = []
+                for pid, path in dead:
+                    snapshot = self._read_snapshot(path)
+                    if snapshot is None:
+                        # Already folded by another process
+                        continue
+                    archive = _fold(archive, snapshot)
+                    folded.append(path)
+                if folded:
+                    self._write_snapshot(archive, ARCHIVE_FILENAME)
+                    for path in folded:
+                        os.remove(path)
+        except OSError as e:
+            logger.error(f"Error archiving metrics of dead workers: {e}")
+    
+    @staticmethod
+    def _read_snapshot(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_snapshot(self, snapshot, filename):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, os.path.join(self.directory, filename))
+    
+    def _worker_files(self):
+        for filename in os.listdir(self.directory):
+            if filename.startswith('metrics-') and filename.endswith('.json'):
+                try:
+                    yield int(filename[8:-5]), os.path.join(self.directory, filename)
+                except ValueError:
+                    continue
+    
+    def collect(self):
+        """
+        Merge the values of all workers.
+        
+        Returns:
+            dict: name -> {label key: value}
+        """
+        snapshots = [(True, self.snapshot())]
+        if self.directory and os.path.isdir(self.directory):
+            archive = self._read_snapshot(os.path.join(self.directory, ARCHIVE_FILENAME))
+            if archive is not None:
+                snapshots.append((False, archive))
+            for pid, path in self._worker_files():
+                if pid == os.getpid():
+                    continue
+                snapshot = self._read_snapshot(path)
+                if snapshot is not None:
+                    snapshots.append((_pid_alive(pid), snapshot))
+        
+        merged = {name: {} for name in METRICS}
+        for alive, snapshot in snapshots:
+            for name, samples in snapshot.items():
+                if name not in METRICS:
+                    continue
+                kind, _, options = METRICS[name]
+                if kind == 'gauge' and not alive:
+                    continue
+                series = merged[name]
+                for labels, value in samples:
+                    key = tuple(tuple(pair) for pair in labels)
+                    series[key] = _merge(kind, options, series.get(key), value)
+        return merged
+    
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, series in self.collect().items():
+            kind, help_text, options = METRICS[name]
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, value in sorted(series.items()):
+                if kind == 'histogram':
+                    buckets = options.get('buckets', DEFAULT_BUCKETS)
+                    cumulative = 0
+                    for bound, count in zip([*buckets, '+Inf'], value['buckets']):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_format_labels(key, le=bound)} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(key)} {value["sum"]}')
+                    lines.append(f'{name}_count{_format_labels(key)} {value["count"]}')
+                else:
+                    lines.append(f'{name}{_format_labels(key)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return dict(value, buckets=list(value['buckets']))
+    return value
+
+
+def _merge(kind, options, current, value):
+    if current is None:
+        return value
+    if kind == 'histogram':
+        return {
+            'buckets': [a + b for a, b in zip(current['buckets'], value['buckets'])],
+            'sum': current['sum'] + value['sum'],
+            'count': current['count'] + value['count']
+        }
+    if kind == 'gauge' and options.get('aggregate') == 'max':
+        return max(current, value)
+    return current + value
+
+
+def _fold(archive, snapshot):
+    """Add a dead worker's counters and histograms to the archive snapshot."""
+    merged = {}
+    for name in set(archive) | set(snapshot):
+        if name not in METRICS or METRICS[name][0] == 'gauge':
+            continue
+        kind, _, options = METRICS[name]
+        series = {}
+        for labels, value in archive.get(name, []) + snapshot.get(name, []):
+            key = tuple(tuple(pair) for pair in labels)
+            series[key] = _merge(kind, options, series.get(key), value)
+        merged[name] = [[[list(pair) for pair in key], value] for key, value in series.items()]
+    return merged
+
+
+def _format_labels(key, **extra):
+    pairs = list(key) + [(k, str(v)) for k, v in extra.items()]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+metrics = MetricsRegistry()
+
+# Publish what was recorded since the last flush when the process exits
+atexit.register(metrics.flush)
+
+
+def record_pool_usage(engine):
+    """Update the pool gauges from a SQLAlchemy engine's pool."""
+    pool = engine.pool
+    for name, attribute in (('db_pool_size', 'size'),
+                            ('db_pool_checked_out', 'checkedout'),
+                            ('db_pool_overflow', 'overflow')):
+        method = getattr(pool, attribute, None)
+        if method is not None:
+            metrics.set(name, max(method(), 0))
+
+
+def init_metrics(app):
+    """
+    Record request metrics and configure per-worker aggregation.
+    
+    Args:
+        app: Flask application
+    """
+    app.config.setdefault('METRICS_ENABLED', os.environ.get('METRICS_ENABLED', 'True').lower() == 'true')
+    # Per app instance, so deployments sharing a host keep their metrics apart
+    app.config.setdefault('METRICS_DIR', os.environ.get('METRICS_DIR', os.path.join(app.instance_path, 'metrics')))
+    app.config.setdefault('METRICS_TOKEN', os.environ.get('METRICS_TOKEN'))
+    
+    if not app.config['METRICS_ENABLED']:
+        return
+    
+    metrics.directory = app.config['METRICS_DIR'] or None
+    metrics.remove_dead_workers()
+    
+    @app.before_request
+    def start_metrics_timer():
+        g._metrics_start = time.perf_counter()
+    
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('_metrics_start', None)
+        if start is None or request.endpoint in ('main.metrics_endpoint', 'static'):
+            return response
+        blueprint = request.blueprint or 'app'
+        endpoint = request.endpoint or 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - start,
+                        blueprint=blueprint, endpoint=endpoint)
+        metrics.inc('http_requests_total', blueprint=blueprint, endpoint=endpoint,
+                    method=request.method, status=response.status_code)
+        try:
+            record_pool_usage(db.engine)
+        except Exception as e:
+            logger.debug(f"Pool metrics unavailable: {e}")
+        return response
@@ -0,0 +1,94 @@
+"""
+Principal cache for authorization checks.
+
+Admin checks resolve the user's authorization flags once per request (flask.g)
+and keep them in a short-TTL per-process cache, so most admin requests run no
+user query at all. Entries are invalidated explicitly when an admin changes a
+user in this process; other worker processes pick the change up when the TTL
+expires.
+"""
+import os
+import threading
+import time
+from flask import g, has_app_context
+
+from models import db, User
+
+AUTH_CACHE_TTL = float(os.environ.get('AUTH_CACHE_TTL', 5))  # seconds
+
+
+class PrincipalCache:
+    """Thread-safe per-process cache of user authorization flags with a TTL."""
+    
+    def __init__(self, ttl=AUTH_CACHE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, user_id):
+        """Return the cached principal for a user, or None if missing or expired."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if self._clock() >= expires_at:
+            with self._lock:
+                self._entries.pop(user_id, None)
+            return None
+        return principal
+    
+    def set(self, user_id, principal):
+        """Cache a principal for a user."""
+        with self._lock:
+            self._entries[user_id] = (principal, self._clock() + self.ttl)
+    
+    def invalidate(self, user_id=None):
+        """Drop one user's entry, or every entry when no user is given."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+principal_cache = PrincipalCache()
+
+
+def load_principal(user_id):
+    """
+    Get authorization flags for a user, cached per request and per process.
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        dict: {'id', 'exists', 'is_admin', 'is_approved'}
+    """
+    principal = g.get('_principal')
+    if principal is not None and principal['id'] == user_id:
+        return principal
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # Reuse the request's current user if it has already been loaded
+        row = g.get('current_user')
+        if row is None or row.id != user_id:
+            row = db.session.query(User.is_admin, User.is_approved).filter(User.id == user_id).first()
+        principal = {
+            'id': user_id,
+            'exists': row is not None,
+            'is_admin': bool(row and row.is_admin),
+            'is_approved': bool(row and row.is_approved)
+        }
+        principal_cache.set(user_id, principal)
+    
+    g._principal = principal
+    return principal
+
+
+def invalidate_principal(user_id):
+    """Forget cached authorization flags for a user after they change."""
+    principal_cache.invalidate(user_id)
+    if has_app_context() and g.get('_principal', {}).get('id') == user_id:
+        g.pop('_principal')
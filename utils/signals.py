@@ -0,0 +1,13 @@
+"""
+Application signals (blinker) for events other parts of the app can react to.
+
+Receivers run synchronously in the sending request; slow work (email, push)
+should enqueue a task instead of doing it inline.
+"""
+from blinker import Namespace
+
+club_signals = Namespace()
+
+# Sent after commit when a waitlisted member takes a freed seat.
+# sender: PlannedTrip id; kwargs: user_id, trip_title
+waitlist_promoted = club_signals.signal('waitlist-promoted')
@@ -0,0 +1,169 @@
+"""
+Slow query log.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with redacted
+parameters and the endpoint that issued them, and kept in a ring buffer of
+the last SLOW_QUERY_LOG_SIZE entries shown in the admin panel. With
+SLOW_QUERY_EXPLAIN enabled the query plan of slow SELECTs is captured too
+(SQLite EXPLAIN QUERY PLAN, Postgres EXPLAIN), flagging full table scans
+such as unindexed date lookups or LIKE '%q%' searches.
+"""
+import os
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from flask import request, has_request_context
+
+from utils.instrumentation import install_sql_hooks, query_listeners
+
+logger = logging.getLogger(__name__)
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements fed by the SQLAlchemy cursor hooks."""
+    
+    def __init__(self, threshold_ms=250, size=100, explain=False):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+    
+    def __call__(self, statement, parameters, duration_ms, context):
+        if not self.threshold_ms or duration_ms < self.threshold_ms:
+            return
+        
+        entry = {
+            'sql': statement,
+            'params': redact_parameters(parameters),
+            'duration_ms': round(duration_ms, 2),
+            'endpoint': request.endpoint if has_request_context() else 'background',
+            'recorded_at': datetime.utcnow().isoformat(),
+            'plan': None,
+            'full_scan': False
+        }
+        if self.explain and not context.executemany:
+            entry['plan'] = explain_statement(context, statement, parameters)
+            entry['full_scan'] = is_full_scan(entry['plan'])
+        
+        with self._lock:
+            self._entries.append(entry)
+        
+        logger.warning(
+            f"Slow query ({duration_ms:.0f} ms) in {entry['endpoint']}: "
+            f"{' '.join(statement.split())} params={entry['params']}"
+        )
+    
+    def configure(self, threshold_ms, size, explain):
+        with self._lock:
+            self.threshold_ms = threshold_ms
+            self.explain = explain
+            if self._entries.maxlen != size:
+                self._entries = deque(self._entries, maxlen=size)
+    
+    def entries(self):
+        """Return the recorded entries, newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def redact_parameters(parameters):
+    """Replace parameter values with their types so no user data is logged."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f'{len(parameters)} parameter sets'
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def explain_statement(context, statement, parameters):
+    """
+    Capture the query plan of a SELECT on the connection that ran it.
+    
+    Uses a raw DBAPI cursor so the EXPLAIN itself does not go through the
+    SQLAlchemy hooks. On Postgres it runs inside a savepoint: a failing
+    EXPLAIN would otherwise abort the request's transaction.
+    
+    Returns:
+        list: Plan lines, or None if the statement cannot be explained
+    """
+    if not statement.lstrip().upper().startswith('SELECT'):
+        return None
+    
+    dialect = context.dialect.name
+    if dialect == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif dialect == 'postgresql':
+        prefix = 'EXPLAIN '
+    else:
+        return None
+    
+    savepoint = dialect == 'postgresql'
+    try:
+        cursor = context.root_connection.connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                raise
+            if savepoint:
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.error(f"Error capturing query plan: {e}")
+        return None
+    
+    if dialect == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def is_full_scan(plan):
+    """Whether a captured plan scans a whole table."""
+    for line in plan or []:
+        # SQLite: "SCAN historical_event"; "SCAN ... USING INDEX" walks an index
+        if line.startswith('SCAN ') and 'INDEX' not in line:
+            return True
+        if 'Seq Scan' in line:
+            return True
+    return False
+
+
+slow_query_log = SlowQueryLog()
+
+
+def init_slow_query_log(app):
+    """
+    Configure the slow query log and attach it to the SQL hooks.
+    
+    Args:
+        app: Flask application
+    """
+    app.config.setdefault('SLOW_QUERY_THRESHOLD_MS', float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 250)))
+    app.config.setdefault('SLOW_QUERY_LOG_SIZE', int(os.environ.get('SLOW_QUERY_LOG_SIZE', 100)))
+    app.config.setdefault('SLOW_QUERY_EXPLAIN', os.environ.get('SLOW_QUERY_EXPLAIN', 'False').lower() == 'true')
+    
+    slow_query_log.configure(
+        app.config['SLOW_QUERY_THRESHOLD_MS'],
+        app.config['SLOW_QUERY_LOG_SIZE'],
+        app.config['SLOW_QUERY_EXPLAIN']
+    )
+    if not slow_query_log.threshold_ms:
+        return
+    
+    install_sql_hooks()
+    if slow_query_log not in query_listeners:
+        query_listeners.append(slow_query_log)
@@ -0,0 +1,62 @@
+"""
+Compiled template caching.
+
+Jinja compiles each template the first time a worker renders it. A
+filesystem bytecode cache lets workers (and restarts on the same disk)
+load the compiled code instead, and the optional warmup compiles every
+template at startup so no request pays for it.
+"""
+import os
+import time
+import logging
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+
+def init_template_cache(app):
+    """
+    Configure the Jinja bytecode cache.
+    
+    TEMPLATE_CACHE_DIR selects the cache directory (Jinja's per-user temp
+    directory by default); TEMPLATE_BYTECODE_CACHE=False turns it off.
+    
+    Args:
+        app: Flask application
+    """
+    app.config.setdefault('TEMPLATE_BYTECODE_CACHE', os.environ.get('TEMPLATE_BYTECODE_CACHE', 'True').lower() == 'true')
+    app.config.setdefault('TEMPLATE_CACHE_DIR', os.environ.get('TEMPLATE_CACHE_DIR'))
+    app.config.setdefault('TEMPLATE_WARMUP', os.environ.get('TEMPLATE_WARMUP', 'False').lower() == 'true')
+    
+    if not app.config['TEMPLATE_BYTECODE_CACHE']:
+        return
+    
+    directory = app.config['TEMPLATE_CACHE_DIR']
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Set through jinja_options so the environment is still created lazily
+    app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(directory)}
+
+
+def warm_templates(app):
+    """
+    Compile every template the app can load.
+    
+    Args:
+        app: Flask application
+        
+    Returns:
+        int: Number of templates compiled
+    """
+    start = time.perf_counter()
+    compiled = 0
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            logger.error(f"Error compiling template {name}: {e}")
+    
+    logger.info(f"Warmed {compiled} templates in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return compiled